@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+process pool workers for the batch export of *main.Main*
+
+Each worker process opens, filters and exports one file end to end, so the
+GIL bound parts of the export (pandas glue, CSV formatting) run in parallel.
+The workers only return the log messages; they are formatted by *Main* with
+*msg_format* in the order of the source files.
+"""
+
+from API.mdf import MDF
+from API.blocks.utils import MdfException
+
+__all__ = ["export_file", "limit_memory"]
+
+
+def limit_memory(memory_limit=None):
+    """process pool initializer that limits the address space of the worker
+    process. A file that needs more memory fails with *MemoryError* instead of
+    swapping the whole machine. The limit is only available on POSIX systems
+
+    Parameters
+    ----------
+    memory_limit : int | None
+        memory limit in bytes; default *None* (no limit)
+
+    """
+    if not memory_limit:
+        return
+
+    try:
+        import resource
+    except ImportError:
+        return
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        memory_limit = min(memory_limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+def export_file(
+    file_path, required_channels, name_dict, fmt, out_dir, kwargs, metadata_cache=False
+):
+    """open, filter and export a single measurement file
+
+    Parameters
+    ----------
+    file_path : str | pathlib.Path
+        measurement file
+    required_channels : tuple
+        channels to be loaded; an empty tuple loads all the channels
+    name_dict : dict | None
+        channel names from the chn file
+    fmt : str
+        export format
+    out_dir : str | pathlib.Path
+        export destination
+    kwargs : dict
+        *MDF.export* keyword arguments
+    metadata_cache : bool
+        use the persistent metadata cache; default *False*
+
+    Returns
+    -------
+    messages : list
+        list of (exception type, details) tuples; empty if the export succeeded
+
+    """
+    messages = []
+
+    try:
+        mdf = MDF(
+            file_path,
+            channels=required_channels,
+            name_dict=name_dict,
+            metadata_cache=metadata_cache,
+        )
+        if len(mdf.channels_db) < 2:
+            mdf.close()
+            messages.append(("MdfException_212", f'Empty channels\t{file_path}'))
+            return messages
+    except MemoryError:
+        messages.append(("MdfException_218", f'Memory limit exceeded\t{file_path}'))
+        return messages
+    except Exception as e:
+        if type(e) == MdfException:
+            messages.append((e.__class__.__name__ + "211", e.args[0]))
+        else:
+            messages.append(("MdfException_219", f'Unknown error\t{file_path}'))
+        return messages
+
+    try:
+        mdf.export(fmt, out_dir, **kwargs)
+    except MemoryError:
+        messages.append(("MdfException_222", f'Memory limit exceeded\t{file_path}'))
+    except Exception as e:
+        if e.args:
+            messages.append((e.__class__.__name__, e.args[0]))
+        else:
+            messages.append(("MdfException_221", f'Export failed\t{file_path}'))
+    finally:
+        mdf.close()
+
+    return messages
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the columnar Parquet and Feather (Arrow IPC)
+export: the numpy columns are wrapped in Arrow arrays without going through
+pandas and each written chunk becomes a Parquet row group or a Feather record
+batch
+"""
+
+import numpy as np
+
+from API.blocks.utils import MdfException
+
+__all__ = ["ARROW_FORMATS", "arrow_array", "ArrowColumnWriter"]
+
+# export format -> file suffix
+ARROW_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def arrow_array(values):
+    """Arrow array for the column *values*. The contiguous numeric arrays are
+    wrapped without copy; the text columns (value to text conversions,
+    categorical columns) are dictionary encoded
+
+    Parameters
+    ----------
+    values : np.ndarray | pd.Categorical | pd.Index
+        column values
+
+    Returns
+    -------
+    array : pyarrow.Array
+
+    """
+    import pyarrow as pa
+
+    if hasattr(values.dtype, "categories"):
+        # pandas categorical -> DictionaryArray
+        return pa.array(values)
+
+    if isinstance(values, np.ndarray):
+        kind = values.dtype.kind
+        if kind == "S":
+            values = values.astype(object)
+        elif kind == "U":
+            return pa.array(values, type=pa.string()).dictionary_encode()
+        elif values.ndim > 1:
+            # byte arrays and other array channels -> fixed size lists
+            size = int(np.prod(values.shape[1:]))
+            flat = pa.array(np.ascontiguousarray(values).reshape(-1))
+            return pa.FixedSizeListArray.from_arrays(flat, size)
+
+    array = pa.array(values)
+    if pa.types.is_string(array.type) or pa.types.is_binary(array.type):
+        array = array.dictionary_encode()
+    return array
+
+
+def _is_numeric(arrow_type):
+    import pyarrow as pa
+
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+
+
+class ArrowColumnWriter:
+    """streaming writer for a Parquet or Feather (Arrow IPC file) output. The
+    schema is taken from the first written chunk and can not be changed once
+    the file is opened: the next chunks must have the same column types, only
+    the casts that keep the values are done (see *_conform*). The
+    dictionaries of the text columns are only extended from a chunk to the
+    next one, as required by the Arrow IPC file format
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        output file
+    fmt : str
+        *parquet* or *feather*
+    compression : str
+        compression codec; default *snappy* for Parquet and uncompressed for
+        Feather (*lz4* and *zstd* are the Feather codecs)
+
+    """
+
+    def __init__(self, path, fmt="parquet", compression=None):
+        self.path = str(path)
+        self.fmt = fmt
+        self.compression = compression
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+        self._dictionaries = {}
+
+    def write(self, names, columns):
+        """append the *columns* as a new row group (Parquet) or record batch
+        (Feather)
+
+        Parameters
+        ----------
+        names : list
+            column names
+        columns : list
+            column values with the same length
+
+        """
+        import pyarrow as pa
+
+        arrays = []
+        for position, column in enumerate(columns):
+            array = arrow_array(column)
+            if pa.types.is_dictionary(array.type):
+                array = self._extend_dictionary(position, array)
+            arrays.append(array)
+
+        table = pa.Table.from_arrays(arrays, names=list(names))
+
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(
+                    self.path, self._schema, compression=self.compression or "snappy"
+                )
+            else:
+                options = pa.ipc.IpcWriteOptions(
+                    compression=self.compression, emit_dictionary_deltas=True
+                )
+                self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+        elif not table.schema.equals(self._schema):
+            table = self._conform(table)
+
+        if self.fmt == "parquet":
+            self._writer.write_table(table, row_group_size=max(len(table), 1))
+        else:
+            self._writer.write_table(table)
+
+        self.rows += len(table)
+
+    def _conform(self, table):
+        """cast the *table* to the file schema; a column that has another type
+        than in the first chunk is only cast if all its values can be
+        represented (for example uint8 to uint16), otherwise the values would
+        be silently truncated"""
+        import pyarrow as pa
+
+        for field, chunk_field in zip(self._schema, table.schema):
+            if field.type == chunk_field.type:
+                continue
+            if pa.types.is_dictionary(field.type) and pa.types.is_dictionary(
+                chunk_field.type
+            ):
+                if field.type.value_type == chunk_field.type.value_type:
+                    continue
+            elif _is_numeric(field.type) and _is_numeric(chunk_field.type):
+                if np.can_cast(
+                    chunk_field.type.to_pandas_dtype(),
+                    field.type.to_pandas_dtype(),
+                    casting="safe",
+                ):
+                    continue
+            raise MdfException(
+                f'column "{field.name}" has the type {chunk_field.type} instead '
+                f"of the type {field.type} of the first written chunk"
+            )
+
+        return table.cast(self._schema)
+
+    def _extend_dictionary(self, position, array):
+        """re-encode the dictionary *array* with the running dictionary of
+        the column; the new values are appended to the dictionary"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        values = array.dictionary
+        dictionary = self._dictionaries.get(position)
+        if dictionary is None:
+            dictionary = values
+        else:
+            new = values.filter(pc.invert(pc.is_in(values, value_set=dictionary)))
+            if len(new):
+                dictionary = pa.concat_arrays([dictionary, new])
+        self._dictionaries[position] = dictionary
+
+        indices = pc.index_in(values, value_set=dictionary).take(array.indices)
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the extraction of non byte aligned
+channels (bit fields) from the records of a channel group
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from API.blocks.utils import as_non_byte_sized_signed_int
+
+__all__ = ["bit_field_size", "extract_bit_fields", "sign_extend"]
+
+
+def bit_field_size(bit_offset, bit_count):
+    """number of bytes spanned by a bit field and the size of the standard
+    unsigned integer that holds it
+
+    Parameters
+    ----------
+    bit_offset : int
+        bit offset of the field in its first byte
+    bit_count : int
+        field bit count
+
+    Returns
+    -------
+    byte_size, std_size : int, int
+        *std_size* is 0 if the field does not fit in 8 bytes
+
+    """
+    byte_size = (bit_offset + bit_count + 7) // 8
+    if byte_size in (1, 2, 4, 8):
+        std_size = byte_size
+    elif byte_size == 3:
+        std_size = 4
+    elif byte_size < 8:
+        std_size = 8
+    else:
+        std_size = 0
+    return byte_size, std_size
+
+
+@lru_cache(maxsize=None)
+def _signed_dtype(unsigned_dtype, bit_count):
+    """dtype returned by *as_non_byte_sized_signed_int*; it only depends on
+    the input dtype and on the bit count"""
+    try:
+        signed_dtype = as_non_byte_sized_signed_int(
+            np.zeros(1, dtype=unsigned_dtype), bit_count
+        ).dtype
+    except (OverflowError, TypeError):
+        return None
+    return signed_dtype if signed_dtype.kind in "if" else None
+
+
+def sign_extend(vals, bit_count):
+    """two's complement of the masked unsigned values of a *bit_count* bits
+    field. The result is the same as *as_non_byte_sized_signed_int* but
+    the sign is extended in place with a xor and a subtraction instead of
+    the masked temporaries and the *where* selection
+
+    Parameters
+    ----------
+    vals : np.array
+        writable unsigned integer array; the bits above *bit_count* must be
+        cleared
+    bit_count : int
+        field bit count
+
+    Returns
+    -------
+    vals : np.array
+        signed values
+
+    """
+    signed_dtype = _signed_dtype(vals.dtype, bit_count)
+    if signed_dtype is None:
+        return as_non_byte_sized_signed_int(vals, bit_count)
+
+    sign = vals.dtype.type(1 << (bit_count - 1))
+    vals ^= sign
+    vals -= sign
+    return vals.view(f"i{vals.itemsize}").astype(signed_dtype, copy=False)
+
+
+def extract_bit_fields(data, record_size, specs):
+    """extract several bit fields from the same records in one pass.
+
+    Each field is read through a strided view of the standard size integer
+    word that contains it (no copy of the record bytes), then shifted and
+    masked. The words are aligned to their size when possible, so the
+    fields packed in the same word (for example the signals of a CAN
+    payload) share the same view. The extra bytes of the 3, 5, 6 and 7 bytes
+    fields are cleared by the mask.
+
+    Parameters
+    ----------
+    data : bytes
+        records buffer
+    record_size : int
+        record size, including the invalidation bytes
+    specs : list
+        (byte_offset, bit_offset, bit_count, signed, big_endian) of each
+        field; the fields must fit in 8 bytes (see *bit_field_size*)
+
+    Returns
+    -------
+    values : list
+        field values, in the order of *specs*; unsigned fields have the
+        standard unsigned integer dtype and the signed fields are converted
+        with *as_non_byte_sized_signed_int*
+
+    """
+    count = len(data) // record_size
+
+    if any(bit_field_size(spec[1], spec[2])[1] > record_size for spec in specs):
+        # records shorter than the word size are padded with zero bytes
+        records = np.frombuffer(data, dtype=np.uint8, count=count * record_size)
+        padded = np.zeros((count, 8), dtype=np.uint8)
+        padded[:, :record_size] = records.reshape(count, record_size)
+        data, record_size = padded, 8
+
+    words = {}
+    values = []
+
+    for byte_offset, bit_offset, bit_count, signed, big_endian in specs:
+        byte_size, std_size = bit_field_size(bit_offset, bit_count)
+
+        start = byte_offset - byte_offset % std_size
+        if start + std_size < byte_offset + byte_size:
+            start = byte_offset
+        start = min(start, record_size - std_size)
+
+        key = start, std_size, big_endian
+        word = words.get(key, None)
+        if word is None:
+            word = words[key] = np.ndarray(
+                shape=(count,),
+                dtype=f"{'>' if big_endian else '<'}u{std_size}",
+                buffer=data,
+                offset=start,
+                strides=(record_size,),
+            )
+
+        if big_endian:
+            shift = (start + std_size - byte_offset - byte_size) * 8 + bit_offset
+        else:
+            shift = (byte_offset - start) * 8 + bit_offset
+
+        if shift:
+            vals = word >> shift
+            vals &= (1 << bit_count) - 1
+        else:
+            vals = word & ((1 << bit_count) - 1)
+
+        if signed:
+            vals = sign_extend(vals, bit_count)
+
+        values.append(vals)
+
+    return values
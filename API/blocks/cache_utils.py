@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the persistent metadata cache
+
+The parsed structure of a measurement (groups, channels, conversions, data
+block lists, channel and master databases) is stored in a sidecar file in the
+cache directory, so that opening the same file again skips the block parsing.
+
+A cache entry is only used if all of the following are unchanged
+
+* file path, size and modification time
+* hash of the first and last bytes of the file (identification and header
+  blocks and the end of the last written block)
+* mdfstudioAPI version and the cache format version
+* the open options that change the parsed structure (channels filter,
+  display names, source names)
+
+otherwise the file is parsed again and the entry is replaced.
+"""
+
+import gc
+from hashlib import sha1
+import logging
+import os
+from pathlib import Path
+import pickle
+from tempfile import NamedTemporaryFile
+
+from API.version import __version__
+
+logger = logging.getLogger("mdfstudioAPI")
+
+__all__ = [
+    "metadata_cache_dir",
+    "metadata_cache_key",
+    "load_metadata",
+    "save_metadata",
+]
+
+METADATA_CACHE_VERSION = 3
+METADATA_HASH_SIZE = 4096
+
+
+def metadata_cache_dir(cache=True):
+    """cache directory for the *metadata_cache* argument
+
+    Parameters
+    ----------
+    cache : bool | str | pathlib.Path
+        *True* selects the default directory (*MDFSTUDIOAPI_CACHE*
+        environment variable or *~/.mdfstudioapi/metadata*); a path selects a
+        custom directory
+
+    Returns
+    -------
+    cache_dir : pathlib.Path | None
+        cache directory or *None* if the cache is disabled
+
+    """
+    if not cache:
+        return None
+    elif cache is True:
+        cache = os.environ.get("MDFSTUDIOAPI_CACHE", None) or (
+            Path.home() / ".mdfstudioapi" / "metadata"
+        )
+    return Path(cache)
+
+
+def metadata_cache_key(name, options):
+    """compute the cache key of a measurement file
+
+    Parameters
+    ----------
+    name : str | pathlib.Path
+        measurement file name
+    options : dict
+        open options that change the parsed structure
+
+    Returns
+    -------
+    key : dict
+        cache key
+
+    """
+    name = Path(name).resolve()
+    stat = name.stat()
+
+    digest = sha1()
+    with open(name, "rb") as stream:
+        digest.update(stream.read(METADATA_HASH_SIZE))
+        if stat.st_size > METADATA_HASH_SIZE:
+            stream.seek(max(stat.st_size - METADATA_HASH_SIZE, METADATA_HASH_SIZE))
+            digest.update(stream.read())
+
+    return {
+        "path": str(name),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": digest.hexdigest(),
+        "version": __version__,
+        "cache_version": METADATA_CACHE_VERSION,
+        "options": options,
+    }
+
+
+def _entry_name(cache_dir, key, suffix):
+    identity = repr((key["path"], sorted(key["options"].items())))
+    return cache_dir / f"{sha1(identity.encode('utf-8')).hexdigest()}{suffix}"
+
+
+def load_metadata(cache_dir, key, suffix=".meta"):
+    """load a cache entry
+
+    Parameters
+    ----------
+    cache_dir : pathlib.Path
+        cache directory
+    key : dict
+        cache key returned by *metadata_cache_key*
+    suffix : str
+        entry file suffix
+
+    Returns
+    -------
+    state : object | None
+        stored object, or *None* if there is no valid entry
+
+    """
+    entry = _entry_name(cache_dir, key, suffix)
+    # the entry contains many small objects; the cyclic garbage collector
+    # passes triggered by their allocation would dominate the load time
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(entry, "rb") as stream:
+            stored_key = pickle.load(stream)
+            if stored_key != key:
+                return None
+            return pickle.load(stream)
+    except FileNotFoundError:
+        return None
+    except Exception as err:
+        # a broken entry is rebuilt
+        logger.debug(f"Invalid metadata cache entry {entry}: {err}")
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def save_metadata(cache_dir, key, state, suffix=".meta"):
+    """store a cache entry; the entry is replaced atomically so concurrent
+    readers never see a partially written file
+
+    Parameters
+    ----------
+    cache_dir : pathlib.Path
+        cache directory
+    key : dict
+        cache key returned by *metadata_cache_key*
+    state : object
+        picklable object
+    suffix : str
+        entry file suffix
+
+    """
+    entry = _entry_name(cache_dir, key, suffix)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile("wb", dir=cache_dir, delete=False) as stream:
+            pickle.dump(key, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(state, stream, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(stream.name, entry)
+    except Exception as err:
+        logger.debug(f"Could not write the metadata cache entry {entry}: {err}")
+        try:
+            os.remove(stream.name)
+        except Exception:
+            pass
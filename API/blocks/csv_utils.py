@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for columnar CSV export
+"""
+
+import numpy as np
+
+__all__ = ["write_csv"]
+
+CSV_CHUNK_SIZE = 64 * 1024
+CSV_BUFFER_SIZE = 4 * 2 ** 20
+CSV_SPECIAL_CHARS = (",", '"', "\r", "\n")
+
+
+def quote_csv_field(field):
+    """quote a text field the same way as *csv.writer* with the default
+    *QUOTE_MINIMAL* quoting
+
+    Parameters
+    ----------
+    field : str
+        text field
+
+    Returns
+    -------
+    field : str
+        quoted field if it contains special characters
+
+    """
+    for char in CSV_SPECIAL_CHARS:
+        if char in field:
+            return '"{}"'.format(field.replace('"', '""'))
+    return field
+
+
+def format_csv_column(values, na_rep="nan", float_precision=None, upcast_floats=True):
+    """format a whole column as CSV text fields
+
+    Numeric columns are formatted vectorized: only the distinct values
+    (compared bitwise, so that *-0.0* and the NaN payloads are kept) are
+    converted to text and then scattered back to the rows.
+
+    Parameters
+    ----------
+    values : np.array | pandas.Categorical
+        column samples
+    na_rep : str
+        text used for NaN values; default *'nan'*
+    float_precision : int | None
+        number of decimals for float columns; if *None* the shortest round-trip
+        representation is used (the same as *repr*)
+    upcast_floats : bool
+        format float16/float32 columns as float64 values; default *True*
+
+    Returns
+    -------
+    fields : list
+        list of str
+
+    """
+    if hasattr(values.dtype, "categories"):
+        # categorical column: the labels are formatted once and the missing
+        # values (code -1) are the last field
+        fields = format_csv_column(
+            np.asarray(values.categories),
+            na_rep=na_rep,
+            float_precision=float_precision,
+            upcast_floats=upcast_floats,
+        )
+        fields.append(na_rep)
+        fields = np.array(fields, dtype=object)
+        return fields[np.asarray(values.codes)].tolist()
+
+    kind = values.dtype.kind
+
+    if kind == "b" and values.ndim == 1:
+        return list(map(str, values.tolist()))
+
+    elif kind in "iuf" and values.ndim == 1:
+        if kind == "f" and upcast_floats and values.itemsize < 8:
+            values = values.astype(np.float64)
+        elif not values.dtype.isnative:
+            values = values.astype(values.dtype.newbyteorder("="))
+
+        unique, inverse = np.unique(
+            values.view(f"u{values.itemsize}"), return_inverse=True
+        )
+        unique = unique.view(values.dtype)
+
+        if kind == "f":
+            if float_precision is None:
+                fields = unique.astype(str).astype(object)
+            else:
+                fmt = f"%.{float_precision}f"
+                fields = np.array(
+                    list(map(fmt.__mod__, unique.tolist())), dtype=object
+                )
+            fields[np.isnan(unique)] = na_rep
+        else:
+            fields = np.array(list(map(str, unique.tolist())), dtype=object)
+
+        return fields[inverse].tolist()
+
+    else:
+        fields = []
+        for value in values.tolist() if isinstance(values, np.ndarray) else values:
+            if value is None:
+                fields.append("")
+            elif isinstance(value, float):
+                if value != value:
+                    fields.append(na_rep)
+                elif float_precision is None:
+                    fields.append(repr(value))
+                else:
+                    fields.append(f"{value:.{float_precision}f}")
+            else:
+                fields.append(quote_csv_field(str(value)))
+        return fields
+
+
+def _as_array(column):
+    """numpy view of a column; extension and datetime columns are returned as
+    object arrays so that their items are formatted like the *to_list* values.
+    The categorical columns are kept as *pandas.Categorical*"""
+    if isinstance(column, np.ndarray):
+        return column
+    dtype = getattr(column, "dtype", None)
+    if hasattr(dtype, "categories"):
+        return getattr(column, "array", column)
+    if not isinstance(dtype, np.dtype) or dtype.kind in "mM":
+        return np.asarray(column, dtype=object)
+    return np.asarray(column)
+
+
+def write_csv(
+    file_name,
+    names,
+    columns,
+    lineterminator="\r\n",
+    na_rep="nan",
+    float_precision=None,
+    upcast_floats=True,
+    encoding=None,
+    chunk_size=CSV_CHUNK_SIZE,
+    header=True,
+    mode="w",
+):
+    """write columns to a CSV file. The columns are formatted in chunks of
+    *chunk_size* rows and each chunk is written as a single text block.
+
+    With the default arguments the output is identical to writing the
+    ``to_list()`` values of the columns row by row with *csv.writer*. Using
+    ``lineterminator=os.linesep``, ``na_rep=''``, ``upcast_floats=False`` and
+    ``encoding='utf-8'`` gives the output of *pandas.DataFrame.to_csv*.
+
+    Parameters
+    ----------
+    file_name : str | pathlib.Path
+        output file name
+    names : list
+        column names used for the header row
+    columns : list
+        list of 1D numpy arrays (or pandas Series/Index objects) with the same
+        length
+    lineterminator : str
+        row terminator; default *'\\r\\n'*
+    na_rep : str
+        text used for NaN values; default *'nan'*
+    float_precision : int | None
+        number of decimals for float columns; default *None*
+    upcast_floats : bool
+        format float16/float32 columns as float64 values; default *True*
+    encoding : str | None
+        file encoding; default *None* (platform default)
+    chunk_size : int
+        number of rows formatted at once
+    header : bool
+        write the header row; default *True*
+    mode : str
+        file open mode; use *'a'* and ``header=False`` to append the rows of
+        the next time window to an existing file. Default *'w'*
+
+    """
+    columns = [_as_array(column) for column in columns]
+    size = len(columns[0]) if columns else 0
+    single_column = len(columns) == 1
+
+    with open(
+        file_name, mode, newline="", encoding=encoding, buffering=CSV_BUFFER_SIZE
+    ) as csvfile:
+        if header:
+            header = [
+                quote_csv_field("" if name is None else str(name)) for name in names
+            ]
+            if single_column and not header[0]:
+                header[0] = '""'
+            csvfile.write(",".join(header) + lineterminator)
+
+        for start in range(0, size, chunk_size):
+            fields = [
+                format_csv_column(
+                    column[start : start + chunk_size],
+                    na_rep=na_rep,
+                    float_precision=float_precision,
+                    upcast_floats=upcast_floats,
+                )
+                for column in columns
+            ]
+
+            if single_column:
+                rows = [field or '""' for field in fields[0]]
+            else:
+                rows = map(",".join, zip(*fields))
+
+            csvfile.write(lineterminator.join(rows))
+            csvfile.write(lineterminator)
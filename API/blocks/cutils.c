@@ -9,140 +9,251 @@
 
 char err_string[1024];
 
+// record IDs below this limit are dispatched with a direct index table;
+// higher record IDs use an open addressing hash table
+#define DIRECT_INDEX_LIMIT 65536
+
 struct rec_info {
-    unsigned long id;
-    unsigned long size;
+    unsigned long long id;
+    unsigned long long size;        // 0 for VLSD records
+    unsigned long long total;       // bytes of the fixed size records
     PyObject* mlist;
-}; 
+    char* out;
+};
 
-struct node {
-    struct node * next;
-    struct rec_info info;
+struct dispatch {
+    struct rec_info* infos;
+    Py_ssize_t count;
+    long* index;                    // direct index or hash table slots
+    unsigned long long mask;        // hash table size - 1; 0 for direct index
+    unsigned long long limit;       // direct index table size
 };
 
 
+static void free_dispatch(struct dispatch* table)
+{
+    free(table->infos);
+    free(table->index);
+    table->infos = NULL;
+    table->index = NULL;
+}
+
+
+static int build_dispatch(struct dispatch* table, PyObject* record_size, PyObject* partial_records)
+{
+    Py_ssize_t pos = 0, i = 0;
+    PyObject *key, *value;
+    unsigned long long max_id = 0, slots, slot;
+
+    table->count = PyDict_Size(record_size);
+    table->infos = calloc(table->count ? table->count : 1, sizeof(struct rec_info));
+    table->index = NULL;
+    if (!table->infos) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    while (PyDict_Next(record_size, &pos, &key, &value))
+    {
+        table->infos[i].id = PyLong_AsUnsignedLongLong(key);
+        table->infos[i].size = PyLong_AsUnsignedLongLong(value);
+        table->infos[i].mlist = PyDict_GetItem(partial_records, key);
+        if (PyErr_Occurred()) {
+            free_dispatch(table);
+            return -1;
+        }
+        if (table->infos[i].id > max_id)
+            max_id = table->infos[i].id;
+        i++;
+    }
+
+    if (max_id < DIRECT_INDEX_LIMIT)
+    {
+        table->mask = 0;
+        table->limit = max_id + 1;
+        table->index = malloc(table->limit * sizeof(long));
+        if (!table->index) {
+            free_dispatch(table);
+            PyErr_NoMemory();
+            return -1;
+        }
+        for (slot=0; slot<table->limit; slot++)
+            table->index[slot] = -1;
+        for (i=0; i<table->count; i++)
+            table->index[table->infos[i].id] = (long) i;
+    }
+    else
+    {
+        // power of two size with a load factor below 0.5
+        slots = 2;
+        while (slots < 2 * (unsigned long long) table->count)
+            slots <<= 1;
+        table->mask = slots - 1;
+        table->limit = 0;
+        table->index = malloc(slots * sizeof(long));
+        if (!table->index) {
+            free_dispatch(table);
+            PyErr_NoMemory();
+            return -1;
+        }
+        for (slot=0; slot<slots; slot++)
+            table->index[slot] = -1;
+        for (i=0; i<table->count; i++)
+        {
+            slot = (table->infos[i].id * 0x9E3779B97F4A7C15ULL) & table->mask;
+            while (table->index[slot] != -1)
+                slot = (slot + 1) & table->mask;
+            table->index[slot] = (long) i;
+        }
+    }
+
+    return 0;
+}
+
+
+static inline struct rec_info* find_record(struct dispatch* table, unsigned long long rec_id)
+{
+    long i;
+    unsigned long long slot;
+
+    if (!table->mask)
+    {
+        if (rec_id >= table->limit)
+            return NULL;
+        i = table->index[rec_id];
+        return i < 0 ? NULL : &table->infos[i];
+    }
+
+    slot = (rec_id * 0x9E3779B97F4A7C15ULL) & table->mask;
+    while ((i = table->index[slot]) != -1)
+    {
+        if (table->infos[i].id == rec_id)
+            return &table->infos[i];
+        slot = (slot + 1) & table->mask;
+    }
+    return NULL;
+}
+
+
+static inline unsigned long long read_record_id(unsigned char* buf, unsigned long long id_size)
+{
+    unsigned long long rec_id = 0;
+    for (unsigned long long i=0; i<id_size; i++) {
+        rec_id += ((unsigned long long) buf[i]) << (i << 3);
+    }
+    return rec_id;
+}
 
 
 static PyObject* sort_data_block(PyObject* self, PyObject* args)
 {
-    unsigned long long id_size=0, position=0, size, tgt=10000;
-    unsigned long rec_size, length, rec_id;
-    PyObject *signal_data, *partial_records, *record_size, *optional, *mlist;
-    PyObject *bts, *key, *value, *rem=NULL;
-    unsigned char *buf, *end, *orig;
-    struct node * head = NULL, *last=NULL, *item;
-    
+    unsigned long long id_size=0, position=0, size, rec_size, length, rec_id, stop;
+    PyObject *signal_data, *partial_records, *record_size, *optional, *bts, *rem=NULL;
+    unsigned char *buf, *orig;
+    struct dispatch table;
+    struct rec_info *info;
+    Py_ssize_t i;
+
     if (!PyArg_ParseTuple(args, "OOOK|O", &signal_data, &partial_records, &record_size, &id_size, &optional))
     {
         snprintf(err_string, 1024, "sort_data_block was called with wrong parameters");
         PyErr_SetString(PyExc_ValueError, err_string);
         return 0;
     }
-    else
+
+    if (build_dispatch(&table, record_size, partial_records))
+        return 0;
+
+    orig = (unsigned char *) PyBytes_AS_STRING(signal_data);
+    size = (unsigned long long) PyBytes_GET_SIZE(signal_data);
+
+    // first pass: size of the fixed size records of each record ID and end
+    // of the last complete record
+    while (position + id_size < size)
     {
-        Py_ssize_t pos = 0;
-		position = 0;
-       
-        while (PyDict_Next(record_size, &pos, &key, &value)) 
+        buf = orig + position;
+        rec_id = read_record_id(buf, id_size);
+        info = find_record(&table, rec_id);
+
+        if (!info || !info->mlist) {
+            snprintf(err_string, 1024, "Unknown record id %llu", rec_id);
+            PyErr_SetString(PyExc_ValueError, err_string);
+            free_dispatch(&table);
+            return 0;
+        }
+
+        buf += id_size;
+        rec_size = info->size;
+        if (rec_size)
         {
-            item = malloc(sizeof(struct node));
-            item->info.id = PyLong_AsUnsignedLong(key);
-            item->info.size = PyLong_AsUnsignedLong(value);
-            item->info.mlist = PyDict_GetItem(partial_records, key);
-            item->next = NULL;
-            if (last)
-                last->next = item;
-            if (!head)
-                head = item;
-            last = item; 
+            if (rec_size + position + id_size > size)
+                break;
+            info->total += rec_size;
+            position += id_size + rec_size;
         }
- 
-        buf = (unsigned char *) PyBytes_AS_STRING(signal_data);
-        orig = buf;
-        size = (unsigned long long) PyBytes_GET_SIZE(signal_data);
-        end = buf + size;
-        
-        while ((buf + id_size) < end)
+        else
         {
- 
-            rec_id = 0; 
-            for (unsigned char i=0; i<id_size; i++, buf++) {
-                rec_id += (*buf) << (i <<3);
-            }  
-            
-            mlist = NULL;
-            for (item=head; item!=NULL; item=item->next)
-            {
-                if (item->info.id == rec_id)
-                {
-                    rec_size = item->info.size;
-                    mlist = item->info.mlist;
-                    break;
-                }
-            }
-            
-            if (!mlist) {
-                snprintf(err_string, 1024, "Unknown record id %uld ", rec_id);
-                PyErr_SetString(PyExc_ValueError, err_string);
+            if (4 + position + id_size > size)
+                break;
+            length = ((unsigned long long) buf[3] << 24) + (buf[2] << 16) + (buf[1] << 8) + buf[0] + 4;
+            if (position + length + id_size > size)
+                break;
+            position += id_size + length;
+        }
+    }
+    stop = position;
+
+    // one output bytes object for each record ID with fixed size records
+    for (i=0; i<table.count; i++)
+    {
+        info = &table.infos[i];
+        if (info->total)
+        {
+            bts = PyBytes_FromStringAndSize(NULL, (Py_ssize_t) info->total);
+            if (!bts || PyList_Append(info->mlist, bts)) {
+                Py_XDECREF(bts);
+                free_dispatch(&table);
                 return 0;
             }
-            
-            if (rec_size)
-            {
-                if (rec_size + position + id_size > size) {
-                    break;
-                }
-                bts = PyBytes_FromStringAndSize((const char *)buf, (Py_ssize_t) rec_size);
-                PyList_Append(
-                    mlist,
-                    bts
-                );
-                Py_DECREF(bts);
-
-                buf += rec_size;
+            info->out = PyBytes_AS_STRING(bts);
+            Py_DECREF(bts);
+        }
+    }
 
+    // second pass: copy the records; the VLSD records stay one bytes object
+    // each because their offsets are needed for the signal data
+    position = 0;
+    while (position < stop)
+    {
+        buf = orig + position;
+        info = find_record(&table, read_record_id(buf, id_size));
+        buf += id_size;
+        rec_size = info->size;
+        if (rec_size)
+        {
+            memcpy(info->out, buf, rec_size);
+            info->out += rec_size;
+            position += id_size + rec_size;
+        }
+        else
+        {
+            length = ((unsigned long long) buf[3] << 24) + (buf[2] << 16) + (buf[1] << 8) + buf[0] + 4;
+            bts = PyBytes_FromStringAndSize((const char *)buf, (Py_ssize_t) length);
+            if (!bts || PyList_Append(info->mlist, bts)) {
+                Py_XDECREF(bts);
+                free_dispatch(&table);
+                return 0;
             }
-            else
-            {
-                if (4 + position + id_size > size) {
-                    break;
-                }
-                rec_size = (buf[3] << 24) + (buf[2] << 16) +(buf[1] << 8) + buf[0];
-                length = rec_size + 4;
-                if (position + length + id_size > size) {
-                    break;
-                }
-                bts = PyBytes_FromStringAndSize((const char *)buf, (Py_ssize_t) length);
-                PyList_Append(mlist, bts);
-                Py_DECREF(bts);
-                buf += length;
-            }
-
-            position = (unsigned long long) (buf - orig);
-        } 
-        
-        while (head != NULL) {
-            item = head;
-            item->info.mlist = NULL;
-     
-            head = head->next;
-            item->next = NULL;
-            free(item);
+            Py_DECREF(bts);
+            position += id_size + length;
         }
-        
-        head = NULL;
-        last = NULL;
-        item = NULL;
-		mlist = NULL;
-		
-        rem = PyBytes_FromStringAndSize((const char *) (orig + position), (Py_ssize_t) (size - position));
-		
-		buf = NULL;
-		orig = NULL;
-		end = NULL;
-	
-        return rem;
     }
+
+    free_dispatch(&table);
+
+    rem = PyBytes_FromStringAndSize((const char *) (orig + stop), (Py_ssize_t) (size - stop));
+
+    return rem;
 }
 
 
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the lookup tables of the channel
+conversions: the conversion of the 8 and 16 bit integer raw samples is computed
+once for all the possible raw values, and the samples are then converted with
+a single *take* from the table. The value to text conversions can also give
+categories: integer codes and a small table of text labels
+"""
+
+import numpy as np
+
+__all__ = ["lookup_dtype", "build_lookup_table", "lookup", "convert_categorical"]
+
+# raw samples dtype -> unsigned dtype of the same size used as table index
+LUT_INDEX_DTYPES = {
+    np.dtype(raw): np.dtype(index)
+    for raw, index in (("u1", "u1"), ("i1", "u1"), ("u2", "u2"), ("i2", "u2"))
+}
+
+
+def lookup_dtype(values):
+    """native dtype of the lookup table that can convert the *values*
+
+    Parameters
+    ----------
+    values : np.ndarray
+        raw samples
+
+    Returns
+    -------
+    dtype : np.dtype | None
+        *None* if the samples can not be converted with a lookup table (not
+        an 1D array of 8 or 16 bit integers)
+
+    """
+    if not isinstance(values, np.ndarray) or values.ndim != 1:
+        return None
+
+    dtype = values.dtype
+    if dtype.names or dtype.kind not in "ui":
+        return None
+    if not dtype.isnative:
+        dtype = dtype.newbyteorder("=")
+
+    if dtype in LUT_INDEX_DTYPES:
+        return dtype
+    else:
+        return None
+
+
+def build_lookup_table(convert, dtype):
+    """converted values for all the raw values of the 8 or 16 bit *dtype*
+
+    Parameters
+    ----------
+    convert : callable
+        conversion function applied to the raw values
+    dtype : np.dtype
+        native raw dtype returned by *lookup_dtype*
+
+    Returns
+    -------
+    table : np.ndarray | None
+        the converted values in the order of the unsigned bit patterns of the
+        raw values; *None* if the conversion does not give one value for each
+        raw value
+
+    """
+    raw = np.arange(2 ** (8 * dtype.itemsize), dtype=LUT_INDEX_DTYPES[dtype]).view(
+        dtype
+    )
+
+    # the table covers raw values that may not be found in the samples
+    with np.errstate(all="ignore"):
+        try:
+            table = convert(raw)
+        except:
+            return None
+
+    if (
+        not isinstance(table, np.ndarray)
+        or table.shape != raw.shape
+        or table.dtype.names
+        or table.dtype.kind == "O"
+    ):
+        return None
+
+    return table
+
+
+def _index(values, dtype):
+    """unsigned view of the 8 or 16 bit integer *values* with native *dtype*"""
+    if values.dtype.isnative:
+        return values.view(LUT_INDEX_DTYPES[dtype])
+    else:
+        return values.view(
+            LUT_INDEX_DTYPES[dtype].newbyteorder(values.dtype.byteorder)
+        )
+
+
+def lookup(values, table):
+    """convert the raw *values* using the lookup *table*
+
+    Parameters
+    ----------
+    values : np.ndarray
+        raw samples accepted by *lookup_dtype*
+    table : np.ndarray
+        output of *build_lookup_table* for the samples dtype
+
+    Returns
+    -------
+    values : np.ndarray
+        converted samples
+
+    """
+    return table.take(_index(values, lookup_dtype(values)))
+
+
+def convert_categorical(convert, values):
+    """value to text conversion of the raw *values* as categories; only the
+    distinct raw values are converted
+
+    Parameters
+    ----------
+    convert : callable
+        value to text conversion function
+    values : np.ndarray
+        1D raw samples
+
+    Returns
+    -------
+    categories : tuple | None
+        (codes, labels): signed integer codes of the samples and the sorted
+        bytes array of the text labels; *None* if the conversion does not give
+        text for all the samples
+
+    """
+    if (
+        not isinstance(values, np.ndarray)
+        or values.ndim != 1
+        or values.dtype.names
+        or values.dtype.kind not in "uif"
+    ):
+        return None
+
+    dtype = lookup_dtype(values)
+
+    if dtype is not None:
+        # the raw values found in the samples are given by their histogram
+        index = _index(values, dtype)
+        present = np.flatnonzero(np.bincount(index, minlength=1))
+        raw = present.astype(LUT_INDEX_DTYPES[dtype]).view(dtype)
+    else:
+        raw, inverse = np.unique(values, return_inverse=True)
+
+    texts = convert(raw)
+    if (
+        not isinstance(texts, np.ndarray)
+        or texts.shape != raw.shape
+        or texts.dtype.kind != "S"
+    ):
+        return None
+
+    labels, text_codes = np.unique(texts, return_inverse=True)
+    # pandas.Categorical uses signed codes
+    text_codes = text_codes.astype(np.min_scalar_type(-len(labels) - 1))
+
+    if dtype is not None:
+        size = int(present[-1]) + 1 if len(present) else 0
+        table = np.zeros(size, dtype=text_codes.dtype)
+        table[present] = text_codes
+        codes = table.take(index)
+    else:
+        codes = text_codes.take(inverse)
+
+    return codes, labels
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the streaming MAT export
+"""
+
+from functools import reduce
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+__all__ = ["MatColumnStore", "categorical_objects"]
+
+MAT_COPY_SIZE = 2 ** 20
+
+
+def categorical_objects(values):
+    """object array of a categorical column, with the same items as
+    ``np.asarray(values)`` (the labels and NaN for the missing values); the
+    label objects are only referenced by the rows, so they are written as the
+    text columns without converting each sample
+
+    Parameters
+    ----------
+    values : pandas.Categorical
+        categorical column values
+
+    Returns
+    -------
+    values : np.array
+        object array
+
+    """
+    # the missing values have the code -1
+    labels = np.array([*values.categories, np.nan], dtype=object)
+    return labels.take(np.asarray(values.codes))
+
+
+class MatColumnStore:
+    """collects the columns of consecutive time windows for the *savemat*
+    export. The numeric columns are appended to temporary files and are
+    returned as memory maps, so the RAM usage does not depend on the
+    measurement length; the other columns (strings, objects) are kept in
+    memory.
+
+    If the dtype of a numeric column changes between windows (for example
+    after *reduce_memory_usage*) the column is promoted to the common dtype.
+
+    """
+
+    def __init__(self):
+        self._dir = TemporaryDirectory()
+        self._names = []
+        self._segments = {}
+        self._objects = {}
+
+    def append(self, name, values):
+        """append the *values* of the current window to the column *name*
+
+        Parameters
+        ----------
+        name : str
+            column name
+        values : np.array
+            column values for the current window
+
+        """
+        if name not in self._segments and name not in self._objects:
+            self._names.append(name)
+            if values.dtype.kind in "biufc" and values.ndim == 1:
+                self._segments[name] = []
+            else:
+                self._objects[name] = []
+
+        if name in self._segments:
+            with open(self._path(name), "ab") as fh:
+                np.ascontiguousarray(values).tofile(fh)
+            self._segments[name].append((values.dtype, len(values)))
+        else:
+            self._objects[name].append(values)
+
+    def _path(self, name, suffix=""):
+        return f"{self._dir.name}/{self._names.index(name)}{suffix}.bin"
+
+    def arrays(self):
+        """ return the whole columns
+
+        Returns
+        -------
+        mdict : dict
+            column name to numpy array (or read only memory map)
+
+        """
+        mdict = {}
+
+        for name in self._names:
+            if name in self._objects:
+                mdict[name] = np.concatenate(self._objects[name])
+                continue
+
+            segments = self._segments[name]
+            dtype = reduce(np.promote_types, [dtype for dtype, _ in segments])
+            size = sum(count for _, count in segments)
+
+            if not size:
+                mdict[name] = np.array([], dtype=dtype)
+
+            elif all(segment_dtype == dtype for segment_dtype, _ in segments):
+                mdict[name] = np.memmap(
+                    self._path(name), dtype=dtype, mode="r", shape=(size,)
+                )
+
+            else:
+                array = np.memmap(
+                    self._path(name, "_promoted"), dtype=dtype, mode="w+", shape=(size,)
+                )
+                position = 0
+                with open(self._path(name), "rb") as fh:
+                    for segment_dtype, count in segments:
+                        while count:
+                            read = min(count, MAT_COPY_SIZE)
+                            array[position : position + read] = np.fromfile(
+                                fh, dtype=segment_dtype, count=read
+                            )
+                            position += read
+                            count -= read
+                array.flush()
+                mdict[name] = array
+
+        return mdict
+
+    def close(self):
+        """ remove the temporary files """
+        self._segments.clear()
+        self._objects.clear()
+        try:
+            self._dir.cleanup()
+        except OSError:
+            # memory maps that are still referenced on Windows
+            pass
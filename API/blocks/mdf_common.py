@@ -2,18 +2,105 @@
 ASAM MDF version 4 file format module
 """
 
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+import io
 import logging
+import threading
 
-from API.blocks.utils import MdfException
+import numpy as np
+
+from API.blocks import v4_constants as v4c
+from API.blocks.utils import MdfException, snap_sampling_rate
 
 logger = logging.getLogger("asammdf")
 
-__all__ = ["MDF_Common"]
+__all__ = ["MDF_Common", "ThreadReadState"]
+
+# the binary search of the master inside an uncompressed block stops when the
+# remaining records fit in this many bytes; they are read in one piece
+MASTER_SEARCH_SIZE = 64 * 2 ** 10
+
+
+class ThreadReadState(threading.local):
+    """read state of a MDF object that is private to each thread: the file
+    handle of a reader thread (see *MDF_Common.reader_thread*) and the
+    temporary master of the current selection"""
+
+    file = None
+    master = None
 
 
 class MDF_Common:
     """common methods for MDF objects"""
 
+    def _thread_state(self):
+        state = self.__dict__.get("_thread_read_state")
+        if state is None:
+            state = self.__dict__.setdefault("_thread_read_state", ThreadReadState())
+        return state
+
+    @property
+    def _file(self):
+        stream = self._thread_state().file
+        if stream is None:
+            return self.__dict__.get("_shared_file")
+        return stream
+
+    @_file.setter
+    def _file(self, stream):
+        self.__dict__["_shared_file"] = stream
+
+    @property
+    def _master(self):
+        return self._thread_state().master
+
+    @_master.setter
+    def _master(self, master):
+        self._thread_state().master = master
+
+    def supports_reader_threads(self):
+        """*True* if the groups can be read by parallel reader threads
+        (see *reader_thread*): the data of all the groups is in the original
+        file, that was opened from its path
+
+        Returns
+        -------
+        supported : bool
+
+        """
+        return (
+            not self._from_filelike
+            and isinstance(self.__dict__.get("_shared_file"), io.BufferedReader)
+            and all(
+                group.data_location == v4c.LOCATION_ORIGINAL_FILE
+                for group in self.groups
+            )
+        )
+
+    @contextmanager
+    def reader_thread(self):
+        """context in which the calling thread reads the data blocks with its
+        own handle of the original file, so that several threads can *get* or
+        *select* channels of different groups at the same time. The parsed
+        metadata and the caches are shared; only use it if
+        *supports_reader_threads* returns *True*
+
+        Examples
+        --------
+        >>> with mdf.reader_thread():
+        ...     signals = mdf.select(channels)
+
+        """
+        state = self._thread_state()
+        state.file = open(self.name, "rb")
+        try:
+            yield self
+        finally:
+            state.file.close()
+            state.file = None
+            state.master = None
+
     def _get_source_names(self, gp_idx, cn_idx):
         group = self.groups[gp_idx]
         cn_source_name = group.channels[cn_idx].source.name
@@ -48,6 +135,296 @@ class MDF_Common:
     def _set_temporary_master(self, master):
         self._master = master
 
+    def get_sampling_rate(self, index):
+        """get the sampling rate of a channel group. The rate is estimated on
+        the first call, from a few short windows of the master channel, and
+        then cached. For MDF version 4 files the value is also set as the
+        *sampling_rate* attribute of the group's channels.
+
+        Parameters
+        ----------
+        index : int
+            group index
+
+        Returns
+        -------
+        sampling_rate : float | None
+            canonical raster in seconds; *None* if the estimation is disabled
+            (`compute_sampling_rates=False`) or the group has too few samples
+
+        """
+        if index in self._sampling_rates:
+            return self._sampling_rates[index]
+
+        if self._compute_sampling_rates:
+            sampling_rate = self._estimate_sampling_rate(index)
+        else:
+            sampling_rate = None
+
+        self._sampling_rates[index] = sampling_rate
+
+        if self.version >= "4.00":
+            for channel in self.groups[index].channels:
+                channel.sampling_rate = sampling_rate
+
+        return sampling_rate
+
+    def _estimate_sampling_rate(self, index, windows=4, window_size=26):
+        """estimate the group raster using *windows* partial master reads of
+        *window_size* records spread evenly over the group records"""
+        cycles_nr = self.groups[index].channel_group.cycles_nr
+        if cycles_nr <= 3:
+            return None
+
+        window_size = min(window_size, cycles_nr)
+        last_offset = cycles_nr - window_size
+        offsets = sorted(
+            {last_offset * i // (windows - 1) for i in range(windows)}
+        )
+
+        master, self._master = self._master, None
+        try:
+            diffs = [
+                np.diff(
+                    self.get_master(
+                        index, record_offset=offset, record_count=window_size
+                    )[:window_size]
+                )
+                for offset in offsets
+            ]
+        finally:
+            self._master = master
+
+        diffs = np.concatenate(diffs)
+        diffs = diffs[np.isfinite(diffs)]
+        if not len(diffs):
+            return None
+
+        return snap_sampling_rate(float(np.mean(diffs)))
+
+    def get_record_range(self, index, start=None, stop=None):
+        """get the records of a channel group whose master values are inside
+        the time window [*start*, *stop*]. The master channel must be
+        increasing. The search starts from the known values of the group
+        sparse time index (see *get_master_value*), continues with single
+        record reads at the data block boundaries and then inside the found
+        block, so only a few blocks are read (and inflated) instead of the
+        whole master channel.
+
+        Parameters
+        ----------
+        index : int
+            group index
+        start : float | None
+            window start; default *None* means from the first record
+        stop : float | None
+            window stop (included); default *None* means up to the last record
+
+        Returns
+        -------
+        record_offset, record_count : int, int
+            first record and number of records inside the window; they can be
+            used as the *record_offset* and *record_count* arguments of the
+            data read methods
+
+        """
+        group = self.groups[index]
+        channel_group = group.channel_group
+
+        if self.version >= "4.00" and (
+            channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER
+        ):
+            return self.get_record_range(channel_group.cg_master_index, start, stop)
+
+        cycles_nr = channel_group.cycles_nr
+        if not cycles_nr or (start is None and stop is None):
+            return 0, cycles_nr
+
+        # the two searches share most of the probed records
+        probes = {}
+        first = end = None
+        if start is not None:
+            first = self._search_master(index, start, "left", probes)
+        if stop is not None:
+            end = self._search_master(index, stop, "right", probes)
+
+        # the master values of the remaining records are read once if the
+        # two ranges overlap
+        if first is not None and end is not None and end[0] <= first[1]:
+            low, high = min(first[0], end[0]), max(first[1], end[1])
+            t = self._read_master(index, low, high)
+            first = self._locate(t, low, first, start, "left")
+            end = self._locate(t, low, end, stop, "right")
+        else:
+            if first is not None:
+                t = self._read_master(index, *first)
+                first = self._locate(t, first[0], first, start, "left")
+            if end is not None:
+                t = self._read_master(index, *end)
+                end = self._locate(t, end[0], end, stop, "right")
+
+        if first is None:
+            first = 0
+        if end is None:
+            end = cycles_nr
+
+        return first, max(end - first, 0)
+
+    def _read_master(self, index, low, high):
+        """master values of the records from *low* to *high* (excluded)"""
+        if high <= low:
+            return np.array([], dtype="<f8")
+        master, self._master = self._master, None
+        try:
+            t = self.get_master(index, record_offset=low, record_count=high - low)
+        finally:
+            self._master = master
+        return t[: high - low]
+
+    @staticmethod
+    def _locate(t, offset, bracket, value, side):
+        """final *searchsorted* step of *_search_master*; *t* holds the master
+        values of the records starting from *offset*"""
+        low, high = bracket
+        if high <= low:
+            return low
+        return low + int(
+            np.searchsorted(t[low - offset : high - offset], value, side=side)
+        )
+
+    def get_master_value(self, index, record):
+        """get the master value of a single record. The values of the first
+        and last records of the group and of the first record of each data
+        block form the group sparse time index (*Group.time_index*); they
+        are read only once, and for MDF version 4 files they are also stored
+        in the metadata cache
+
+        Parameters
+        ----------
+        index : int
+            group index
+        record : int
+            record index
+
+        Returns
+        -------
+        value : float | None
+            master value; *None* if the record does not exist
+
+        """
+        group = self.groups[index]
+        channel_group = group.channel_group
+
+        if self.version >= "4.00" and (
+            channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER
+        ):
+            return self.get_master_value(channel_group.cg_master_index, record)
+
+        keep = record in (0, channel_group.cycles_nr - 1)
+        return self._probe_master(index, record, keep)
+
+    def _probe_master(self, index, record, keep=False):
+        """master value of a single record; with *keep=True* the value is
+        added to the group sparse time index"""
+        time_index = self.groups[index].time_index
+        if record in time_index:
+            return time_index[record]
+
+        master, self._master = self._master, None
+        try:
+            t = self.get_master(index, record_offset=record, record_count=1)
+        finally:
+            self._master = master
+
+        value = float(t[0]) if len(t) else None
+        if keep:
+            time_index[record] = value
+        return value
+
+    def _block_records(self, group):
+        """first record and block type of each data block of the group"""
+        channel_group = group.channel_group
+        record_size = channel_group.samples_byte_nr
+        if self.version >= "4.00" and not group.uses_ld:
+            record_size += channel_group.invalidation_bytes_nr
+
+        records, block_types = [], []
+        if record_size:
+            position = 0
+            for info in group.data_blocks:
+                records.append(position // record_size)
+                block_types.append(info.block_type)
+                position += info.raw_size
+
+        return record_size, records, block_types
+
+    def _search_master(self, index, value, side, probes=None):
+        """range of records that holds the first record whose master value is
+        not lower than *value* (*side="left"*) or greater than *value*
+        (*side="right"*), with the same meaning as *numpy.searchsorted*. The
+        range is narrowed without reading whole blocks; *probes* caches the
+        master values of the records probed inside the blocks
+
+        Returns
+        -------
+        low, high : int, int
+            the searched record is in [*low*, *high*]; the master values of
+            the records from *low* to *high* (excluded) must still be searched
+
+        """
+        group = self.groups[index]
+        cycles_nr = group.channel_group.cycles_nr
+
+        if probes is None:
+            probes = {}
+
+        def before(t):
+            if t is None:
+                return False
+            return t < value if side == "left" else t <= value
+
+        low, high = 0, cycles_nr
+
+        record_size, records, block_types = self._block_records(group)
+
+        # the unsorted MDF3 groups are always read completely
+        if records and getattr(group, "sorted", True):
+            # the known values of the sparse time index narrow the search
+            for record, t in group.time_index.items():
+                if record < cycles_nr:
+                    if before(t):
+                        low = max(low, record + 1)
+                    else:
+                        high = min(high, record)
+
+            # then the data block that holds the value, by probing the first
+            # record of the blocks; each probe inflates at most one block
+            block_type = block_types[max(bisect_right(records, low) - 1, 0)]
+            i = max(bisect_left(records, low), 1)
+            j = bisect_left(records, high)
+            while i < j:
+                k = (i + j) // 2
+                if before(self._probe_master(index, records[k], keep=True)):
+                    low = records[k] + 1
+                    block_type = block_types[k]
+                    i = k + 1
+                else:
+                    high = records[k]
+                    j = k
+
+            # and the records of an uncompressed block
+            if block_type == v4c.DT_BLOCK:
+                while (high - low) * record_size > MASTER_SEARCH_SIZE:
+                    record = (low + high) // 2
+                    if record not in probes:
+                        probes[record] = self._probe_master(index, record)
+                    if before(probes[record]):
+                        low = record + 1
+                    else:
+                        high = record
+
+        return low, high
+
     # @lru_cache(maxsize=1024)
     def _validate_channel_selection(
         self, name=None, group=None, index=None, source=None
@@ -9,6 +9,18 @@
     Functions
     ---------
     *   MDF3._read - Calculate sampling rate of channel group and set as Channel's attribute
+
+    Date : 2026-10-18
+
+    *   MDF3._read - Sampling rate is no longer calculated at load time; it is estimated
+        on first request by MDF_Common.get_sampling_rate and the channel block
+        sampling_rate field is left untouched
+    *   MDF3._load_data - Stop reading sorted groups after record_count records
+    *   MDF3._get_not_byte_aligned_data - Read the bit fields up to 8 bytes long with
+        bitfield_utils.extract_bit_fields instead of a structured dtype copy
+    *   MDF3._sort - Unsorted data groups are read in fragments and split by record ID
+        with NumPy (sort_utils.demultiplex_records); records that cross a fragment
+        are carried over and the sorted records are written in large batches
 """
 
 from collections import defaultdict
@@ -22,7 +34,6 @@ import sys
 from tempfile import TemporaryFile
 import time
 import xml.etree.ElementTree as ET
-import random
 
 from numpy import (
     arange,
@@ -47,8 +58,15 @@ from pandas import DataFrame
 from API.blocks import v2_v3_constants as v23c
 from API.signals import Signal
 from API.version import __version__
+from API.blocks.bitfield_utils import bit_field_size, extract_bit_fields
 from API.blocks.conversion_utils import conversion_transfer
 from API.blocks.mdf_common import MDF_Common
+from API.blocks.sort_utils import (
+    demultiplex_records,
+    record_steps,
+    SORT_READ_SIZE,
+    SORT_WRITE_SIZE,
+)
 from API.blocks.source_utils import Source
 from API.blocks.utils import (
     as_non_byte_sized_signed_int,
@@ -122,6 +140,10 @@ class MDF3(MDF_Common):
         keyword only argument: function to call to update the progress; the
         function must accept two arguments (the current progress and maximum
         progress value)
+    compute_sampling_rates (True) : bool
+        estimate the channel group sampling rates on request (see
+        *get_sampling_rate*); if *False* no data is read for this and the
+        sampling rates are *None*
 
 
     Attributes
@@ -180,6 +202,9 @@ class MDF3(MDF_Common):
         self._read_fragment_size = 0
         self._write_fragment_size = 4 * 2 ** 20
         self._single_bit_uint_as_bool = False
+        self.copy_on_get = kwargs.get("copy_on_get", True)
+        self._compute_sampling_rates = kwargs.get("compute_sampling_rates", True)
+        self._sampling_rates = {}
         self._integer_interpolation = 0
 
         self._si_map = {}
@@ -287,10 +312,17 @@ class MDF3(MDF_Common):
 
                 blocks = iter(group.data_blocks)
 
+                if record_count is not None:
+                    remaining_size = record_count * samples_size
+                else:
+                    remaining_size = None
+
                 cur_size = 0
                 data = []
 
                 while True:
+                    if remaining_size is not None and remaining_size <= 0:
+                        break
                     try:
                         info = next(blocks)
                         address, size = info.address, info.size
@@ -311,6 +343,10 @@ class MDF3(MDF_Common):
                         size -= delta
                         offset = record_offset
 
+                    if remaining_size is not None:
+                        size = min(size, remaining_size)
+                        remaining_size -= size
+
                     while size >= split_size - cur_size:
                         stream.seek(current_address)
                         if data:
@@ -597,6 +633,29 @@ class MDF3(MDF_Common):
         else:
             byte_size //= 8
 
+        data_type = channel.data_type
+        big_endian = data_type in big_endian_types
+
+        if bit_field_size(bit_offset, bit_count)[1]:
+            vals = extract_bit_fields(
+                data,
+                record_size,
+                [
+                    (
+                        byte_offset,
+                        bit_offset,
+                        bit_count,
+                        data_type in v23c.SIGNED_INT,
+                        big_endian,
+                    )
+                ],
+            )[0]
+            if data_type in v23c.FLOATS:
+                vals = vals.view(
+                    get_fmt_v3(data_type, bit_count, self.identification.byte_order)
+                )
+            return vals
+
         types = [
             ("", f"a{byte_offset}"),
             ("vals", f"({byte_size},)u1"),
@@ -614,8 +673,6 @@ class MDF3(MDF_Common):
 
         std_size = byte_size + extra_bytes
 
-        big_endian = channel.data_type in big_endian_types
-
         # prepend or append extra bytes columns
         # to get a standard size number of bytes
 
@@ -664,8 +721,6 @@ class MDF3(MDF_Common):
                 vals = vals >> bit_offset
                 vals &= (1 << bit_count) - 1
 
-        data_type = channel.data_type
-
         if data_type in v23c.SIGNED_INT:
             return as_non_byte_sized_signed_int(vals, bit_count)
         elif data_type in v23c.FLOATS:
@@ -942,71 +997,7 @@ class MDF3(MDF_Common):
             dg_addr = data_group.next_dg_addr
 
         # finally update the channel depency references
-        # update sampling rate
-        gp_index = -1
         for grp in self.groups:
-            # calculate sampling rate
-            # get sampling rate
-            gp_index += 1
-            timestamps = self.get_master(gp_index)
-            if len(timestamps) <= 3:
-                continue
-            result = 0
-            for i in range(100):
-                random_t = random.randrange(2, len(timestamps)-1)
-                result += timestamps[random_t] - timestamps[random_t - 1]
-
-            result = result / 100
-
-            # get round position
-            raster_under = set()
-            for x in range(9):
-                for y in range(4):
-                    val = pow(2, x) * pow(5, y)
-                    if val <= 1000:
-                        raster_under.add(1 / val)
-            raster_under = list(raster_under)
-            raster_under.sort()
-
-            raster_over = [1, 1 / 0.2, 1 / 0.4, 1 / 0.5, 1 / 0.8]
-
-            result_str = str(result)
-
-            ch_raster = None
-            found = False
-
-            if int(result_str.split(".")[0]) > 0:
-                for pos in reversed(range(4)):
-                    if found:
-                        break
-                    for raster in raster_over:
-                        if round(result, pos) == raster:
-                            ch_raster = raster
-                            found = True
-                            break
-            else:
-                for pos in reversed(range(11)):
-                    if found:
-                        break
-                    for raster in raster_under:
-                        if round(result, pos) == raster:
-                            ch_raster = raster
-                            found = True
-                            break
-
-            if ch_raster is None:
-                min_value = 100
-                min_raster = temp_raster = round(result, 5)
-                raster_all = raster_over + raster_under
-                for raster in raster_all:
-                    if abs(temp_raster - raster) < min_value:
-                        min_value = abs(temp_raster - raster)
-                        min_raster = raster
-                ch_raster = min_raster
-
-            for _, ch in enumerate(grp.channels):
-                ch.sampling_rate = ch_raster
-
             for dep in grp.channel_dependencies:
                 if dep:
                     for i in range(dep.sd_nr):
@@ -3620,59 +3611,84 @@ class MDF3(MDF_Common):
 
         for address, groups in common.items():
 
-            partial_records = {id_: [] for (_, id_) in groups}
+            blocks_info = {id_: [] for (_, id_) in groups}
+            pending = {id_: [] for (_, id_) in groups}
+            pending_size = 0
 
             group = self.groups[groups[0][0]]
 
             record_id_nr = group.data_group.record_id_len
             cg_size = group.record_size
+            steps = record_steps(cg_size, record_id_nr)
 
-            for info in group.data_blocks:
-                address, size, block_size, block_type, param = (
-                    info.address,
-                    info.raw_size,
-                    info.size,
-                    info.block_type,
-                    info.param,
-                )
-                seek(address)
-                data = read(block_size)
-
-                size = len(data)
-                i = 0
-                while i < size:
-                    rec_id = data[i]
-                    # skip record id
-                    i += 1
-                    rec_size = cg_size[rec_id]
-                    partial_records[rec_id].append(data[i : i + rec_size])
-                    # consider the second record ID if it exists
-                    if record_id_nr == 2:
-                        i += rec_size + 1
+            def flush():
+                # one large write for each record ID; consecutive writes of
+                # the same record ID are merged in a single block
+                for rec_id, arrays in pending.items():
+                    if not arrays:
+                        continue
+                    address = tell()
+                    size = 0
+                    for records in arrays:
+                        write(records)
+                        size += records.nbytes
+                    arrays.clear()
+
+                    info = blocks_info[rec_id]
+                    if info and info[-1].address + info[-1].size == address:
+                        info[-1].size += size
+                        info[-1].raw_size += size
                     else:
-                        i += rec_size
+                        info.append(
+                            DataBlockInfo(
+                                address=address,
+                                block_type=0,
+                                raw_size=size,
+                                size=size,
+                                param=0,
+                            )
+                        )
 
-            for rec_id, new_data in partial_records.items():
-                if new_data:
-                    new_data = b"".join(new_data)
-                    size = len(new_data)
+            # the data is read in fragments; the incomplete record at the end
+            # of a fragment is carried to the next one
+            rem = b""
+            for info in group.data_blocks:
+                seek(info.address)
+                remaining = info.size
+                while remaining > 0:
+                    data = read(min(SORT_READ_SIZE, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    if rem:
+                        data = rem + data
 
-                    address = tell()
-                    write(bytes(new_data))
-                    block_info = DataBlockInfo(
-                        address=address,
-                        block_type=0,
-                        raw_size=size,
-                        size=size,
-                        param=0,
+                    records, end = demultiplex_records(
+                        data, cg_size, record_id_nr, steps
                     )
-                    partial_records[rec_id] = [block_info]
+                    rem = data[end:]
+
+                    for rec_id, new_records in records.items():
+                        pending[rec_id].append(new_records)
+                        pending_size += new_records.nbytes
+
+                    if pending_size >= SORT_WRITE_SIZE:
+                        flush()
+                        pending_size = 0
+
+            flush()
+
+            if rem:
+                logger.warning(
+                    f"Unsorted data group at {address:X} ends with an incomplete "
+                    f"record ({len(rem)} bytes); the bytes are ignored"
+                )
 
             for idx, rec_id in groups:
                 group = self.groups[idx]
 
                 group.data_location = v23c.LOCATION_TEMPORARY_FILE
-                group.set_blocks_info(partial_records[rec_id])
+                group.set_blocks_info(blocks_info[rec_id])
                 group.sorted = True
 
     def included_channels(
@@ -10,11 +10,45 @@ ASAM MDF version 4 file format module
     ---------
     *   MDF4._read : Calculate sampling rate of channel group and set as Channel's attribute
 
+    Date : 2026-10-18
+
+    *   MDF4._read : Sampling rate is no longer calculated at load time; it is estimated
+        on first request by MDF_Common.get_sampling_rate using partial master reads
+    *   MDF4.get_master : Apply record_offset for virtual and missing master channels
+    *   MDF4.__init__ : Restore the parsed structure from the persistent metadata cache
+        (metadata_cache argument) and skip the block parsing on repeated opens
+    *   MDF4._load_data : Read ahead and inflate the DZ blocks on a thread pool
+        (decompression_threads argument)
+    *   MDF4._load_data : Uncompressed DT blocks of the original file are returned as
+        views of a read only memory map (memory_map argument)
+    *   MDF4.__init__ : Unfinalized files are finalized in memory on top of the original
+        file (overlay_finalization argument) instead of a finalized temporary copy
+    *   MDF4._finalize : Follow the data group links instead of scanning the whole file,
+        only patch the length of the last DT block, fix the variable length DL update
+    *   MDF4._get_scalar : The channel extraction (record field, byte order view, bit
+        shift and mask) is computed once per channel and cached in Group.extraction_plans
+    *   MDF4._get_scalar, MDF4.get_master : Read the record fields from a plain structured
+        view of the fragment instead of a numpy.recarray
+    *   MDF4._yield_selected_signals : The non byte aligned channels of each fragment are
+        extracted together by MDF4._read_bit_fields (bitfield_utils.extract_bit_fields)
+    *   MDF4._get_not_byte_aligned_data : Read the bit fields up to 8 bytes long with
+        bitfield_utils.extract_bit_fields instead of a structured dtype copy
+    *   MDF4._load_data : Only the byte ranges of the requested channels are read from
+        the uncompressed blocks of wide records (selective_read argument); the bytes
+        read are reported by MDF4.read_statistics
+    *   MDF4._load_data : The compressed blocks after the requested records are not read
+    *   MDF4.close : The values of the groups sparse time index (Group.time_index) are
+        stored in the metadata cache and restored by MDF4._load_metadata_cache
+    *   MDF_Common.reader_thread : The file handle and the temporary master are per
+        thread, so that reader threads can load different groups in parallel
+    *   sort_data_block : The record IDs are dispatched with a direct index or hash
+        table (cutils.c) and the fixed size records of each record ID are copied in a
+        single bytes object per block (C extension and Python fallback)
+
 """
 
-import bisect
-import random
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from functools import lru_cache
 from hashlib import md5
@@ -25,8 +59,10 @@ import mmap
 import os
 from pathlib import Path
 import shutil
+from struct import pack
 import sys
 from tempfile import gettempdir, TemporaryFile
+import threading
 from traceback import format_exc
 from zlib import decompress
 
@@ -68,12 +104,27 @@ from pandas import DataFrame
 from API.blocks import v4_constants as v4c
 from API.signals import Signal
 from API.version import __version__
+from API.blocks.bitfield_utils import bit_field_size, extract_bit_fields
 from API.blocks.bus_logging_utils import extract_mux
+from API.blocks.overlay_utils import FileOverlay, next_block_address
+from API.blocks.prefetch_utils import inflate_block, iter_block_data
+from API.blocks.selective_utils import (
+    merge_byte_ranges,
+    read_byte_ranges,
+    SELECTIVE_READ_MIN_RECORD_SIZE,
+    SELECTIVE_READ_RATIO,
+)
+from API.blocks.cache_utils import (
+    load_metadata,
+    metadata_cache_dir,
+    metadata_cache_key,
+    save_metadata,
+)
 from API.blocks.conversion_utils import conversion_transfer
 from API.blocks.mdf_common import MDF_Common
+from API.blocks.sort_utils import gather_records
 from API.blocks.source_utils import Source
 from API.blocks.utils import (
-    all_blocks_addresses,
     as_non_byte_sized_signed_int,
     CHANNEL_COUNT,
     ChannelsDB,
@@ -131,6 +182,29 @@ COMMON_SHORT_SIZE = v4c.COMMON_SHORT_SIZE
 COMMON_SHORT_uf = v4c.COMMON_SHORT_uf
 COMMON_SHORT_u = v4c.COMMON_SHORT_u
 
+# extraction plan sources, see MDF4._get_extraction_plan
+PLAN_NOT_BYTE_ALIGNED = 0
+PLAN_BUFFER = 1
+PLAN_FIELD = 2
+
+# parsed file structure stored in the persistent metadata cache
+METADATA_CACHE_ATTRIBUTES = (
+    "version",
+    "file_limit",
+    "identification",
+    "header",
+    "file_history",
+    "attachments",
+    "events",
+    "groups",
+    "channels_db",
+    "masters_db",
+    "virtual_groups",
+    "virtual_groups_map",
+    "bus_logging_map",
+    "_cg_map",
+    "_cn_data_map",
+)
 
 logger = logging.getLogger("mdfstudioAPI")
 
@@ -189,10 +263,33 @@ except:
             bytes: rest of data which couldn't be parsed, can be used in consecutive
                 reading attempt
         """
-        i = 0
         size = len(signal_data)
+
+        record_sizes = set(cg_size.values())
+        if len(record_sizes) == 1 and 0 not in record_sizes:
+            # all the records have the same size: the record starts are known
+            step = record_sizes.pop() + record_id_nr
+            end = size - size % step
+            buffer = frombuffer(signal_data, dtype=uint8, count=end)
+            records = buffer.reshape(-1, step)
+            ids = (
+                records[:, :record_id_nr]
+                .copy()
+                .view(f"<u{record_id_nr}")
+                .ravel()
+            )
+            for rec_id in unique(ids).tolist():
+                partial_records[rec_id].append(
+                    records[ids == rec_id, record_id_nr:].tobytes()
+                )
+            return signal_data[end:]
+
+        i = 0
         pos = 0
         rem = b""
+        # fixed size records: only the offsets are collected and the records
+        # of each record ID are copied at once in a single bytes object
+        offsets = {rec_id: [] for rec_id in partial_records}
         while i + record_id_nr < size:
             (rec_id,) = _unpack_stuct(signal_data, i)
             # skip record id
@@ -202,9 +299,8 @@ except:
                 if rec_size + i > size:
                     rem = signal_data[pos:]
                     break
-                endpoint = i + rec_size
-                partial_records[rec_id].append(signal_data[i:endpoint])
-                i = endpoint
+                offsets[rec_id].append(i)
+                i += rec_size
             else:
                 if i + 4 > size:
                     rem = signal_data[pos:]
@@ -220,6 +316,13 @@ except:
         else:
             rem = signal_data[pos:]
 
+        buffer = frombuffer(signal_data, dtype=uint8)
+        for rec_id, rec_offsets in offsets.items():
+            if rec_offsets:
+                partial_records[rec_id].append(
+                    gather_records(buffer, rec_offsets, cg_size[rec_id]).tobytes()
+                )
+
         return rem
 
     def lengths(iterable):
@@ -278,6 +381,10 @@ class MDF4(MDF_Common):
         copy channel values (np.array) to avoid high memory usage
     compact_vlsd (False) : bool
         use slower method to save the exact sample size for VLSD channels
+    compute_sampling_rates (True) : bool
+        estimate the channel group sampling rates on request (see
+        *get_sampling_rate*); if *False* no data is read for this and the
+        sampling rates are *None*
     column_storage (True) : bool
         use column storage for MDF version >= 4.20
 
@@ -359,6 +466,25 @@ class MDF4(MDF_Common):
         )
         self.copy_on_get = kwargs.get("copy_on_get", True)
         self.compact_vlsd = kwargs.get("compact_vlsd", False)
+        self._compute_sampling_rates = kwargs.get("compute_sampling_rates", True)
+        self._sampling_rates = {}
+        self._metadata_cache_dir = metadata_cache_dir(
+            kwargs.get("metadata_cache", False)
+        )
+        self._metadata_cache_key = None
+        self._cached_sampling_rates = 0
+        self._cached_time_points = 0
+        self._decompression_threads = kwargs.get(
+            "decompression_threads", os.cpu_count() or 1
+        )
+        self._decompression_pool = None
+        # lazy creation of the shared pool and memory map by reader threads
+        self._resources_lock = threading.Lock()
+        self._use_memory_map = kwargs.get("memory_map", sys.maxsize > 2 ** 32)
+        self._file_map = None
+        self._file_view = None
+        self._selective_read = kwargs.get("selective_read", True)
+        self._bytes_read = 0
         self._single_bit_uint_as_bool = False
         self._integer_interpolation = 0
         self.virtual_groups = {}  # master group 2 referencing groups
@@ -387,7 +513,14 @@ class MDF4(MDF_Common):
                     version = version.decode("utf-8").strip(" \n\t\0")
                     flags = identification["unfinalized_standard_flags"]
 
-                if version >= "4.10" and flags:
+                if version >= "4.10" and flags and kwargs.get("overlay_finalization", True):
+                    # the finalization fix-ups are applied in memory on top of
+                    # the read only original file
+                    self.name = Path(name)
+                    self._file = FileOverlay(open(self.name, "rb"))
+                    self._from_filelike = False
+                    self._read(mapped=False)
+                elif version >= "4.10" and flags:
                     tmpdir = Path(gettempdir())
                     self.name = tmpdir / Path(name).name
                     shutil.copy(name, self.name)
@@ -395,23 +528,26 @@ class MDF4(MDF_Common):
                     self._from_filelike = False
                     self._read(mapped=False)
                 else:
+                    self.name = Path(name)
+                    self._from_filelike = False
+
+                    if self._load_metadata_cache():
+                        self._file = open(self.name, "rb")
 
-                    if sys.maxsize < 2 ** 32:
-                        self.name = Path(name)
+                    elif sys.maxsize < 2 ** 32:
                         self._file = open(self.name, "rb")
-                        self._from_filelike = False
                         self._read(mapped=False)
+                        self._save_metadata_cache()
                     else:
-                        self.name = Path(name)
                         x = open(self.name, "rb")
                         self._file = mmap.mmap(x.fileno(), 0, access=mmap.ACCESS_READ)
-                        self._from_filelike = False
                         self._read(mapped=True)
 
                         self._file.close()
                         x.close()
 
                         self._file = open(self.name, "rb")
+                        self._save_metadata_cache()
 
         else:
             self._from_filelike = False
@@ -480,6 +616,75 @@ class MDF4(MDF_Common):
 
         return flags
 
+    def _metadata_cache_options(self):
+        """open options that change the parsed structure"""
+        return {
+            "channels": sorted(self.load_filter),
+            "use_display_names": self._use_display_names,
+            "remove_source_from_channel_names": self._remove_source_from_channel_names,
+        }
+
+    def _load_metadata_cache(self):
+        """restore the parsed file structure from the metadata cache
+
+        Returns
+        -------
+        loaded : bool
+            *True* if a valid cache entry was found
+
+        """
+        if self._metadata_cache_dir is None:
+            return False
+
+        try:
+            self._metadata_cache_key = metadata_cache_key(
+                self.name, self._metadata_cache_options()
+            )
+        except OSError:
+            self._metadata_cache_key = None
+            return False
+
+        state = load_metadata(self._metadata_cache_dir, self._metadata_cache_key)
+        if state is None:
+            return False
+
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self._mapped = False
+
+        sampling_rates = load_metadata(
+            self._metadata_cache_dir, self._metadata_cache_key, suffix=".rates"
+        )
+        if sampling_rates:
+            for index, sampling_rate in sampling_rates.items():
+                self._sampling_rates[index] = sampling_rate
+                for channel in self.groups[index].channels:
+                    channel.sampling_rate = sampling_rate
+            self._cached_sampling_rates = len(sampling_rates)
+
+        time_indexes = load_metadata(
+            self._metadata_cache_dir, self._metadata_cache_key, suffix=".times"
+        )
+        if time_indexes:
+            for index, time_index in time_indexes.items():
+                self.groups[index].time_index.update(time_index)
+            self._cached_time_points = sum(
+                len(time_index) for time_index in time_indexes.values()
+            )
+
+        cg_count = len(self.groups)
+        self.progress = cg_count, cg_count
+
+        return True
+
+    def _save_metadata_cache(self):
+        """store the parsed file structure in the metadata cache"""
+        if self._metadata_cache_key is None:
+            return
+
+        state = {attr: getattr(self, attr) for attr in METADATA_CACHE_ATTRIBUTES}
+        save_metadata(self._metadata_cache_dir, self._metadata_cache_key, state)
+
     def _read(self, mapped=False):
 
         stream = self._file
@@ -689,69 +894,6 @@ class MDF4(MDF_Common):
         # channel dependencies and load the signal data for VLSD channels
         for gp_index, grp in enumerate(self.groups):
 
-            # get sampling rate
-            timestamps = self.get_master(gp_index)
-
-            result = 0
-
-            #yda 2021-01-11
-            if len(timestamps) > 3:
-
-
-                for i in range(100):
-                    random_t = random.randrange(2, len(timestamps)-1)
-                    result += timestamps[random_t] - timestamps[random_t - 1]
-                result = result / 100
-
-                # get round position
-                raster_under = set()
-                for x in range(9):
-                    for y in range(4):
-                        val = pow(2,x) * pow(5,y)
-                        if val <= 1000:
-                            raster_under.add(1/val)
-                raster_under = list(raster_under)
-                raster_under.sort()
-
-                raster_over = [1, 1/0.2, 1/0.4, 1/0.5, 1/0.8]
-
-                result_str = str(result)
-
-                ch_raster = None
-                found = False
-
-                if int(result_str.split(".")[0]) > 0:
-                    for pos in reversed(range(4)):
-                        if found:
-                            break
-                        for raster in raster_over:
-                            if round(result, pos) == raster:
-                                ch_raster = raster
-                                found = True
-                                break
-                else:
-                    for pos in reversed(range(11)):
-                        if found:
-                            break
-                        for raster in raster_under:
-                            if round(result, pos) == raster:
-                                ch_raster = raster
-                                found = True
-                                break
-
-            if ch_raster is None:
-                min_value = 100
-                min_raster = temp_raster = round(result, 5)
-                raster_all = raster_over + raster_under
-                for raster in raster_all:
-                    if abs(temp_raster - raster) < min_value:
-                        min_value = abs(temp_raster - raster)
-                        min_raster = raster
-                ch_raster = min_raster
-
-            for _, ch in enumerate(grp.channels):
-                ch.sampling_rate = ch_raster
-
             if (
                 self.version >= "4.20"
                 and grp.channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER
@@ -1297,9 +1439,20 @@ class MDF4(MDF_Common):
         return data, with_bounds
 
     def _load_data(
-        self, group, record_offset=0, record_count=None, optimize_read=False
+        self,
+        group,
+        record_offset=0,
+        record_count=None,
+        optimize_read=False,
+        byte_ranges=None,
     ):
-        """ get group's data block bytes """
+        """get group's data block bytes
+
+        *byte_ranges* is the list of (start, stop) byte ranges of the records
+        that are actually needed (see *_get_byte_ranges*); for uncompressed
+        blocks only these bytes are read and the other bytes of the records
+        are zeros
+        """
 
         offset = 0
         invalidation_offset = 0
@@ -1373,9 +1526,94 @@ class MDF4(MDF_Common):
             split_size = int(split_size)
             invalidation_split_size = int(invalidation_split_size)
 
-            blocks = iter(group.data_blocks)
+            if rm or group.data_location != v4c.LOCATION_ORIGINAL_FILE:
+                spans = None
+                mapped = False
+            else:
+                spans = self._get_mapped_spans(
+                    group.data_blocks, samples_size, record_offset, record_count
+                )
+                mapped = spans is not None
+                if not mapped and byte_ranges:
+                    spans = self._get_record_spans(
+                        group.data_blocks, samples_size, record_offset, record_count
+                    )
 
-            if group.data_blocks:
+            if byte_ranges:
+                ranges_size = sum(stop - start for start, stop in byte_ranges)
+
+            if mapped:
+                # uncompressed blocks: the fragments are views of the memory
+                # mapped file, so the records are not copied. The fragments
+                # have *split_size* bytes as for the read path; only the
+                # fragments that span two blocks are copied
+                view = self._file_view
+                pieces = []
+                pieces_size = 0
+                fragment_position = 0
+
+                for address, position, size in spans:
+                    if byte_ranges:
+                        # only the pages of the needed byte ranges are touched;
+                        # disable the read ahead of the whole records
+                        self._advise_map(address, size, "MADV_RANDOM")
+
+                    start = 0
+                    while start < size:
+                        if not pieces:
+                            fragment_position = position + start
+                        chunk = min(split_size - pieces_size, size - start)
+                        pieces.append(
+                            view[address + start : address + start + chunk]
+                        )
+                        pieces_size += chunk
+                        start += chunk
+
+                        if pieces_size == split_size:
+                            data_ = pieces[0] if len(pieces) == 1 else b"".join(pieces)
+                            _count = pieces_size // samples_size
+                            if byte_ranges:
+                                self._bytes_read += _count * ranges_size
+                            else:
+                                self._bytes_read += pieces_size
+                            yield data_, fragment_position // samples_size, _count, None
+                            has_yielded = True
+                            pieces = []
+                            pieces_size = 0
+
+                    if byte_ranges:
+                        self._advise_map(address, size, "MADV_NORMAL")
+
+                if pieces:
+                    data_ = pieces[0] if len(pieces) == 1 else b"".join(pieces)
+                    _count = pieces_size // samples_size
+                    if byte_ranges:
+                        self._bytes_read += _count * ranges_size
+                    else:
+                        self._bytes_read += pieces_size
+                    yield data_, fragment_position // samples_size, _count, None
+                    has_yielded = True
+
+                if not has_yielded:
+                    yield b"", 0, 0, None
+
+            elif spans is not None:
+                # uncompressed blocks of wide records: only the byte ranges of
+                # the requested channels are read
+                for address, position, size in spans:
+                    for start in range(0, size, split_size):
+                        _count = min(split_size, size - start) // samples_size
+                        data_ = read_byte_ranges(
+                            stream, address + start, samples_size, _count, byte_ranges
+                        )
+                        self._bytes_read += _count * ranges_size
+                        yield data_, (position + start) // samples_size, _count, None
+                        has_yielded = True
+
+                if not has_yielded:
+                    yield b"", 0, 0, None
+
+            elif group.data_blocks:
 
                 cur_size = 0
                 data = []
@@ -1383,26 +1621,31 @@ class MDF4(MDF_Common):
                 cur_invalidation_size = 0
                 invalidation_data = []
 
-                while True:
-                    try:
-                        info = next(blocks)
-                        address, size, block_size, block_type, param, block_limit = (
-                            info.address,
-                            info.raw_size,
-                            info.size,
-                            info.block_type,
-                            info.param,
-                            info.block_limit,
-                        )
+                # the compressed blocks are inflated on the decompression
+                # pool while the previous blocks are consumed
+                executor = self._get_decompression_pool(group.data_blocks)
+                blocks = iter_block_data(
+                    group.data_blocks,
+                    stream,
+                    record_offset,
+                    executor=executor,
+                    depth=2 * self._decompression_threads if executor else 0,
+                    record_end=(
+                        None if record_count is None else record_offset + record_count
+                    ),
+                )
 
-                        if rm and invalidation_size:
-                            invalidation_info = info.invalidation_block
-                        else:
-                            invalidation_info = None
-                    except StopIteration:
-                        break
+                for info, new_data in blocks:
+                    size = info.raw_size
+                    if new_data is not None:
+                        self._bytes_read += info.size
 
-                    if offset + size < record_offset + 1:
+                    if rm and invalidation_size:
+                        invalidation_info = info.invalidation_block
+                    else:
+                        invalidation_info = None
+
+                    if new_data is None:
                         offset += size
                         if rm and invalidation_size:
                             if invalidation_info.all_valid:
@@ -1412,24 +1655,6 @@ class MDF4(MDF_Common):
                                 invalidation_offset += invalidation_info.raw_size
                         continue
 
-                    seek(address)
-                    new_data = read(block_size)
-                    if block_type == v4c.DZ_BLOCK_DEFLATE:
-                        new_data = decompress(new_data, 0, size)
-                    elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
-                        new_data = decompress(new_data, 0, size)
-                        cols = param
-                        lines = size // cols
-
-                        nd = frombuffer(new_data[: lines * cols], dtype=uint8)
-                        nd = nd.reshape((cols, lines))
-                        new_data = nd.T.tobytes() + new_data[lines * cols :]
-                    elif block_type == v4c.DZ_BLOCK_LZ:
-                        new_data = lz_decompress(new_data)
-
-                    if block_limit is not None:
-                        new_data = new_data[:block_limit]
-
                     if len(data) > split_size - cur_size:
                         new_data = memoryview(new_data)
 
@@ -1441,36 +1666,14 @@ class MDF4(MDF_Common):
 
                         else:
                             seek(invalidation_info.address)
-                            new_invalidation_data = read(invalidation_info.size)
-                            if invalidation_info.block_type == v4c.DZ_BLOCK_DEFLATE:
-                                new_invalidation_data = decompress(
-                                    new_invalidation_data,
-                                    0,
-                                    invalidation_info.raw_size,
-                                )
-                            elif (
-                                invalidation_info.block_type == v4c.DZ_BLOCK_TRANSPOSED
-                            ):
-                                new_invalidation_data = decompress(
-                                    new_invalidation_data,
-                                    0,
-                                    invalidation_info.raw_size,
-                                )
-                                cols = invalidation_info.param
-                                lines = invalidation_info.raw_size // cols
-
-                                nd = frombuffer(
-                                    new_invalidation_data[: lines * cols], dtype=uint8
-                                )
-                                nd = nd.reshape((cols, lines))
-                                new_invalidation_data = (
-                                    nd.T.tobytes()
-                                    + new_invalidation_data[lines * cols :]
-                                )
-                            if invalidation_info.block_limit is not None:
-                                new_invalidation_data = new_invalidation_data[
-                                    : invalidation_info.block_limit
-                                ]
+                            self._bytes_read += invalidation_info.size
+                            new_invalidation_data = inflate_block(
+                                read(invalidation_info.size),
+                                invalidation_info.block_type,
+                                invalidation_info.param,
+                                invalidation_info.raw_size,
+                                invalidation_info.block_limit,
+                            )
 
                         inv_size = len(new_invalidation_data)
 
@@ -1586,6 +1789,7 @@ class MDF4(MDF_Common):
                         data = []
                         if rm and invalidation_size:
                             invalidation_data = []
+                        blocks.close()
                         break
 
                     if size:
@@ -1636,6 +1840,246 @@ class MDF4(MDF_Common):
                 else:
                     yield b"", offset, 0, None
 
+    def _get_mapped_spans(self, data_blocks, samples_size, record_offset, record_count):
+        """file spans of the requested records for the zero-copy reads of the
+        uncompressed data blocks; adjacent blocks are merged in a single span
+
+        Parameters
+        ----------
+        data_blocks : list
+            *DataBlockInfo* list of the group
+        samples_size : int
+            record size in bytes
+        record_offset : int
+            byte offset of the first requested record
+        record_count : int | None
+            requested bytes; *None* for all the records
+
+        Returns
+        -------
+        spans : list | None
+            list of (file address, byte offset, size) tuples, or *None* if the
+            file can not be mapped, a block is compressed or a block does not
+            contain whole records
+
+        """
+        if not data_blocks or not self._use_memory_map:
+            return None
+
+        spans = self._get_record_spans(
+            data_blocks, samples_size, record_offset, record_count
+        )
+        if spans is None:
+            return None
+
+        if self._file_view is None:
+            with self._resources_lock:
+                if self._file_view is None:
+                    try:
+                        self._file_map = mmap.mmap(
+                            self._file.fileno(), 0, access=mmap.ACCESS_READ
+                        )
+                    except Exception:
+                        # file like objects and empty files
+                        self._use_memory_map = False
+                        return None
+                    self._file_view = memoryview(self._file_map)
+
+        return spans
+
+    def _get_record_spans(self, data_blocks, samples_size, record_offset, record_count):
+        """file spans of the requested records of uncompressed data blocks;
+        adjacent blocks are merged in a single span
+
+        Parameters
+        ----------
+        data_blocks : list
+            *DataBlockInfo* list of the group
+        samples_size : int
+            record size in bytes
+        record_offset : int
+            byte offset of the first requested record
+        record_count : int | None
+            requested bytes; *None* for all the records
+
+        Returns
+        -------
+        spans : list | None
+            list of (file address, byte offset, size) tuples, or *None* if a
+            block is compressed or does not contain whole records
+
+        """
+        if not data_blocks:
+            return None
+
+        for info in data_blocks:
+            if (
+                info.block_type != v4c.DT_BLOCK
+                or info.block_limit is not None
+                or info.raw_size % samples_size
+            ):
+                return None
+
+        if record_count is None:
+            end = float("inf")
+        else:
+            end = record_offset + record_count
+
+        spans = []
+        position = 0
+        for info in data_blocks:
+            size = info.raw_size
+            start = max(position, record_offset)
+            stop = min(position + size, end)
+
+            if start < stop:
+                address = info.address + start - position
+                if spans:
+                    last_address, last_position, last_size = spans[-1]
+                    if (
+                        last_address + last_size == address
+                        and last_position + last_size == start
+                    ):
+                        spans[-1] = last_address, last_position, last_size + stop - start
+                        position += size
+                        continue
+                spans.append((address, start, stop - start))
+
+            position += size
+            if position >= end:
+                break
+
+        return spans
+
+    def _advise_map(self, address, size, advice):
+        """memory map access pattern hint for a file span (Linux only)"""
+        advice = getattr(mmap, advice, None)
+        if advice is None or not hasattr(self._file_map, "madvise"):
+            return
+        start = address - address % mmap.PAGESIZE
+        try:
+            self._file_map.madvise(advice, start, address + size - start)
+        except (OSError, ValueError):
+            pass
+
+    def _get_byte_ranges(self, group, channels):
+        """byte ranges of the records needed to read the given channels;
+        used by *_load_data* to skip the other bytes of wide records
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        channels : iterable
+            channel indexes
+
+        Returns
+        -------
+        byte_ranges : list | None
+            sorted list of (start, stop) byte ranges, or *None* if the whole
+            records must be read (short records, composed channels or ranges
+            that touch most of the record pages)
+
+        """
+        if not self._selective_read or group.uses_ld:
+            return None
+
+        channel_group = group.channel_group
+        samples_size = channel_group.samples_byte_nr
+        record_size = samples_size + channel_group.invalidation_bytes_nr
+        if record_size < SELECTIVE_READ_MIN_RECORD_SIZE:
+            return None
+
+        parents, dtypes = self._prepare_record(group)
+
+        ranges = []
+        if channel_group.invalidation_bytes_nr:
+            ranges.append((samples_size, record_size))
+
+        for ch_nr in channels:
+            if group.channel_dependencies[ch_nr]:
+                return None
+
+            channel = group.channels[ch_nr]
+            if channel.channel_type in v4c.VIRTUAL_TYPES:
+                continue
+
+            parent, _ = parents.get(ch_nr, (None, None))
+            if parent is not None:
+                field_dtype, start = dtypes.fields[parent][:2]
+                stop = start + field_dtype.itemsize
+            else:
+                start = channel.byte_offset
+                stop = start + (channel.bit_offset + channel.bit_count + 7) // 8
+                # bit fields are read through standard size words
+                start, stop = max(start - 7, 0), min(stop + 7, samples_size)
+            ranges.append((start, stop))
+
+        ranges = merge_byte_ranges(ranges)
+
+        # the storage is read in pages: the selective reads only pay off if
+        # the ranges touch a small part of the record pages
+        page_size = SELECTIVE_READ_MIN_RECORD_SIZE
+        pages = sum((stop - 1) // page_size - start // page_size + 1 for start, stop in ranges)
+        if pages > -(-record_size // page_size) * SELECTIVE_READ_RATIO:
+            return None
+
+        return ranges
+
+    def read_statistics(self):
+        """bytes read from the data blocks since the file was opened
+
+        Returns
+        -------
+        statistics : dict
+            *bytes_read*, *file_size* and their *ratio*; the compressed size
+            is counted for the compressed blocks and only the requested byte
+            ranges are counted for the selective reads of wide records
+
+        """
+        file_size = self.file_limit or 0
+        return {
+            "bytes_read": self._bytes_read,
+            "file_size": file_size,
+            "ratio": self._bytes_read / file_size if file_size else 0.0,
+        }
+
+    def _get_decompression_pool(self, data_blocks):
+        """thread pool for the read ahead of the compressed data blocks
+
+        Parameters
+        ----------
+        data_blocks : list
+            *DataBlockInfo* list of the group
+
+        Returns
+        -------
+        pool : ThreadPoolExecutor | None
+            *None* if the read ahead is disabled or there are less than two
+            compressed blocks
+
+        """
+        if not self._decompression_threads:
+            return None
+
+        compressed = 0
+        for info in data_blocks:
+            if info.block_type != v4c.DT_BLOCK:
+                compressed += 1
+                if compressed > 1:
+                    break
+        else:
+            return None
+
+        if self._decompression_pool is None:
+            with self._resources_lock:
+                if self._decompression_pool is None:
+                    self._decompression_pool = ThreadPoolExecutor(
+                        max_workers=self._decompression_threads,
+                        thread_name_prefix="mdfstudioAPI-inflate",
+                    )
+        return self._decompression_pool
+
     def _prepare_record(self, group):
         """compute record dtype and parents dict fro this group
 
@@ -1823,6 +2267,7 @@ class MDF4(MDF_Common):
             dtypes = dtype(types)
 
             group.parents, group.types = parents, dtypes
+            group.extraction_plans = {}
 
         return parents, dtypes
 
@@ -2431,6 +2876,7 @@ class MDF4(MDF_Common):
         single_bit_uint_as_bool=None,
         integer_interpolation=None,
         copy_on_get=None,
+        decompression_threads=None,
     ):
         """configure MDF parameters
 
@@ -2456,6 +2902,9 @@ class MDF4(MDF_Common):
                 * 1 - use linear interpolation
         copy_on_get : bool
             copy arrays in the get method
+        decompression_threads : int
+            number of threads that inflate the compressed data blocks ahead of
+            the consumer; 0 disables the read ahead
 
         """
 
@@ -2477,6 +2926,12 @@ class MDF4(MDF_Common):
         if copy_on_get is not None:
             self.copy_on_get = copy_on_get
 
+        if decompression_threads is not None:
+            self._decompression_threads = max(int(decompression_threads), 0)
+            if self._decompression_pool is not None:
+                self._decompression_pool.shutdown()
+                self._decompression_pool = None
+
     def append(
         self,
         signals,
@@ -3351,6 +3806,7 @@ class MDF4(MDF_Common):
         if prepare_record:
             gp.types = types
             gp.parents = parents
+            gp.extraction_plans = {}
 
         if signals and cycles_nr:
             samples = fromarrays(fields, dtype=types)
@@ -3549,6 +4005,7 @@ class MDF4(MDF_Common):
         gp.sorted = True
         gp.types = types
         gp.parents = parents
+        gp.extraction_plans = {}
 
         size = cycles_nr * samples.itemsize
 
@@ -4458,6 +4915,7 @@ class MDF4(MDF_Common):
         gp.sorted = True
         gp.types = types
         gp.parents = parents
+        gp.extraction_plans = {}
 
         if df.shape[0]:
             samples = fromarrays(fields, dtype=types)
@@ -5846,6 +6304,53 @@ class MDF4(MDF_Common):
         object is not used anymore to clean-up the temporary file"""
 
         self._parent = None
+
+        # the sampling rates estimated in this session are added to the cache
+        if (
+            self._metadata_cache_key is not None
+            and len(self._sampling_rates) > self._cached_sampling_rates
+        ):
+            save_metadata(
+                self._metadata_cache_dir,
+                self._metadata_cache_key,
+                dict(self._sampling_rates),
+                suffix=".rates",
+            )
+
+        # and so are the values of the sparse time indexes
+        if self._metadata_cache_key is not None:
+            time_indexes = {
+                index: group.time_index
+                for index, group in enumerate(self.groups)
+                if group.time_index
+            }
+            if (
+                sum(len(time_index) for time_index in time_indexes.values())
+                > self._cached_time_points
+            ):
+                save_metadata(
+                    self._metadata_cache_dir,
+                    self._metadata_cache_key,
+                    time_indexes,
+                    suffix=".times",
+                )
+        self._metadata_cache_key = None
+
+        if self._decompression_pool is not None:
+            self._decompression_pool.shutdown()
+            self._decompression_pool = None
+
+        if self._file_map is not None:
+            self._file_view.release()
+            try:
+                self._file_map.close()
+            except BufferError:
+                # signals returned without copy still reference the mapped
+                # file; the map is closed when they are released
+                pass
+            self._file_map = None
+            self._file_view = None
+
         if self._tempfile is not None:
             self._tempfile.close()
         if self._file is not None:
@@ -6842,87 +7347,9 @@ class MDF4(MDF_Common):
                 fragment = data[0]
                 data_bytes, record_start, record_count, invalidation_bytes = fragment
 
-                try:
-                    parent, bit_offset = parents[ch_nr]
-                except KeyError:
-                    parent, bit_offset = None, None
-
-                if parent is not None:
-                    if (
-                        len(grp.channels) == 1
-                        and channel.dtype_fmt.itemsize == record_size
-                    ):
-                        vals = frombuffer(data_bytes, dtype=channel.dtype_fmt)
-                    else:
-                        record = grp.record
-                        if record is None:
-                            record = fromstring(data_bytes, dtype=dtypes)
-
-                        vals = record[parent]
-
-                    dtype_ = vals.dtype
-                    shape_ = vals.shape
-                    size = dtype_.itemsize
-                    for dim in shape_[1:]:
-                        size *= dim
-
-                    kind_ = dtype_.kind
-
-                    vals_dtype = vals.dtype.kind
-                    if kind_ == "b":
-                        pass
-                    elif len(shape_) > 1 and data_type not in (
-                        v4c.DATA_TYPE_BYTEARRAY,
-                        v4c.DATA_TYPE_MIME_SAMPLE,
-                        v4c.DATA_TYPE_MIME_STREAM,
-                    ):
-                        vals = self._get_not_byte_aligned_data(data_bytes, grp, ch_nr)
-                    elif vals_dtype not in "ui" and (
-                        bit_offset or not bit_count == size * 8
-                    ):
-                        vals = self._get_not_byte_aligned_data(data_bytes, grp, ch_nr)
-                    else:
-                        dtype_ = vals.dtype
-                        kind_ = dtype_.kind
-
-                        if data_type in v4c.INT_TYPES:
-
-                            if channel_dtype.byteorder == "|" and data_type in (
-                                v4c.DATA_TYPE_SIGNED_MOTOROLA,
-                                v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
-                            ):
-                                view = f">u{vals.itemsize}"
-                            else:
-                                view = f"{channel_dtype.byteorder}u{vals.itemsize}"
-
-                            if dtype(view) != vals.dtype:
-                                vals = vals.view(view)
-
-                            if bit_offset:
-                                vals = vals >> bit_offset
-
-                            if bit_count != size * 8:
-                                if data_type in v4c.SIGNED_INT:
-                                    vals = as_non_byte_sized_signed_int(vals, bit_count)
-                                else:
-                                    mask = (1 << bit_count) - 1
-                                    vals = vals & mask
-                            elif data_type in v4c.SIGNED_INT:
-                                view = f"{channel_dtype.byteorder}i{vals.itemsize}"
-                                if dtype(view) != vals.dtype:
-                                    vals = vals.view(view)
-
-                        else:
-                            if bit_count != size * 8:
-                                vals = self._get_not_byte_aligned_data(
-                                    data_bytes, grp, ch_nr
-                                )
-                            else:
-                                if kind_ in "ui":
-                                    vals = vals.view(channel_dtype)
-
-                else:
-                    vals = self._get_not_byte_aligned_data(data_bytes, grp, ch_nr)
+                vals = self._extract_channel_values(
+                    grp, ch_nr, channel, data_bytes, parents, dtypes
+                )
 
                 if self._single_bit_uint_as_bool and bit_count == 1:
                     vals = array(vals, dtype=bool)
@@ -6958,93 +7385,9 @@ class MDF4(MDF_Common):
                     if count == 1:
                         record_start = offset
                         record_count = _count
-                    try:
-                        parent, bit_offset = parents[ch_nr]
-                    except KeyError:
-                        parent, bit_offset = None, None
-
-                    if parent is not None:
-                        if (
-                            len(grp.channels) == 1
-                            and channel.dtype_fmt.itemsize == record_size
-                        ):
-                            vals = frombuffer(data_bytes, dtype=channel.dtype_fmt)
-                        else:
-                            record = grp.record
-                            if record is None:
-                                record = fromstring(data_bytes, dtype=dtypes)
-
-                            vals = record[parent]
-
-                        dtype_ = vals.dtype
-                        shape_ = vals.shape
-                        size = dtype_.itemsize
-                        for dim in shape_[1:]:
-                            size *= dim
-
-                        kind_ = dtype_.kind
-
-                        vals_dtype = vals.dtype.kind
-                        if kind_ == "b":
-                            pass
-                        elif len(shape_) > 1 and data_type not in (
-                            v4c.DATA_TYPE_BYTEARRAY,
-                            v4c.DATA_TYPE_MIME_SAMPLE,
-                            v4c.DATA_TYPE_MIME_STREAM,
-                        ):
-                            vals = self._get_not_byte_aligned_data(
-                                data_bytes, grp, ch_nr
-                            )
-                        elif vals_dtype not in "ui" and (
-                            bit_offset or not bit_count == size * 8
-                        ):
-                            vals = self._get_not_byte_aligned_data(
-                                data_bytes, grp, ch_nr
-                            )
-                        else:
-                            dtype_ = vals.dtype
-                            kind_ = dtype_.kind
-
-                            if data_type in v4c.INT_TYPES:
-
-                                if channel_dtype.byteorder == "|" and data_type in (
-                                    v4c.DATA_TYPE_SIGNED_MOTOROLA,
-                                    v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
-                                ):
-                                    view = f">u{vals.itemsize}"
-                                else:
-                                    view = f"{channel_dtype.byteorder}u{vals.itemsize}"
-
-                                if dtype(view) != vals.dtype:
-                                    vals = vals.view(view)
-
-                                if bit_offset:
-                                    vals = vals >> bit_offset
-
-                                if bit_count != size * 8:
-                                    if data_type in v4c.SIGNED_INT:
-                                        vals = as_non_byte_sized_signed_int(
-                                            vals, bit_count
-                                        )
-                                    else:
-                                        mask = (1 << bit_count) - 1
-                                        vals = vals & mask
-                                elif data_type in v4c.SIGNED_INT:
-                                    view = f"{channel_dtype.byteorder}i{vals.itemsize}"
-                                    if dtype(view) != vals.dtype:
-                                        vals = vals.view(view)
-
-                            else:
-                                if bit_count != size * 8:
-                                    vals = self._get_not_byte_aligned_data(
-                                        data_bytes, grp, ch_nr
-                                    )
-                                else:
-                                    if kind_ in "ui":
-                                        vals = vals.view(channel_dtype)
-
-                    else:
-                        vals = self._get_not_byte_aligned_data(data_bytes, grp, ch_nr)
+                    vals = self._extract_channel_values(
+                        grp, ch_nr, channel, data_bytes, parents, dtypes
+                    )
 
                     if bit_count == 1 and self._single_bit_uint_as_bool:
                         vals = array(vals, dtype=bool)
@@ -7282,6 +7625,285 @@ class MDF4(MDF_Common):
 
         return vals, timestamps, invalidation_bits, encoding
 
+    def _get_extraction_plan(self, group, ch_nr, channel, parents, dtypes):
+        """compute how the raw values of a channel are extracted from the
+        group records. The plan only depends on the group record layout, so
+        it is computed once and cached in *group.extraction_plans*
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        ch_nr : int
+            channel index
+        channel : Channel
+            channel object
+        parents : dict
+            mapping of channels to records fields
+        dtypes : numpy.dtype
+            records fields dtype
+
+        Returns
+        -------
+        plan : tuple
+            (source, field, view, bit_offset, mask, signed_bit_count,
+            signed_view); the source is one of
+
+            * PLAN_NOT_BYTE_ALIGNED : use *_get_not_byte_aligned_data*
+            * PLAN_BUFFER : the record is the channel value; *field* is the
+              channel dtype
+            * PLAN_FIELD : *field* is the record field of the channel
+
+        """
+        plan = group.extraction_plans.get(ch_nr, None)
+        if plan is not None:
+            return plan
+
+        not_byte_aligned = PLAN_NOT_BYTE_ALIGNED, None, None, 0, None, 0, None
+
+        try:
+            parent, bit_offset = parents[ch_nr]
+        except KeyError:
+            parent, bit_offset = None, None
+
+        if parent is None:
+            group.extraction_plans[ch_nr] = not_byte_aligned
+            return not_byte_aligned
+
+        data_type = channel.data_type
+        bit_count = channel.bit_count
+        record_size = group.channel_group.samples_byte_nr
+
+        if channel.dtype_fmt.subdtype:
+            channel_dtype = channel.dtype_fmt.subdtype[0]
+        else:
+            channel_dtype = channel.dtype_fmt
+
+        if len(group.channels) == 1 and channel.dtype_fmt.itemsize == record_size:
+            source, field = PLAN_BUFFER, channel.dtype_fmt
+            dtype_ = dtype(channel.dtype_fmt)
+        else:
+            source, field = PLAN_FIELD, parent
+            dtype_ = dtypes.fields[parent][0]
+
+        # the record field values have the shape of the sub-array dtype
+        if dtype_.subdtype:
+            dtype_, shape_ = dtype_.subdtype
+            shape_ = (None,) + shape_
+        else:
+            shape_ = (None,)
+
+        size = dtype_.itemsize
+        for dim in shape_[1:]:
+            size *= dim
+
+        kind_ = dtype_.kind
+
+        view, mask, signed_bit_count, signed_view = None, None, 0, None
+        shift = 0
+
+        if kind_ == "b":
+            pass
+        elif len(shape_) > 1 and data_type not in (
+            v4c.DATA_TYPE_BYTEARRAY,
+            v4c.DATA_TYPE_MIME_SAMPLE,
+            v4c.DATA_TYPE_MIME_STREAM,
+        ):
+            plan = not_byte_aligned
+        elif kind_ not in "ui" and (bit_offset or not bit_count == size * 8):
+            plan = not_byte_aligned
+        elif data_type in v4c.INT_TYPES:
+
+            if channel_dtype.byteorder == "|" and data_type in (
+                v4c.DATA_TYPE_SIGNED_MOTOROLA,
+                v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
+            ):
+                view = dtype(f">u{dtype_.itemsize}")
+            else:
+                view = dtype(f"{channel_dtype.byteorder}u{dtype_.itemsize}")
+
+            if view == dtype_:
+                view = None
+
+            shift = bit_offset
+
+            if bit_count != size * 8:
+                if data_type in v4c.SIGNED_INT:
+                    signed_bit_count = bit_count
+                else:
+                    mask = (1 << bit_count) - 1
+            elif data_type in v4c.SIGNED_INT:
+                signed_view = dtype(f"{channel_dtype.byteorder}i{dtype_.itemsize}")
+                if signed_view == (view or dtype_):
+                    signed_view = None
+
+        elif bit_count != size * 8:
+            plan = not_byte_aligned
+        elif kind_ in "ui":
+            view = channel_dtype
+
+        if plan is None:
+            plan = source, field, view, shift, mask, signed_bit_count, signed_view
+
+        group.extraction_plans[ch_nr] = plan
+        return plan
+
+    def _extract_channel_values(self, group, ch_nr, channel, data_bytes, parents, dtypes):
+        """extract the raw channel values from the records of a data fragment
+        using the cached extraction plan
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        ch_nr : int
+            channel index
+        channel : Channel
+            channel object
+        data_bytes : bytes
+            fragment records
+        parents : dict
+            mapping of channels to records fields
+        dtypes : numpy.dtype
+            records fields dtype
+
+        Returns
+        -------
+        vals : numpy.array
+            raw channel values
+
+        """
+        (
+            source,
+            field,
+            view,
+            bit_offset,
+            mask,
+            signed_bit_count,
+            signed_view,
+        ) = self._get_extraction_plan(group, ch_nr, channel, parents, dtypes)
+
+        if source == PLAN_NOT_BYTE_ALIGNED:
+            bit_fields = group.bit_fields
+            if bit_fields is not None and bit_fields[0] is data_bytes:
+                vals = bit_fields[1].pop(ch_nr, None)
+                if vals is not None:
+                    return vals
+            return self._get_not_byte_aligned_data(data_bytes, group, ch_nr)
+        elif source == PLAN_BUFFER:
+            vals = frombuffer(data_bytes, dtype=field)
+        else:
+            record = group.record
+            if record is None:
+                # plain structured view of the records; the field access is
+                # much cheaper than on a numpy.recarray
+                record = frombuffer(
+                    data_bytes, dtype=dtypes, count=len(data_bytes) // dtypes.itemsize
+                )
+            vals = record[field]
+
+        if view is not None:
+            vals = vals.view(view)
+        if bit_offset:
+            vals = vals >> bit_offset
+        if signed_bit_count:
+            vals = as_non_byte_sized_signed_int(vals, signed_bit_count)
+        elif mask is not None:
+            vals = vals & mask
+        if signed_view is not None:
+            vals = vals.view(signed_view)
+
+        return vals
+
+    def _read_bit_fields(self, group, channels, data_bytes, parents, dtypes):
+        """extract the non byte aligned scalar channels of a fragment in a
+        single pass over the records (see *extract_bit_fields*). The values
+        are picked up by *_extract_channel_values* while the fragment is
+        processed
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        channels : list
+            selected channels indexes
+        data_bytes : bytes
+            fragment records
+        parents : dict
+            mapping of channels to records fields
+        dtypes : numpy.dtype
+            records fields dtype
+
+        Returns
+        -------
+        bit_fields : tuple | None
+            (data_bytes, {channel index: values}) or None if less than two
+            channels are bit fields
+
+        """
+        big_endian_types = (
+            v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
+            v4c.DATA_TYPE_REAL_MOTOROLA,
+            v4c.DATA_TYPE_SIGNED_MOTOROLA,
+        )
+
+        specs = []
+        indexes = []
+        for ch_nr in channels:
+            if group.channel_dependencies[ch_nr]:
+                continue
+
+            channel = group.channels[ch_nr]
+            data_type = channel.data_type
+            if channel.channel_type not in (
+                v4c.CHANNEL_TYPE_VALUE,
+                v4c.CHANNEL_TYPE_MASTER,
+                v4c.CHANNEL_TYPE_SYNC,
+            ) or (data_type not in v4c.INT_TYPES and data_type not in v4c.FLOATS):
+                continue
+
+            bit_offset = channel.bit_offset
+            bit_count = channel.bit_count
+            if not bit_field_size(bit_offset, bit_count)[1]:
+                continue
+
+            plan = self._get_extraction_plan(group, ch_nr, channel, parents, dtypes)
+            if plan[0] != PLAN_NOT_BYTE_ALIGNED:
+                continue
+
+            specs.append(
+                (
+                    channel.byte_offset,
+                    bit_offset,
+                    bit_count,
+                    data_type in v4c.SIGNED_INT,
+                    data_type in big_endian_types,
+                )
+            )
+            indexes.append(ch_nr)
+
+        if len(specs) < 2:
+            return None
+
+        if group.uses_ld:
+            record_size = group.channel_group.samples_byte_nr
+        else:
+            record_size = (
+                group.channel_group.samples_byte_nr
+                + group.channel_group.invalidation_bytes_nr
+            )
+
+        values = extract_bit_fields(data_bytes, record_size, specs)
+
+        bit_fields = {}
+        for ch_nr, vals in zip(indexes, values):
+            channel = group.channels[ch_nr]
+            if channel.data_type in v4c.FLOATS:
+                vals = vals.view(get_fmt_v4(channel.data_type, channel.bit_count))
+            bit_fields[ch_nr] = vals
+
+        return data_bytes, bit_fields
+
     def _get_not_byte_aligned_data(self, data, group, ch_nr):
         big_endian_types = (
             v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
@@ -7325,6 +7947,27 @@ class MDF4(MDF_Common):
         else:
             byte_size //= 8
 
+        data_type = channel.data_type
+        big_endian = data_type in big_endian_types
+
+        if bit_field_size(bit_offset, bit_count)[1]:
+            vals = extract_bit_fields(
+                data,
+                record_size,
+                [
+                    (
+                        byte_offset,
+                        bit_offset,
+                        bit_count,
+                        data_type in v4c.SIGNED_INT,
+                        big_endian,
+                    )
+                ],
+            )[0]
+            if data_type in v4c.FLOATS:
+                vals = vals.view(get_fmt_v4(data_type, bit_count))
+            return vals
+
         types = [
             ("", f"a{byte_offset}"),
             ("vals", f"({byte_size},)u1"),
@@ -7342,8 +7985,6 @@ class MDF4(MDF_Common):
 
         std_size = byte_size + extra_bytes
 
-        big_endian = channel.data_type in big_endian_types
-
         # prepend or append extra bytes columns
         # to get a standard size number of bytes
 
@@ -7392,8 +8033,6 @@ class MDF4(MDF_Common):
                 vals = vals >> bit_offset
                 vals &= (1 << bit_count) - 1
 
-        data_type = channel.data_type
-
         if data_type in v4c.SIGNED_INT:
             return as_non_byte_sized_signed_int(vals, bit_count)
         elif data_type in v4c.FLOATS:
@@ -7593,9 +8232,17 @@ class MDF4(MDF_Common):
         for idx, group_index in enumerate(groups):
             grp = self.groups[group_index]
             grp.read_split_count = count
+
+            channels = list(groups[group_index])
+            if group_index == index and index in self.masters_db:
+                channels.append(self.masters_db[index])
+
             data_streams.append(
                 self._load_data(
-                    grp, record_offset=record_offset, record_count=record_count
+                    grp,
+                    record_offset=record_offset,
+                    record_count=record_count,
+                    byte_ranges=self._get_byte_ranges(grp, channels),
                 )
             )
             if group_index == index:
@@ -7630,6 +8277,10 @@ class MDF4(MDF_Common):
                         grp.record = None
                         continue
 
+                    grp.bit_fields = self._read_bit_fields(
+                        grp, channels, fragment[0], parents, dtypes
+                    )
+
                 if idx == 0:
                     for channel_index in channels:
                         signals.append(
@@ -7718,6 +8369,7 @@ class MDF4(MDF_Common):
                                 signals[i] = (samples, sig[1])
 
                 grp.record = None
+                grp.bit_fields = None
 
             self._set_temporary_master(None)
             idx += 1
@@ -7792,8 +8444,11 @@ class MDF4(MDF_Common):
             data_bytes, offset, _count, invalidation_bytes = fragment
             cycles_nr = len(data_bytes) // record_size if record_size else 0
         else:
-            offset = 0
+            offset = record_offset
             _count = record_count
+            cycles_nr = max(
+                min(cycles_nr, channel_group.cycles_nr - record_offset), 0
+            )
 
         if time_ch_nr is None:
             if record_size:
@@ -7818,11 +8473,6 @@ class MDF4(MDF_Common):
                 t *= time_a
                 t += time_b
 
-                if record_count is None:
-                    t = t[record_offset:]
-                else:
-                    t = t[record_offset : record_offset + record_count]
-
             else:
                 # check if the channel group contains just the master channel
                 # and that there are no padding bytes
@@ -7876,7 +8526,11 @@ class MDF4(MDF_Common):
                             if group.record is None:
                                 dtypes = group.types
                                 if dtypes.itemsize:
-                                    record = fromstring(data_bytes, dtype=dtypes)
+                                    record = frombuffer(
+                                        data_bytes,
+                                        dtype=dtypes,
+                                        count=len(data_bytes) // dtypes.itemsize,
+                                    )
                                 else:
                                     record = None
                             else:
@@ -7914,7 +8568,11 @@ class MDF4(MDF_Common):
                                 if group.record is None:
                                     dtypes = group.types
                                     if dtypes.itemsize:
-                                        record = fromstring(data_bytes, dtype=dtypes)
+                                        record = frombuffer(
+                                            data_bytes,
+                                            dtype=dtypes,
+                                            count=len(data_bytes) // dtypes.itemsize,
+                                        )
                                     else:
                                         record = None
                                 else:
@@ -9482,143 +10140,104 @@ class MDF4(MDF_Common):
 
     def _finalize(self):
         """
-        Attempt finalization of the file.
+        Attempt finalization of the file. The fixed blocks are written to the
+        file stream; for the *FileOverlay* of the original file they are only
+        kept in memory.
         :return:    None
         """
 
         flags = self.identification.unfinalized_standard_flags
 
         stream = self._file
-        blocks, addresses = all_blocks_addresses(stream)
 
         stream.seek(0, 2)
         limit = stream.tell()
         mapped = self._mapped
 
-        if flags & v4c.FLAG_UNFIN_UPDATE_LAST_DL:
-            for dg_addr in blocks[b"##DG"]:
-                group = DataGroup(address=dg_addr, stream=stream, mapped=mapped)
-                data_addr = group.data_block_addr
-                if not data_addr:
-                    continue
+        # the data groups are found by following the links from the header
+        # block, so only the metadata is read and not the whole file
+        data_addresses = []
+        header = HeaderBlock(address=0x40, stream=stream, mapped=mapped)
+        dg_addr = header.first_dg_addr
+        while dg_addr:
+            group = DataGroup(address=dg_addr, stream=stream, mapped=mapped)
+            if group.data_block_addr:
+                data_addresses.append(group.data_block_addr)
+            dg_addr = group.next_dg_addr
 
-                stream.seek(data_addr)
-                blk_id = stream.read(4)
-                if blk_id == b"##DT":
-                    continue
-                elif blk_id == b"##DL":
-                    while True:
-                        dl = DataList(address=data_addr, stream=stream, mapped=mapped)
-                        if not dl.next_dl_addr:
-                            break
+        def last_data_list(data_addr):
+            stream.seek(data_addr)
+            blk_id = stream.read(4)
+            if blk_id == b"##HL":
+                hl = HeaderList(address=data_addr, stream=stream, mapped=mapped)
+                data_addr = hl.first_dl_addr
+            elif blk_id != b"##DL":
+                return None
+
+            while True:
+                dl = DataList(address=data_addr, stream=stream, mapped=mapped)
+                if not dl.next_dl_addr:
+                    return dl
+                data_addr = dl.next_dl_addr
 
-                    count = dl.links_nr - 1
-                    valid_count = 0
-                    for i in range(count):
-                        dt_addr = dl[f"data_block_addr{i}"]
-                        if dt_addr:
-                            valid_count += 1
-                        else:
-                            break
+        if flags & v4c.FLAG_UNFIN_UPDATE_LAST_DL:
+            for data_addr in data_addresses:
+                dl = last_data_list(data_addr)
+                if dl is None:
+                    continue
 
-                    kwargs = {
-                        f"data_block_addr{i}": dl[f"data_block_addr{i}"]
-                        for i in range(valid_count)
-                    }
-                    kwargs["links_nr"] = valid_count + 1
-                    kwargs["flags"] = dl.flags
-                    if self.flags & v4c.FLAG_DL_EQUAL_LENGHT:
-                        kwargs["data_block_len"] = dl.data_block_len
+                valid_count = 0
+                for i in range(dl.links_nr - 1):
+                    if dl[f"data_block_addr{i}"]:
+                        valid_count += 1
                     else:
-                        for i in enumerate(valid_count):
-                            kwargs[f"offset_{i}"] = dl[f"offset_{i}"]
-
-                    stream.seek(data_addr)
-                    stream.write(bytes(DataList(**kwargs)))
-                elif blk_id == b"##HL":
-
-                    hl = HeaderList(address=data_addr, stream=stream, mapped=mapped)
-
-                    data_addr = hl.first_dl_addr
-                    while True:
-                        dl = DataList(address=data_addr, stream=stream, mapped=mapped)
-                        if not dl.next_dl_addr:
-                            break
-
-                    count = dl.links_nr - 1
-                    valid_count = 0
-                    for i in range(count):
-                        dt_addr = dl[f"data_block_addr{i}"]
-                        if dt_addr:
-                            valid_count += 1
-                        else:
-                            break
+                        break
 
-                    kwargs = {
-                        f"data_block_addr{i}": dl[f"data_block_addr{i}"]
-                        for i in range(valid_count)
-                    }
-                    kwargs["links_nr"] = valid_count + 1
-                    kwargs["flags"] = dl.flags
-                    if self.flags & v4c.FLAG_DL_EQUAL_LENGHT:
-                        kwargs["data_block_len"] = dl.data_block_len
-                    else:
-                        for i in enumerate(valid_count):
-                            kwargs[f"offset_{i}"] = dl[f"offset_{i}"]
+                links = [dl.next_dl_addr]
+                links.extend(dl[f"data_block_addr{i}"] for i in range(valid_count))
+                if dl.flags & v4c.FLAG_DL_EQUAL_LENGHT:
+                    fields = pack(
+                        "<B3sIQ", dl.flags, dl.reserved1, valid_count, dl.data_block_len
+                    )
+                else:
+                    fields = pack(
+                        f"<B3sI{valid_count}Q",
+                        dl.flags,
+                        dl.reserved1,
+                        valid_count,
+                        *(dl[f"offset_{i}"] for i in range(valid_count)),
+                    )
 
-                    stream.seek(data_addr)
-                    stream.write(bytes(DataList(**kwargs)))
+                block_len = 24 + 8 * len(links) + len(fields)
+                stream.seek(dl.address)
+                stream.write(
+                    pack(f"<4sI2Q{len(links)}Q", b"##DL", 0, block_len, len(links), *links)
+                    + fields
+                )
             self.identification[
                 "unfinalized_standard_flags"
             ] -= v4c.FLAG_UNFIN_UPDATE_LAST_DL
 
         if flags & v4c.FLAG_UNFIN_UPDATE_LAST_DT_LENGTH:
             try:
-                for dg_addr in blocks[b"##DG"]:
-                    group = DataGroup(address=dg_addr, stream=stream, mapped=mapped)
-                    data_addr = group.data_block_addr
-                    if not data_addr:
-                        continue
-
+                for data_addr in data_addresses:
                     stream.seek(data_addr)
                     blk_id = stream.read(4)
-                    if blk_id == b"##DT":
-                        blk = DataBlock(address=data_addr, stream=stream, mapped=mapped)
-                    elif blk_id == b"##DL":
-                        while True:
-                            dl = DataList(
-                                address=data_addr, stream=stream, mapped=mapped
-                            )
-                            if not dl.next_dl_addr:
-                                break
-
-                        data_addr = dl[f"data_block_addr{dl.links_nr - 2}"]
-                        blk = DataBlock(address=data_addr, stream=stream, mapped=mapped)
-
-                    elif blk_id == b"##HL":
-
-                        hl = HeaderList(address=data_addr, stream=stream, mapped=mapped)
-
-                        data_addr = hl.first_dl_addr
-                        while True:
-                            dl = DataList(
-                                address=data_addr, stream=stream, mapped=mapped
-                            )
-                            if not dl.next_dl_addr:
-                                break
-
+                    if blk_id in (b"##DL", b"##HL"):
+                        dl = last_data_list(data_addr)
+                        if dl.links_nr < 2:
+                            continue
                         data_addr = dl[f"data_block_addr{dl.links_nr - 2}"]
-                        blk = DataBlock(address=data_addr, stream=stream, mapped=mapped)
+                        stream.seek(data_addr)
+                        blk_id = stream.read(4)
 
-                    next_block = bisect.bisect_right(addresses, data_addr)
-                    if next_block == len(addresses):
-                        block_len = limit - data_addr
-                    else:
-                        block_len = addresses[next_block] - data_addr
+                    if blk_id != b"##DT":
+                        continue
 
-                    blk.block_len = block_len
-                    stream.seek(data_addr)
-                    stream.write(bytes(blk))
+                    # the last DT block ends where the next block starts
+                    block_len = next_block_address(stream, data_addr, limit) - data_addr
+                    stream.seek(data_addr + 8)
+                    stream.write(pack("<Q", block_len))
             except:
                 print(format_exc())
                 raise
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the finalization of unfinalized MDF4 files
+without a copy of the original file
+
+The blocks fixed by *MDF4._finalize* are written to a *FileOverlay*: the
+patches are kept in memory and are applied on top of the bytes read from the
+read only original file.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from API.blocks.utils import BLOCKS_PATTERN
+
+__all__ = ["FileOverlay", "next_block_address"]
+
+SCAN_CHUNK_SIZE = 2 ** 20
+
+
+class FileOverlay:
+    """read only file handle with in memory patches. *write* stores the
+    bytes as a patch at the current position instead of writing to the file;
+    *read* returns the file bytes with the patches applied
+
+    Parameters
+    ----------
+    stream : file handle
+        original file opened in binary read mode
+
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._starts = []
+        self._patches = []
+        self.name = getattr(stream, "name", "")
+
+    def read(self, size=-1):
+        position = self._stream.tell()
+        data = self._stream.read(size)
+
+        if self._starts and data:
+            end = position + len(data)
+            index = max(bisect_right(self._starts, position) - 1, 0)
+            patched = None
+
+            for start, patch in zip(self._starts[index:], self._patches[index:]):
+                if start >= end:
+                    break
+                stop = start + len(patch)
+                if stop <= position:
+                    continue
+
+                if patched is None:
+                    patched = bytearray(data)
+                first = max(start, position)
+                last = min(stop, end)
+                patched[first - position : last - position] = patch[
+                    first - start : last - start
+                ]
+
+            if patched is not None:
+                data = bytes(patched)
+
+        return data
+
+    def write(self, data):
+        start = self._stream.tell()
+        stop = start + len(data)
+
+        # overlapping patches are merged
+        first = max(bisect_left(self._starts, start) - 1, 0)
+        last = first
+        while last < len(self._starts) and self._starts[last] < stop:
+            last += 1
+        while first < last and self._starts[first] + len(self._patches[first]) < start:
+            first += 1
+
+        if first < last:
+            merged_start = min(start, self._starts[first])
+            merged_stop = max(
+                stop, self._starts[last - 1] + len(self._patches[last - 1])
+            )
+            self._stream.seek(merged_start)
+            merged = bytearray(self.read(merged_stop - merged_start))
+            merged.extend(bytes(merged_stop - merged_start - len(merged)))
+            merged[start - merged_start : stop - merged_start] = data
+            del self._starts[first:last]
+            del self._patches[first:last]
+            start, data = merged_start, bytes(merged)
+
+        index = bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self._patches.insert(index, bytes(data))
+
+        self._stream.seek(stop)
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        return self._stream.seek(offset, whence)
+
+    def tell(self):
+        return self._stream.tell()
+
+    def close(self):
+        self._starts.clear()
+        self._patches.clear()
+        self._stream.close()
+
+    def __iter__(self):
+        return iter(self._stream)
+
+
+def next_block_address(stream, address, limit):
+    """address of the first block id found after the block at *address*; this
+    is the same search as *all_blocks_addresses* followed by a bisect, but
+    only the bytes between the block and the next block are read
+
+    Parameters
+    ----------
+    stream : file handle
+        file handle
+    address : int
+        block address
+    limit : int
+        file size
+
+    Returns
+    -------
+    next_address : int
+        address of the next block or *limit* if there is no other block
+
+    """
+    # the block id is 4 bytes long; the chunks overlap by 3 bytes so that ids
+    # split between chunks are found
+    position = address + 4
+    while position < limit:
+        stream.seek(position)
+        chunk = stream.read(SCAN_CHUNK_SIZE + 3)
+        if not chunk:
+            break
+        match = BLOCKS_PATTERN.search(chunk)
+        if match:
+            return position + match.start()
+        position += SCAN_CHUNK_SIZE
+
+    return limit
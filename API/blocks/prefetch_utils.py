@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the read-ahead of MDF4 data blocks
+
+The compressed blocks of a group are read in file order by the calling thread
+and are inflated (and un-transposed) on a thread pool while the previous
+blocks are consumed; zlib and lz4 release the GIL, so the decompression runs
+on all cores. At most *depth* blocks are in flight, which caps the extra RAM
+to *depth* decompressed blocks.
+"""
+
+from collections import deque
+from zlib import decompress
+
+from lz4.frame import decompress as lz_decompress
+from numpy import frombuffer, uint8
+
+from API.blocks import v4_constants as v4c
+
+__all__ = ["inflate_block", "iter_block_data"]
+
+
+def inflate_block(data, block_type, param, raw_size, block_limit=None):
+    """decompress the raw bytes of a data block
+
+    Parameters
+    ----------
+    data : bytes
+        block bytes as stored in the file
+    block_type : int
+        *DataBlockInfo.block_type*
+    param : int
+        zip parameter (columns of the transposed blocks)
+    raw_size : int
+        decompressed size
+    block_limit : int | None
+        truncate the decompressed bytes to this size
+
+    Returns
+    -------
+    data : bytes
+        decompressed bytes
+
+    """
+    if block_type == v4c.DZ_BLOCK_DEFLATE:
+        data = decompress(data, 0, raw_size)
+    elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
+        data = decompress(data, 0, raw_size)
+        cols = param
+        lines = raw_size // cols
+
+        nd = frombuffer(data[: lines * cols], dtype=uint8)
+        nd = nd.reshape((cols, lines))
+        data = nd.T.tobytes() + data[lines * cols :]
+    elif block_type == v4c.DZ_BLOCK_LZ:
+        data = lz_decompress(data)
+
+    if block_limit is not None:
+        data = data[:block_limit]
+
+    return data
+
+
+def iter_block_data(
+    blocks, stream, record_offset=0, executor=None, depth=0, record_end=None
+):
+    """yield the decompressed bytes of the data blocks in file order
+
+    Parameters
+    ----------
+    blocks : list
+        *DataBlockInfo* list of the group
+    stream : file handle
+        file that contains the blocks
+    record_offset : int
+        byte offset of the first needed record; the blocks that end before
+        this offset are not read
+    executor : concurrent.futures.Executor | None
+        decompression thread pool; *None* decompresses in the calling thread
+    depth : int
+        maximum number of blocks read ahead
+    record_end : int | None
+        byte offset after the last needed record; the blocks that start after
+        this offset are not read. Default *None* reads up to the last block
+
+    Yields
+    ------
+    info, data : DataBlockInfo, bytes | None
+        block info and decompressed bytes; *data* is *None* for the skipped
+        blocks
+
+    """
+    read = stream.read
+    seek = stream.seek
+
+    if executor is None or depth < 1:
+        position = 0
+        for info in blocks:
+            if record_end is not None and position >= record_end:
+                return
+            size = info.raw_size
+            if position + size < record_offset + 1:
+                position += size
+                yield info, None
+                continue
+            position += size
+
+            seek(info.address)
+            data = read(info.size)
+            yield info, inflate_block(
+                data, info.block_type, info.param, size, info.block_limit
+            )
+        return
+
+    pending = deque()
+    blocks = iter(blocks)
+    position = 0
+
+    try:
+        while True:
+            # keep the read ahead queue full; the file is only read from the
+            # calling thread so the seek/read pairs do not interleave
+            while len(pending) < depth:
+                info = next(blocks, None)
+                if info is None:
+                    break
+                if record_end is not None and position >= record_end:
+                    break
+
+                size = info.raw_size
+                if position + size < record_offset + 1:
+                    position += size
+                    pending.append((info, None))
+                    continue
+                position += size
+
+                seek(info.address)
+                data = read(info.size)
+                if info.block_type == v4c.DT_BLOCK and info.block_limit is None:
+                    pending.append((info, data))
+                else:
+                    pending.append(
+                        (
+                            info,
+                            executor.submit(
+                                inflate_block,
+                                data,
+                                info.block_type,
+                                info.param,
+                                size,
+                                info.block_limit,
+                            ),
+                        )
+                    )
+
+            if not pending:
+                break
+
+            info, data = pending.popleft()
+            if data is not None and not isinstance(data, bytes):
+                data = data.result()
+            yield info, data
+    finally:
+        # the consumer stopped early
+        for _, data in pending:
+            if data is not None and not isinstance(data, bytes):
+                data.cancel()
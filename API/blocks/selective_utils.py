@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the selective reads of wide records: only
+the byte ranges of the requested channels are read from the data blocks
+"""
+
+import mmap
+import os
+
+__all__ = ["merge_byte_ranges", "read_byte_ranges"]
+
+# records shorter than a memory page are always read completely
+SELECTIVE_READ_MIN_RECORD_SIZE = mmap.PAGESIZE
+# maximum fraction of the record pages touched by the byte ranges
+SELECTIVE_READ_RATIO = 0.5
+# byte ranges closer than this are merged in a single read
+SELECTIVE_READ_GAP = 64
+
+
+def merge_byte_ranges(ranges, gap=SELECTIVE_READ_GAP):
+    """sort and merge the overlapping or close byte ranges
+
+    Parameters
+    ----------
+    ranges : iterable
+        (start, stop) byte ranges inside the record
+    gap : int
+        ranges separated by less than *gap* bytes are merged
+
+    Returns
+    -------
+    merged : list
+        sorted list of (start, stop) byte ranges
+
+    """
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start - merged[-1][1] < gap:
+            if stop > merged[-1][1]:
+                merged[-1] = merged[-1][0], stop
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def read_byte_ranges(stream, address, record_size, count, ranges):
+    """read the byte ranges of consecutive records; the other bytes of the
+    records are left as zeros
+
+    Parameters
+    ----------
+    stream : file handle
+        file handle
+    address : int
+        file address of the first record
+    record_size : int
+        record size
+    count : int
+        number of records
+    ranges : list
+        (start, stop) byte ranges inside the record
+
+    Returns
+    -------
+    data : bytearray
+        *count* records
+
+    """
+    data = bytearray(count * record_size)
+
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, OSError):
+        fileno = None
+
+    if fileno is not None and hasattr(os, "pread"):
+        # positional reads: one system call per range
+        pread = os.pread
+        for position in range(0, count * record_size, record_size):
+            for start, stop in ranges:
+                data[position + start : position + stop] = pread(
+                    fileno, stop - start, address + position + start
+                )
+    else:
+        seek = stream.seek
+        read = stream.read
+        for position in range(0, count * record_size, record_size):
+            for start, stop in ranges:
+                seek(address + position + start)
+                data[position + start : position + stop] = read(stop - start)
+
+    return data
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the sorting of unsorted data groups: the
+records of the channel groups are found in a data buffer and copied to one
+contiguous array for each record ID with NumPy
+"""
+
+import numpy as np
+
+from API.blocks.utils import MdfException
+
+__all__ = ["record_steps", "record_starts", "gather_records", "demultiplex_records"]
+
+# unsorted data read size and sorted records size buffered before the
+# temporary file writes
+SORT_READ_SIZE = 16 * 2 ** 20
+SORT_WRITE_SIZE = 64 * 2 ** 20
+
+
+def record_steps(cg_size, record_id_nr):
+    """distance from a record start to the next one for each record ID byte
+
+    Parameters
+    ----------
+    cg_size : dict
+        record ID -> record size without the record ID bytes
+    record_id_nr : int
+        number of record IDs of the data group: 1 (before the record) or 2
+        (before and after the record)
+
+    Returns
+    -------
+    steps : list
+        256 items; *None* for the unused record IDs
+
+    """
+    steps = [None] * 256
+    for rec_id, size in cg_size.items():
+        steps[rec_id] = size + record_id_nr
+    return steps
+
+
+def record_starts(data, steps):
+    """offsets of the complete records in the *data* buffer
+
+    Parameters
+    ----------
+    data : bytes | bytearray
+        unsorted data that starts with a record ID
+    steps : list
+        output of *record_steps*
+
+    Returns
+    -------
+    starts, end : np.ndarray, int
+        record start offsets and offset of the first incomplete record (the
+        size of *data* if the last record is complete)
+
+    """
+    size = len(data)
+    used = {step for step in steps if step is not None}
+
+    if len(used) == 1:
+        # all the records have the same size: the starts are known
+        (step,) = used
+        end = size - size % step
+        starts = np.arange(0, end, step, dtype="i8")
+        ids = np.frombuffer(data, dtype="u1", count=end)[::step]
+        valid = np.array([item is not None for item in steps])
+        if not valid[ids].all():
+            position = int(starts[~valid[ids]][0])
+            raise MdfException(
+                f"Unknown record ID {data[position]} at offset {position} "
+                "of unsorted data block"
+            )
+        return starts, end
+
+    # the records starts are chained by the record IDs; only the offsets are
+    # collected here, the records are copied by *demultiplex_records*
+    starts = []
+    append = starts.append
+    i = 0
+    try:
+        while True:
+            next_i = i + steps[data[i]]
+            if next_i > size:
+                break
+            append(i)
+            i = next_i
+    except IndexError:
+        # end of the buffer
+        pass
+    except TypeError:
+        raise MdfException(
+            f"Unknown record ID {data[i]} at offset {i} of unsorted data block"
+        )
+
+    return np.array(starts, dtype="i8"), i
+
+
+def gather_records(buffer, offsets, size):
+    """copy the fixed size records found at *offsets* in a single array
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        uint8 data buffer
+    offsets : np.ndarray | list
+        offsets of the record data (after the record ID)
+    size : int
+        record size
+
+    Returns
+    -------
+    records : np.ndarray
+        (len(offsets), size) uint8 array
+
+    """
+    if not size:
+        return np.empty((len(offsets), 0), dtype="u1")
+    # one row per record: rows of a sliding window view over the buffer
+    windows = np.lib.stride_tricks.as_strided(
+        buffer, shape=(len(buffer) - size + 1, size), strides=(1, 1), writeable=False
+    )
+    return windows[offsets]
+
+
+def demultiplex_records(data, cg_size, record_id_nr, steps=None):
+    """split the complete records of the unsorted *data* buffer by record ID
+
+    Parameters
+    ----------
+    data : bytes | bytearray
+        unsorted data that starts with a record ID
+    cg_size : dict
+        record ID -> record size without the record ID bytes
+    record_id_nr : int
+        number of record IDs of the data group (1 or 2)
+    steps : list
+        output of *record_steps*; computed if not given
+
+    Returns
+    -------
+    records, end : dict, int
+        record ID -> (cycles, record size) uint8 array of the records without
+        the record IDs, for the IDs found in *data*; and the offset of the
+        first incomplete record, that must be passed again at the start of the
+        next buffer
+
+    """
+    if steps is None:
+        steps = record_steps(cg_size, record_id_nr)
+
+    starts, end = record_starts(data, steps)
+
+    records = {}
+    if not len(starts):
+        return records, end
+
+    buffer = np.frombuffer(data, dtype="u1", count=end)
+    ids = buffer[starts]
+    present = np.flatnonzero(np.bincount(ids, minlength=256))
+
+    for rec_id in present.tolist():
+        if len(present) == 1:
+            offsets = starts + 1
+        else:
+            offsets = starts[ids == rec_id] + 1
+        # the record IDs are skipped
+        records[rec_id] = gather_records(buffer, offsets, cg_size[rec_id])
+
+    return records, end
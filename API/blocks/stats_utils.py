@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+mdfstudioAPI utility functions for the channel statistics of the export
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+__all__ = ["ChannelStatistics", "update_statistics"]
+
+STATS_BLOCK_SIZE = 2 ** 16
+
+
+class ChannelStatistics:
+    """min, max, average, rms and last value of a channel, accumulated over
+    consecutive chunks of samples (for example the fragments of a group read).
+
+    Each chunk is processed in cache sized blocks: the finite values of the
+    block are selected once and the extremes, the sum and the sum of squares
+    are computed on the same block, so the samples are only read from memory
+    once. The sums are accumulated as float64.
+
+    Non finite samples are skipped; for string and record channels only the
+    last value is kept.
+
+    """
+
+    __slots__ = "count", "min", "max", "sum", "square_sum", "last", "dtype", "is_string"
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+        self.square_sum = 0.0
+        self.last = None
+        self.dtype = None
+        self.is_string = False
+
+    def update(self, samples):
+        """accumulate the next chunk of samples
+
+        Parameters
+        ----------
+        samples : np.array
+            channel samples
+
+        """
+        kind = samples.dtype.kind
+
+        if kind in "SUVO":
+            self.is_string = True
+            if len(samples):
+                self.last = samples[-1]
+            return
+
+        if samples.ndim > 1:
+            samples = samples.ravel()
+
+        integer = kind in "biu"
+        if self.dtype is None:
+            self.dtype = np.dtype(np.float64) if integer else samples.dtype
+
+        for start in range(0, len(samples), STATS_BLOCK_SIZE):
+            block = samples[start : start + STATS_BLOCK_SIZE]
+
+            if integer:
+                block = block.astype(np.float64)
+            else:
+                finite = np.isfinite(block)
+                if not finite.all():
+                    block = block[finite]
+                if not len(block):
+                    continue
+
+            values = block if block.dtype == np.float64 else block.astype(np.float64)
+            self._merge(
+                len(block),
+                block.min(),
+                block.max(),
+                values.sum(),
+                np.dot(values, values),
+                block[-1],
+            )
+
+    def _merge(self, count, minimum, maximum, total, square_total, last):
+        if self.count:
+            self.min = min(self.min, minimum)
+            self.max = max(self.max, maximum)
+        else:
+            self.min, self.max = minimum, maximum
+        self.sum += total
+        self.square_sum += square_total
+        self.count += count
+        self.last = last
+
+    def values(self):
+        """statistics in the *stats.csv* layout
+
+        Returns
+        -------
+        values : tuple
+            (min, max, avg, rms, last value); empty strings for string
+            channels and "n.a." if there are no finite samples
+
+        """
+        if self.is_string:
+            return "", "", "", "", "" if self.last is None else self.last
+        elif not self.count:
+            return ("n.a.",) * 5
+        else:
+            scalar = self.dtype.type
+            return (
+                self.min,
+                self.max,
+                scalar(self.sum / self.count),
+                scalar(np.sqrt(self.square_sum / self.count)),
+                self.last,
+            )
+
+
+def update_statistics(statistics, samples):
+    """accumulate the samples of several channels that were read from the same
+    fragment. The one dimensional numeric channels with the same dtype are
+    stacked in a 2D block and the statistics of all of them are computed
+    with a single reduction per statistic; the other channels fall back to
+    *ChannelStatistics.update*
+
+    Parameters
+    ----------
+    statistics : list
+        *ChannelStatistics* of the channels
+    samples : list
+        samples of the channels, with the same length
+
+    """
+    blocks = defaultdict(list)
+    for stats, channel_samples in zip(statistics, samples):
+        kind = channel_samples.dtype.kind
+        if kind in "SUVO" or channel_samples.ndim != 1 or not len(channel_samples):
+            stats.update(channel_samples)
+        else:
+            blocks[channel_samples.dtype].append((stats, channel_samples))
+
+    for dtype, channels in blocks.items():
+        if len(channels) == 1 or len(channels[0][1]) > STATS_BLOCK_SIZE:
+            for stats, channel_samples in channels:
+                stats.update(channel_samples)
+            continue
+
+        integer = dtype.kind in "biu"
+        for stats, _ in channels:
+            if stats.dtype is None:
+                stats.dtype = np.dtype(np.float64) if integer else dtype
+
+        block = np.stack([channel_samples for _, channel_samples in channels])
+        if integer:
+            block = block.astype(np.float64)
+        values = block if block.dtype == np.float64 else block.astype(np.float64)
+
+        finite = None if integer else np.isfinite(block)
+        if finite is None or finite.all():
+            counts = [block.shape[1]] * len(channels)
+            minimums = block.min(axis=1)
+            maximums = block.max(axis=1)
+            lasts = block[:, -1]
+        else:
+            counts = finite.sum(axis=1)
+            minimums = np.fmin.reduce(np.where(finite, block, np.nan), axis=1)
+            maximums = np.fmax.reduce(np.where(finite, block, np.nan), axis=1)
+            values = np.where(finite, values, 0.0)
+            last_index = block.shape[1] - 1 - finite[:, ::-1].argmax(axis=1)
+            lasts = block[np.arange(len(channels)), last_index]
+
+        totals = values.sum(axis=1)
+        square_totals = np.einsum("ij,ij->i", values, values)
+
+        for i, (stats, _) in enumerate(channels):
+            if counts[i]:
+                stats._merge(
+                    int(counts[i]),
+                    minimums[i],
+                    maximums[i],
+                    totals[i],
+                    square_totals[i],
+                    lasts[i],
+                )
@@ -1073,6 +1073,9 @@ class Group:
         "record",
         "parents",
         "types",
+        "extraction_plans",
+        "bit_fields",
+        "time_index",
         "signal_types",
         "trigger",
         "string_dtypes",
@@ -1089,6 +1092,9 @@ class Group:
         self.signal_data_size = []
         self.parents = None
         self.types = None
+        self.extraction_plans = {}
+        self.bit_fields = None
+        self.time_index = {}
         self.record = None
         self.trigger = None
         self.string_dtypes = None
@@ -1406,7 +1412,7 @@ def downcast(array):
     return array
 
 
-def master_using_raster(mdf, raster, endpoint=False):
+def master_using_raster(mdf, raster, endpoint=False, groups=None):
     """get single master based on the raster
 
     Parameters
@@ -1417,6 +1423,9 @@ def master_using_raster(mdf, raster, endpoint=False):
         new raster
     endpoint=False : bool
         include maximum time stamp in the new master
+    groups : iterable | None
+        virtual group indexes used for the time range; default all the
+        virtual groups
 
     Returns
     -------
@@ -1430,20 +1439,17 @@ def master_using_raster(mdf, raster, endpoint=False):
 
         t_min = []
         t_max = []
-        for group_index in mdf.virtual_groups:
+        for group_index in mdf.virtual_groups if groups is None else groups:
             group = mdf.groups[group_index]
             cycles_nr = group.channel_group.cycles_nr
             if cycles_nr:
-                master_min = mdf.get_master(
-                    group_index, record_offset=0, record_count=1
-                )
-                if len(master_min):
-                    t_min.append(master_min[0])
-                master_max = mdf.get_master(
-                    group_index, record_offset=cycles_nr - 1, record_count=1
-                )
-                if len(master_max):
-                    t_max.append(master_max[0])
+                # first and last record from the group sparse time index
+                master_min = mdf.get_master_value(group_index, 0)
+                if master_min is not None:
+                    t_min.append(master_min)
+                master_max = mdf.get_master_value(group_index, cycles_nr - 1)
+                if master_max is not None:
+                    t_max.append(master_max)
 
         if t_min:
             t_min = np.amin(t_min)
@@ -1463,6 +1469,55 @@ def master_using_raster(mdf, raster, endpoint=False):
     return master
 
 
+# canonical sampling periods used to snap the estimated group raster:
+# 1 / (2 ** x * 5 ** y) for the sub-second rates and a few slow rates
+RASTER_UNDER = sorted(
+    {
+        1 / (2 ** x * 5 ** y)
+        for x in range(9)
+        for y in range(4)
+        if 2 ** x * 5 ** y <= 1000
+    }
+)
+RASTER_OVER = [1, 1 / 0.2, 1 / 0.4, 1 / 0.5, 1 / 0.8]
+
+
+def snap_sampling_rate(period):
+    """snap an estimated sampling period to the closest canonical raster
+
+    Parameters
+    ----------
+    period : float
+        mean time difference between consecutive samples
+
+    Returns
+    -------
+    raster : float
+        canonical raster from *RASTER_UNDER* or *RASTER_OVER*
+
+    """
+    if period >= 1:
+        rasters, digits = RASTER_OVER, 4
+    else:
+        rasters, digits = RASTER_UNDER, 11
+
+    for pos in reversed(range(digits)):
+        rounded = round(period, pos)
+        for raster in rasters:
+            if rounded == raster:
+                return raster
+
+    rounded = round(period, 5)
+    min_value = 100
+    min_raster = rounded
+    for raster in RASTER_OVER + RASTER_UNDER:
+        if abs(rounded - raster) < min_value:
+            min_value = abs(rounded - raster)
+            min_raster = raster
+
+    return min_raster
+
+
 def csv_int2bin(val):
     """format CAN id as bin
 
@@ -1553,11 +1608,14 @@ def load_can_database(path, contents=None, **kwargs):
     return can_matrix
 
 
+BLOCKS_PATTERN = re.compile(
+    rb"(?P<block>##(D[GVTZIL]|AT|C[AGHNC]|EV|FH|HL|LD|MD|R[DVI]|S[IRD]|TX))",
+    re.DOTALL | re.MULTILINE,
+)
+
+
 def all_blocks_addresses(obj):
-    pattern = re.compile(
-        rb"(?P<block>##(D[GVTZIL]|AT|C[AGHNC]|EV|FH|HL|LD|MD|R[DVI]|S[IRD]|TX))",
-        re.DOTALL | re.MULTILINE,
-    )
+    pattern = BLOCKS_PATTERN
 
     try:
         obj.seek(0)
@@ -13,6 +13,16 @@
     *   ChannelExtension.metadata - Get rid of b" text when decoding byte type data
     *   ChannelGroup.metadata - Get rid of b" text when decoding byte type data
 
+    Date : 2026-10-18
+
+    Functions
+    ---------
+    *   ChannelConversion.convert - the tabular conversion arrays are built once
+        per conversion block; the 8 and 16 bit integer samples are converted
+        with a lookup table (lut_utils) for the non linear conversions
+    *   ChannelConversion.convert_categorical - value to text conversion as
+        integer codes and text labels
+
 """
 
 from datetime import datetime
@@ -29,10 +39,35 @@ import numpy as np
 from API.blocks import v2_v3_constants as v23c
 from API.version import __version__
 from API.blocks.utils import get_fields, get_text_v3, MdfException, UINT16_u, UINT16_uf
+from API.blocks.lut_utils import (
+    build_lookup_table,
+    convert_categorical,
+    lookup,
+    lookup_dtype,
+)
 
 SEEK_START = v23c.SEEK_START
 SEEK_END = v23c.SEEK_END
 
+# value to text conversions that can give categories
+VALUE2TEXT_CONVERSION_TYPES = (
+    v23c.CONVERSION_TYPE_TABX,
+    v23c.CONVERSION_TYPE_RTABX,
+)
+
+# conversions applied with a lookup table to the 8 and 16 bit integer samples
+LUT_CONVERSION_TYPES = (
+    v23c.CONVERSION_TYPE_TABI,
+    v23c.CONVERSION_TYPE_TAB,
+    v23c.CONVERSION_TYPE_TABX,
+    v23c.CONVERSION_TYPE_RTABX,
+    v23c.CONVERSION_TYPE_EXPO,
+    v23c.CONVERSION_TYPE_LOGH,
+    v23c.CONVERSION_TYPE_RAT,
+    v23c.CONVERSION_TYPE_POLY,
+    v23c.CONVERSION_TYPE_FORMULA,
+)
+
 
 CHANNEL_DISPLAYNAME_u = v23c.CHANNEL_DISPLAYNAME_u
 CHANNEL_DISPLAYNAME_uf = v23c.CHANNEL_DISPLAYNAME_uf
@@ -1426,9 +1461,97 @@ address: {hex(self.address)}
 
         return "\n".join(metadata)
 
+    def _tables(self):
+        """arrays of the tabular conversions; built once since the conversion
+        is shared by all the channels that use the same CC block"""
+        try:
+            return self._conversion_tables
+        except AttributeError:
+            pass
+
+        conversion_type = self.conversion_type
+        if conversion_type in (v23c.CONVERSION_TYPE_TABI, v23c.CONVERSION_TYPE_TAB):
+            nr = self.ref_param_nr
+            tables = (
+                np.array([self[f"raw_{i}"] for i in range(nr)]),
+                np.array([self[f"phys_{i}"] for i in range(nr)]),
+            )
+
+        elif conversion_type == v23c.CONVERSION_TYPE_TABX:
+            nr = self.ref_param_nr
+            raw_vals = np.array([self[f"param_val_{i}"] for i in range(nr)])
+            phys = np.array([self[f"text_{i}"] for i in range(nr)])
+
+            x = sorted(zip(raw_vals, phys))
+            tables = (
+                np.array([e[0] for e in x], dtype="<i8"),
+                np.array([e[1] for e in x]),
+            )
+
+        elif conversion_type == v23c.CONVERSION_TYPE_RTABX:
+            nr = self.ref_param_nr - 1
+            lower = [self[f"lower_{i}"] for i in range(nr)]
+            upper = [self[f"upper_{i}"] for i in range(nr)]
+            phys = [self.referenced_blocks[f"text_{i}"] for i in range(nr)]
+
+            # the ranges are searched with np.searchsorted
+            x = sorted(zip(lower, upper, phys))
+            tables = (
+                np.array([e[0] for e in x]),
+                np.array([e[1] for e in x]),
+                np.array([e[2] for e in x]),
+            )
+
+        else:
+            tables = ()
+
+        self._conversion_tables = tables
+        return tables
+
+    def _lookup_table(self, values):
+        """lookup table for the 8 and 16 bit integer raw *values*, or *None*
+        if they must be converted sample by sample"""
+        dtype = lookup_dtype(values)
+        if dtype is None:
+            return None
+
+        try:
+            lookup_tables = self._lookup_tables
+        except AttributeError:
+            lookup_tables = self._lookup_tables = {}
+
+        if dtype in lookup_tables:
+            return lookup_tables[dtype]
+
+        # the table is not worth building for less samples than raw values
+        if len(values) < 2 ** (8 * dtype.itemsize):
+            return None
+
+        # the table itself is computed with the sample by sample conversion
+        lookup_tables[dtype] = None
+        table = build_lookup_table(self.convert, dtype)
+
+        # the partial range to text conversions give numeric values only if
+        # some samples are outside of the ranges
+        if (
+            table is not None
+            and self.conversion_type
+            in (v23c.CONVERSION_TYPE_TABX, v23c.CONVERSION_TYPE_RTABX)
+            and table.dtype.kind != "S"
+        ):
+            table = None
+
+        lookup_tables[dtype] = table
+        return table
+
     def convert(self, values):
         conversion_type = self.conversion_type
 
+        if conversion_type in LUT_CONVERSION_TYPES:
+            table = self._lookup_table(values)
+            if table is not None:
+                return lookup(values, table)
+
         if conversion_type == v23c.CONVERSION_TYPE_NONE:
             pass
 
@@ -1441,12 +1564,7 @@ address: {hex(self.address)}
                     values += b
 
         elif conversion_type in (v23c.CONVERSION_TYPE_TABI, v23c.CONVERSION_TYPE_TAB):
-            nr = self.ref_param_nr
-
-            raw_vals = [self[f"raw_{i}"] for i in range(nr)]
-            raw_vals = np.array(raw_vals)
-            phys = [self[f"phys_{i}"] for i in range(nr)]
-            phys = np.array(phys)
+            raw_vals, phys = self._tables()
 
             if conversion_type == v23c.CONVERSION_TYPE_TABI:
                 values = np.interp(values, raw_vals, phys)
@@ -1467,15 +1585,7 @@ address: {hex(self.address)}
                 values = np.where(cond, phys[inds2], phys[inds])
 
         elif conversion_type == v23c.CONVERSION_TYPE_TABX:
-            nr = self.ref_param_nr
-            raw_vals = [self[f"param_val_{i}"] for i in range(nr)]
-            raw_vals = np.array(raw_vals)
-            phys = [self[f"text_{i}"] for i in range(nr)]
-            phys = np.array(phys)
-
-            x = sorted(zip(raw_vals, phys))
-            raw_vals = np.array([e[0] for e in x], dtype="<i8")
-            phys = np.array([e[1] for e in x])
+            raw_vals, phys = self._tables()
 
             default = b""
 
@@ -1496,14 +1606,7 @@ address: {hex(self.address)}
             values = new_values
 
         elif conversion_type == v23c.CONVERSION_TYPE_RTABX:
-            nr = self.ref_param_nr - 1
-
-            phys = []
-            for i in range(nr):
-                value = self.referenced_blocks[f"text_{i}"]
-                phys.append(value)
-
-            phys = np.array(phys)
+            lower, upper, phys = self._tables()
 
             default = self.referenced_blocks["default_addr"]
 
@@ -1513,9 +1616,6 @@ address: {hex(self.address)}
             else:
                 partial_conversion = False
 
-            lower = np.array([self[f"lower_{i}"] for i in range(nr)])
-            upper = np.array([self[f"upper_{i}"] for i in range(nr)])
-
             idx1 = np.searchsorted(lower, values, side="right") - 1
             idx2 = np.searchsorted(upper, values, side="left")
 
@@ -1629,6 +1729,28 @@ address: {hex(self.address)}
 
         return values
 
+    def convert_categorical(self, values):
+        """value to text conversion of the *values* as categories: the texts
+        are not repeated for each sample
+
+        Parameters
+        ----------
+        values : np.ndarray
+            raw samples
+
+        Returns
+        -------
+        categories : tuple | None
+            (codes, labels): integer codes of the samples and the sorted bytes
+            array of the text labels; *None* if this is not a value to text
+            conversion or if some samples are converted to numeric values
+
+        """
+        if self.conversion_type not in VALUE2TEXT_CONVERSION_TYPES:
+            return None
+
+        return convert_categorical(self.convert, values)
+
     def __getitem__(self, item):
         return self.__getattribute__(item)
 
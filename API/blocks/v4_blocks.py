@@ -10,11 +10,22 @@ classes that implement the blocks for MDF version 4
     Functions
     ---------
     *   Channel.metadata - Get rid of b" text when decoding byte type data
-    *   Channel.__init__ - Set sampling rate from kwargs
+    *   Channel.__init__ - Set sampling rate from kwargs (default None until it is
+        requested through MDF_Common.get_sampling_rate)
     *   ChannelGroup.metadata - Get rid of b" text when decoding byte type data
     *   ChannelConversion.metadata - Get rid of b" text when decoding byte type data
     *   SourceInformation.metadata - Get rid of b" text when decoding byte type data
 
+    Date : 2026-10-18
+
+    Functions
+    ---------
+    *   ChannelConversion.convert - the tabular conversion arrays are built once
+        per conversion block; the 8 and 16 bit integer samples are converted
+        with a lookup table (lut_utils) for the RAT, ALG and tabular conversions
+    *   ChannelConversion.convert_categorical - value to text conversion as
+        integer codes and text labels
+
 """
 
 from datetime import datetime, timezone
@@ -45,6 +56,12 @@ from API.blocks.utils import (
     UINT64_u,
     UINT64_uf,
 )
+from API.blocks.lut_utils import (
+    build_lookup_table,
+    convert_categorical,
+    lookup,
+    lookup_dtype,
+)
 
 SEEK_START = v4c.SEEK_START
 SEEK_END = v4c.SEEK_END
@@ -55,6 +72,24 @@ COMMON_uf = v4c.COMMON_uf
 CN_BLOCK_SIZE = v4c.CN_BLOCK_SIZE
 SIMPLE_CHANNEL_PARAMS_uf = v4c.SIMPLE_CHANNEL_PARAMS_uf
 
+# value to text conversions that can give categories
+VALUE2TEXT_CONVERSION_TYPES = (
+    v4c.CONVERSION_TYPE_TABX,
+    v4c.CONVERSION_TYPE_RTABX,
+    v4c.CONVERSION_TYPE_BITFIELD,
+)
+
+# conversions applied with a lookup table to the 8 and 16 bit integer samples
+LUT_CONVERSION_TYPES = (
+    v4c.CONVERSION_TYPE_RAT,
+    v4c.CONVERSION_TYPE_ALG,
+    v4c.CONVERSION_TYPE_TABI,
+    v4c.CONVERSION_TYPE_TAB,
+    v4c.CONVERSION_TYPE_RTAB,
+    v4c.CONVERSION_TYPE_TABX,
+    v4c.CONVERSION_TYPE_RTABX,
+)
+
 
 logger = logging.getLogger("mdfstudioAPI")
 
@@ -480,8 +515,7 @@ class Channel:
 
     def __init__(self, **kwargs):
 
-        if "sampling_rate" in kwargs:
-            self.sampling_rate = kwargs["sampling_rate"]
+        self.sampling_rate = kwargs.get("sampling_rate", None)
 
         if "stream" in kwargs:
 
@@ -2998,8 +3032,105 @@ class ChannelConversion(_ChannelConversionBase):
 
         return address
 
+    def _tables(self):
+        """arrays of the tabular conversions; built once since the conversion
+        is shared by all the channels that use the same CC block"""
+        try:
+            return self._conversion_tables
+        except AttributeError:
+            pass
+
+        conversion_type = self.conversion_type
+        if conversion_type in (v4c.CONVERSION_TYPE_TABI, v4c.CONVERSION_TYPE_TAB):
+            nr = self.val_param_nr // 2
+            tables = (
+                np.array([self[f"raw_{i}"] for i in range(nr)]),
+                np.array([self[f"phys_{i}"] for i in range(nr)]),
+            )
+
+        elif conversion_type == v4c.CONVERSION_TYPE_RTAB:
+            nr = (self.val_param_nr - 1) // 3
+            tables = (
+                np.array([self[f"lower_{i}"] for i in range(nr)]),
+                np.array([self[f"upper_{i}"] for i in range(nr)]),
+                np.array([self[f"phys_{i}"] for i in range(nr)]),
+            )
+
+        elif conversion_type == v4c.CONVERSION_TYPE_TABX:
+            nr = self.val_param_nr
+            raw_vals = [self[f"val_{i}"] for i in range(nr)]
+            phys = [self.referenced_blocks[f"text_{i}"] for i in range(nr)]
+
+            x = sorted(zip(raw_vals, phys))
+            tables = (
+                np.array([e[0] for e in x], dtype="<i8"),
+                [e[1] for e in x],
+            )
+
+        elif conversion_type == v4c.CONVERSION_TYPE_RTABX:
+            nr = self.val_param_nr // 2
+
+            phys = [self.referenced_blocks[f"text_{i}"] for i in range(nr)]
+            lower = [self[f"lower_{i}"] for i in range(nr)]
+            upper = [self[f"upper_{i}"] for i in range(nr)]
+
+            x = sorted(zip(lower, upper, phys))
+            tables = (
+                np.array([e[0] for e in x], dtype="<i8"),
+                np.array([e[1] for e in x], dtype="<i8"),
+                [e[2] for e in x],
+            )
+
+        else:
+            tables = ()
+
+        self._conversion_tables = tables
+        return tables
+
+    def _lookup_table(self, values):
+        """lookup table for the 8 and 16 bit integer raw *values*, or *None*
+        if they must be converted sample by sample"""
+        dtype = lookup_dtype(values)
+        if dtype is None:
+            return None
+
+        try:
+            lookup_tables = self._lookup_tables
+        except AttributeError:
+            lookup_tables = self._lookup_tables = {}
+
+        if dtype in lookup_tables:
+            return lookup_tables[dtype]
+
+        # the table is not worth building for less samples than raw values
+        if len(values) < 2 ** (8 * dtype.itemsize):
+            return None
+
+        # the table itself is computed with the sample by sample conversion
+        lookup_tables[dtype] = None
+        table = build_lookup_table(self.convert, dtype)
+
+        # the value to text conversions give a different output type when
+        # texts and numeric values are mixed
+        if (
+            table is not None
+            and self.conversion_type
+            in (v4c.CONVERSION_TYPE_TABX, v4c.CONVERSION_TYPE_RTABX)
+            and table.dtype.kind != "S"
+        ):
+            table = None
+
+        lookup_tables[dtype] = table
+        return table
+
     def convert(self, values):
         conversion_type = self.conversion_type
+
+        if conversion_type in LUT_CONVERSION_TYPES:
+            table = self._lookup_table(values)
+            if table is not None:
+                return lookup(values, table)
+
         if conversion_type == v4c.CONVERSION_TYPE_NON:
             pass
         elif conversion_type == v4c.CONVERSION_TYPE_LIN:
@@ -3096,9 +3227,7 @@ class ChannelConversion(_ChannelConversionBase):
             values = evaluate(self.formula)
 
         elif conversion_type in (v4c.CONVERSION_TYPE_TABI, v4c.CONVERSION_TYPE_TAB):
-            nr = self.val_param_nr // 2
-            raw_vals = np.array([self[f"raw_{i}"] for i in range(nr)])
-            phys = np.array([self[f"phys_{i}"] for i in range(nr)])
+            raw_vals, phys = self._tables()
 
             if conversion_type == v4c.CONVERSION_TYPE_TABI:
                 values = np.interp(values, raw_vals, phys)
@@ -3120,10 +3249,7 @@ class ChannelConversion(_ChannelConversionBase):
                 values = np.where(cond, phys[inds2], phys[inds])
 
         elif conversion_type == v4c.CONVERSION_TYPE_RTAB:
-            nr = (self.val_param_nr - 1) // 3
-            lower = np.array([self[f"lower_{i}"] for i in range(nr)])
-            upper = np.array([self[f"upper_{i}"] for i in range(nr)])
-            phys = np.array([self[f"phys_{i}"] for i in range(nr)])
+            lower, upper, phys = self._tables()
             default = self.default
 
             if values.dtype.kind == "f":
@@ -3146,17 +3272,10 @@ class ChannelConversion(_ChannelConversionBase):
             values = new_values
 
         elif conversion_type == v4c.CONVERSION_TYPE_TABX:
-            nr = self.val_param_nr
-            raw_vals = [self[f"val_{i}"] for i in range(nr)]
-
-            phys = [self.referenced_blocks[f"text_{i}"] for i in range(nr)]
+            raw_vals, phys = self._tables()
 
             default = self.referenced_blocks["default_addr"]
 
-            x = sorted(zip(raw_vals, phys))
-            raw_vals = np.array([e[0] for e in x], dtype="<i8")
-            phys = [e[1] for e in x]
-
             names = values.dtype.names
 
             if names:
@@ -3263,20 +3382,10 @@ class ChannelConversion(_ChannelConversionBase):
                 values = ret
 
         elif conversion_type == v4c.CONVERSION_TYPE_RTABX:
-            nr = self.val_param_nr // 2
-
-            phys = [self.referenced_blocks[f"text_{i}"] for i in range(nr)]
+            lower, upper, phys = self._tables()
 
             default = self.referenced_blocks["default_addr"]
 
-            lower = [self[f"lower_{i}"] for i in range(nr)]
-            upper = [self[f"upper_{i}"] for i in range(nr)]
-
-            x = sorted(zip(lower, upper, phys))
-            lower = np.array([e[0] for e in x], dtype="<i8")
-            upper = np.array([e[1] for e in x], dtype="<i8")
-            phys = [e[2] for e in x]
-
             ret = np.array([None] * len(values), dtype="O")
 
             idx1 = np.searchsorted(lower, values, side="right") - 1
@@ -3396,6 +3505,28 @@ class ChannelConversion(_ChannelConversionBase):
 
         return values
 
+    def convert_categorical(self, values):
+        """value to text conversion of the *values* as categories: the texts
+        are not repeated for each sample
+
+        Parameters
+        ----------
+        values : np.ndarray
+            raw samples
+
+        Returns
+        -------
+        categories : tuple | None
+            (codes, labels): integer codes of the samples and the sorted bytes
+            array of the text labels; *None* if this is not a value to text
+            conversion or if some samples are converted to numeric values
+
+        """
+        if self.conversion_type not in VALUE2TEXT_CONVERSION_TYPES:
+            return None
+
+        return convert_categorical(self.convert, values)
+
     def metadata(self, indent=""):
         if self.conversion_type == v4c.CONVERSION_TYPE_NON:
             keys = v4c.KEYS_CONVERSION_NONE
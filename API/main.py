@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 import concurrent
+from concurrent.futures.process import ProcessPoolExecutor
 from concurrent.futures.thread import ThreadPoolExecutor
 from pathlib import Path
 import os
 from datetime import datetime
 
+from API.batch import export_file, limit_memory
 from API.mdf import MDF
 from API.gui import plot
 from API.blocks.utils import MdfException, ApiException
@@ -27,6 +29,11 @@ class Main():
         self.from_zero = cmd_args.from_zero
         self.empty_chn = cmd_args.empty_chn
         self.use_display_names = cmd_args.use_sname
+        self.float_precision = cmd_args.float_precision
+        self.chunk_ram_size = cmd_args.chunk_size * 2 ** 20 if cmd_args.chunk_size else None
+        self.processes = cmd_args.processes
+        self.memory_limit = cmd_args.memory_limit * 2 ** 20 if cmd_args.memory_limit else None
+        self.metadata_cache = cmd_args.metadata_cache
 
         self.message = []
 
@@ -112,7 +119,7 @@ class Main():
 
         elif self.function == "export":   # export
             start = datetime.now()
-            if self.format.lower() not in ("csv", "mdf", "mat"):
+            if self.format.lower() not in ("csv", "mdf", "mat", "parquet", "feather"):
                 exc_type = "ApiException_003"
                 exc_args = "Invalid export format\t"
                 self.message.append(self.msg_format(exc_type, exc_args))
@@ -125,71 +132,66 @@ class Main():
                 thread_list = []
                 name_dict = None
 
-                if self.groupby == "g":
+                if self.groupby in ("g", "r"):
                     self.single_time_base = False
                     self.with_index = True
                 else:
                     self.single_time_base = True
 
-                with ThreadPoolExecutor() as executor:
-                    for file_path in path_dict:
-                        # get channel list from chn file
-                        required_channels = ()
-                        if self.chn_dir is not None:
-                            name_dict = self.read_chn(self.chn_dir)
-                            required_channels = tuple(name_dict.keys())
-                        else:
-                            if path_dict[file_path] is not None:
-                                name_dict = self.read_chn(path_dict[file_path])
+                if self.processes:
+                    self.export_processes(path_dict)
+                else:
+                    with ThreadPoolExecutor() as executor:
+                        for file_path in path_dict:
+                            # get channel list from chn file
+                            required_channels = ()
+                            if self.chn_dir is not None:
+                                name_dict = self.read_chn(self.chn_dir)
                                 required_channels = tuple(name_dict.keys())
+                            else:
+                                if path_dict[file_path] is not None:
+                                    name_dict = self.read_chn(path_dict[file_path])
+                                    required_channels = tuple(name_dict.keys())
 
-                        kwargs = {"name_dict": name_dict}
+                            kwargs = {"name_dict": name_dict, "metadata_cache": self.metadata_cache}
 
-                        try:
-                            mdf = MDF(file_path, channels=required_channels, **kwargs)
-                            if len(mdf.channels_db) < 2:
-                                exc_type = "MdfException_212"
-                                exc_args = f'Empty channels\t{file_path}'
-                                self.message.append(self.msg_format(exc_type, exc_args))
-                                # err_msg = "Empty channels"
-                                # raise MdfException(f'{file_path}\nEmpty channels')
-                                # self.message.append(self.msg_format(err_msg, f"{file_path}\t{path_dict[file_path]}"))
-                                # print(err_msg)
+                            try:
+                                mdf = MDF(file_path, channels=required_channels, **kwargs)
+                                if len(mdf.channels_db) < 2:
+                                    exc_type = "MdfException_212"
+                                    exc_args = f'Empty channels\t{file_path}'
+                                    self.message.append(self.msg_format(exc_type, exc_args))
+                                    # err_msg = "Empty channels"
+                                    # raise MdfException(f'{file_path}\nEmpty channels')
+                                    # self.message.append(self.msg_format(err_msg, f"{file_path}\t{path_dict[file_path]}"))
+                                    # print(err_msg)
+                                    continue
+                            except Exception as e:
+                                if type(e) == MdfException:
+                                    exc_type = e.__class__.__name__ + "211"
+                                    self.message.append(self.msg_format(exc_type, e.args[0]))
+                                else:
+                                    exc_type = "MdfException_219"
+                                    exc_args = f'Unknown error\t{file_path}'
+                                    self.message.append(self.msg_format(exc_type, exc_args))
                                 continue
-                        except Exception as e:
-                            if type(e) == MdfException:
-                                exc_type = e.__class__.__name__ + "211"
-                                self.message.append(self.msg_format(exc_type, e.args[0]))
+
+                            kwargs = self.export_kwargs()
+
+                            if run_thread:
+                                thread_list.append(executor.submit(mdf.export, self.format, self.out_dir, **kwargs))
                             else:
-                                exc_type = "MdfException_219"
-                                exc_args = f'Unknown error\t{file_path}'
-                                self.message.append(self.msg_format(exc_type, exc_args))
-                            continue
-
-                        kwargs = {"single_time_base": self.single_time_base,
-                                  "time_from_zero": self.from_zero,
-                                  "use_display_names": self.use_display_names,
-                                  "empty_channels": self.empty_chn,
-                                  "raster": self.raster,
-                                  "stats": self.stats,
-                                  "groupby": self.groupby,
-                                  "with_index": self.with_index
-                                  }
-
-                        if run_thread:
-                            thread_list.append(executor.submit(mdf.export, self.format, self.out_dir, **kwargs))
-                        else:
-                            try:
-                                mdf.export(self.format, self.out_dir, **kwargs)
-                            except:
-                                exc_type = "MdfException_221"
-                                exc_args = f'Export failed\t{file_path}'
-                                self.message.append(self.msg_format(exc_type, exc_args))
-                for execution in concurrent.futures.as_completed(thread_list):
-                    try:
-                        execution.result()
-                    except Exception as e:
-                        self.message.append(self.msg_format(e.__class__.__name__, e.args[0]))
+                                try:
+                                    mdf.export(self.format, self.out_dir, **kwargs)
+                                except:
+                                    exc_type = "MdfException_221"
+                                    exc_args = f'Export failed\t{file_path}'
+                                    self.message.append(self.msg_format(exc_type, exc_args))
+                    for execution in concurrent.futures.as_completed(thread_list):
+                        try:
+                            execution.result()
+                        except Exception as e:
+                            self.message.append(self.msg_format(e.__class__.__name__, e.args[0]))
 
                 print(datetime.now()-start)
 
@@ -210,6 +212,70 @@ class Main():
         else:
             self.write_log("\n".join(self.message))
 
+    def export_kwargs(self):
+        return {"single_time_base": self.single_time_base,
+                "time_from_zero": self.from_zero,
+                "use_display_names": self.use_display_names,
+                "empty_channels": self.empty_chn,
+                "raster": self.raster,
+                "stats": self.stats,
+                "groupby": self.groupby,
+                "with_index": self.with_index,
+                "float_precision": self.float_precision,
+                "chunk_ram_size": self.chunk_ram_size,
+                "start": self.start_time,
+                "stop": self.end_time
+                }
+
+    def export_processes(self, path_dict):
+        # batch mode: each worker process opens, filters and exports one file
+        tasks = []
+        for file_path in path_dict:
+            # get channel list from chn file
+            name_dict = None
+            required_channels = ()
+            if self.chn_dir is not None:
+                name_dict = self.read_chn(self.chn_dir)
+                required_channels = tuple(name_dict.keys())
+            else:
+                if path_dict[file_path] is not None:
+                    name_dict = self.read_chn(path_dict[file_path])
+                    required_channels = tuple(name_dict.keys())
+
+            tasks.append((file_path, required_channels, name_dict))
+
+        kwargs = self.export_kwargs()
+
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=limit_memory,
+            initargs=(self.memory_limit,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    export_file,
+                    file_path,
+                    required_channels,
+                    name_dict,
+                    self.format,
+                    self.out_dir,
+                    kwargs,
+                    self.metadata_cache,
+                )
+                for file_path, required_channels, name_dict in tasks
+            ]
+
+            # the messages are logged in the order of the source files
+            for (file_path, *_), future in zip(tasks, futures):
+                try:
+                    messages = future.result()
+                except Exception:
+                    # the worker process was terminated
+                    messages = [("MdfException_229", f'Unknown error\t{file_path}')]
+
+                for exc_type, exc_args in messages:
+                    self.message.append(self.msg_format(exc_type, exc_args))
+
     def read_chn(self, chn_dir):
         # read .chn file and return channel list
         ch_dict = {}
@@ -275,7 +341,7 @@ class Main():
                     channel = grp.channels[ch_nr]
 
                     channels.append([channel.name,
-                                     str(channel.sampling_rate),
+                                     str(mdf.get_sampling_rate(gp_nr)),
                                      mdf.get_channel_unit(channel.name,gp_nr,ch_nr),
                                      f'Channel group {gp_nr}',
                                      str(channel.comment)
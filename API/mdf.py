@@ -1,5 +1,28 @@
 # -*- coding: utf-8 -*-
 """ Edit history
+    Date : 2026-10-18
+
+    *   MDF.export : stats.csv is computed in a single read of each group by
+        MDF._channel_statistics; stats_raw argument for the raw value statistics
+    *   MDF.select, MDF.to_dataframe, MDF.export : start and stop time window
+        arguments; only the records inside the window are read (get_record_range)
+    *   MDF.cut, MDF.iter_get : Only the records inside the time window are read; the
+        first timestamps come from the groups sparse time index (get_master_value)
+    *   MDF.export : parquet and feather columnar export (pyarrow); one row group or
+        record batch per virtual group or DataFrame window
+    *   MDF.export : groupby 'g' loads and writes the groups on a bounded pool of
+        reader threads (MDF._export_groups, export_workers argument)
+    *   MDF.export : groupby 'r' writes a table for each sampling rate bucket on its
+        native grid (MDF.sampling_rate_groups, MDF.get_sampling_rate_group)
+    *   MDF.export : fix the mat export of the channel groups (no single time base);
+        MDF.extract_bus_logging : remove the call to the missing _link_attributes
+    *   MDF.to_dataframe : the channels subset is selected directly from the file
+        (included_channels, MDF._dataframe_signals) instead of a filtered MDF copy;
+        the masters of the selected groups are taken from the read signals
+    *   MDF.to_dataframe, MDF.export : categorical_value2text argument; the value to
+        text conversions give pandas.Categorical columns (integer codes and the
+        decoded labels) that are written label-wise by the CSV and mat exports
+
     Author : yda
     Date : 2021-03-15
 
@@ -23,10 +46,12 @@ import csv
 from datetime import datetime, timezone
 from functools import reduce
 import logging
+import os
 from pathlib import Path
 import re
 from shutil import copy
 from struct import unpack
+import threading
 from traceback import format_exc
 import xml.etree.ElementTree as ET
 import gc
@@ -38,11 +63,15 @@ import pandas as pd
 
 from API.blocks import v2_v3_constants as v23c
 from API.blocks import v4_constants as v4c
+from API.blocks.arrow_utils import ARROW_FORMATS, ArrowColumnWriter
 from API.blocks.bus_logging_utils import extract_mux
 from API.blocks.conversion_utils import from_dict
+from API.blocks.csv_utils import write_csv
+from API.blocks.mat_utils import categorical_objects, MatColumnStore
 from API.blocks.mdf_v2 import MDF2
 from API.blocks.mdf_v3 import MDF3
 from API.blocks.mdf_v4 import MDF4
+from API.blocks.stats_utils import ChannelStatistics, update_statistics
 from API.blocks.utils import (
     components,
     csv_bytearray2hex,
@@ -71,7 +100,7 @@ from API.blocks.v4_blocks import ChannelConversion as ChannelConversionV4
 from API.blocks.v4_blocks import EventBlock, FileHistory
 from API.blocks.v4_blocks import HeaderBlock as HeaderV4
 from API.blocks.v4_blocks import SourceInformation
-from API.signals import Signal
+from API.signals import InterpolationPlan, Signal
 from API.version import __version__
 
 logger = logging.getLogger("mdfstudioAPI")
@@ -118,6 +147,34 @@ class MDF:
         remove source from channel names ("Speed\XCP3" -> "Speed")
     copy_on_get (\*\*kwargs) : bool
         copy arrays in the get method; default *True*
+    compute_sampling_rates (\*\*kwargs) : bool
+        estimate the channel group sampling rates on the first
+        *get_sampling_rate* call using a few partial master reads; if *False*
+        the estimation is skipped and the sampling rates are *None*; default
+        *True*
+    metadata_cache (\*\*kwargs) : bool | str | pathlib.Path
+        keyword only argument: for finalized MDF4 files store the parsed file
+        structure in a sidecar cache entry and restore it on the next open of
+        the unchanged file. *True* uses the *MDFSTUDIOAPI_CACHE* environment
+        variable or *~/.mdfstudioapi/metadata*, a path selects the cache
+        directory; default *False*
+    decompression_threads (\*\*kwargs) : int
+        keyword only argument: for MDF4 files the number of threads that read
+        ahead and inflate the compressed data blocks while the previous blocks
+        are processed; 0 disables the read ahead; default *os.cpu_count()*
+    memory_map (\*\*kwargs) : bool
+        keyword only argument: for MDF4 files read the uncompressed data
+        blocks through a read only memory map of the file, so the records are
+        not copied; default *True* on 64 bit systems
+    overlay_finalization (\*\*kwargs) : bool
+        keyword only argument: unfinalized MDF4 files are finalized in memory
+        on top of the read only original file; if *False* the file is copied to
+        the temporary folder and the copy is finalized; default *True*
+    selective_read (\*\*kwargs) : bool
+        keyword only argument: for MDF4 files with wide records (at least a
+        memory page) *select*, *to_dataframe* and *export* only read the byte
+        ranges of the requested channels from the uncompressed data blocks;
+        the bytes read are reported by *read_statistics*; default *True*
 
     """
 
@@ -264,17 +321,17 @@ class MDF:
             for i, group in enumerate(self.groups):
                 cycles_nr = group.channel_group.cycles_nr
                 if cycles_nr and i in self.masters_db:
-                    master_min = self.get_master(i, record_offset=0, record_count=1)
-                    if len(master_min):
-                        t_min.append(master_min[0])
+                    master_min = self.get_master_value(i, 0)
+                    if master_min is not None:
+                        t_min.append(master_min)
 
             other_t_min = []
             for i, group in enumerate(other.groups):
                 cycles_nr = group.channel_group.cycles_nr
                 if cycles_nr and i in other.masters_db:
-                    master_min = other.get_master(i, record_offset=0, record_count=1)
-                    if len(master_min):
-                        other_t_min.append(master_min[0])
+                    master_min = other.get_master_value(i, 0)
+                    if master_min is not None:
+                        other_t_min.append(master_min)
 
             if not t_min or not other_t_min:
                 return True
@@ -606,9 +663,9 @@ class MDF:
         if whence == 1:
             timestamps = []
             for group in self.virtual_groups:
-                master = self.get_master(group, record_offset=0, record_count=1)
-                if master.size:
-                    timestamps.append(master[0])
+                master = self.get_master_value(group, 0)
+                if master is not None:
+                    timestamps.append(master)
 
             if timestamps:
                 first_timestamp = np.amin(timestamps)
@@ -635,6 +692,12 @@ class MDF:
 
         interpolation_mode = self._integer_interpolation
 
+        # only the records inside the cut interval are read
+        if start is not None or stop is not None:
+            record_ranges = self._time_window_ranges(start, stop)
+        else:
+            record_ranges = {}
+
         # walk through all groups and get all channels
         for i, (group_index, virtual_group) in enumerate(self.virtual_groups.items()):
 
@@ -645,7 +708,11 @@ class MDF:
             idx = 0
             signals = []
             for j, sigs in enumerate(
-                self._yield_selected_signals(group_index, groups=included_channels)
+                self._yield_selected_signals(
+                    group_index,
+                    groups=included_channels,
+                    **record_ranges.get(group_index, {}),
+                )
             ):
                 if not sigs:
                     break
@@ -732,15 +799,22 @@ class MDF:
                     if not len(master):
                         continue
 
-                    signals = [
-                        sig.cut(
+                    cut_signals = []
+                    for sig in signals:
+                        native = sig.samples.dtype.newbyteorder("=")
+                        sig = sig.cut(
                             master[0],
                             master[-1],
                             include_ends=include_ends,
                             interpolation_mode=interpolation_mode,
                         )
-                        for sig in signals
-                    ]
+                        # the interpolated ends of float32 channels are float64:
+                        # all the fragments must keep the record layout of the
+                        # channel group created with the first fragment
+                        if sig.samples.dtype != native:
+                            sig.samples = sig.samples.astype(native)
+                        cut_signals.append(sig)
+                    signals = cut_signals
                 else:
                     for sig in signals:
                         native = sig.samples.dtype.newbyteorder("=")
@@ -837,6 +911,14 @@ class MDF:
               master will be renamed to 'DM<cntr>_<channel name>'
               ( *<cntr>* is the data group index starting from 0)
 
+            * `parquet`, `feather` : columnar export with *pyarrow* in the
+              <filename>/<MDFNAME>/<raster> folder. *groupby* 'c' writes a
+              file for each channel, 'f' a single file and 'g' a file for
+              each virtual group (ChannelGroup_<cntr>_<comment>). The
+              DataFrame windows (*chunk_ram_size*) are written as consecutive
+              row groups (record batches for Feather) and the text columns
+              are dictionary encoded
+
         filename : string | pathlib.Path
             export file name
 
@@ -866,6 +948,8 @@ class MDF:
               compression to be used
 
               * for ``mat`` : bool
+              * for ``parquet`` : codec name, default 'snappy'
+              * for ``feather`` : 'lz4' or 'zstd', default uncompressed
 
             * time_as_date (False) : bool
               export time as local timezone datetimee; only valid for CSV export
@@ -884,6 +968,47 @@ class MDF:
 
               .. versionadded:: 6.0.0
 
+            * categorical_value2text (False) : bool
+              for *single_time_base* and *ignore_value2text_conversions=False*
+              the value to text conversions give categorical columns; the CSV
+              and mat exports write them label by label
+
+            * float_precision (None) : int
+              number of decimals used for the float columns in the CSV export;
+              by default the shortest exact representation is written
+
+            * chunk_ram_size (None) : int
+              streaming export for *single_time_base*; the DataFrame is built
+              and written in consecutive time windows of about *chunk_ram_size*
+              bytes instead of resampling the whole measurement at once. The
+              output is the same as for the normal export, except that
+              *reduce_memory_usage* does not downcast the integer columns
+
+            * start (None) : float
+              time window start; only the samples with the timestamps inside
+              [*start*, *stop*] are exported and only the records of the
+              window are read from the data blocks (see *get_record_range*)
+
+            * stop (None) : float
+              time window stop (included)
+
+            * groupby ('c') : str
+              output layout for the CSV, Parquet and Feather exports: 'c' a
+              file for each channel, 'f' a single file, 'g' a file for each
+              virtual group, 'r' a file for each sampling rate bucket (see
+              *sampling_rate_groups*) with the channels on their native grid
+              instead of the common *raster*
+
+            * export_workers (None) : int
+              number of threads that load and write the groups for
+              *groupby* 'g' and 'r' (see *_export_groups*); default
+              *os.cpu_count()*
+
+            * stats_raw (False) : bool
+              append the raw value statistics (*min_raw*, *max_raw*,
+              *avg_raw*, *rms_raw* and *ep_raw* columns) to the *stats.csv*
+              of the CSV export
+
 
         """
 
@@ -922,6 +1047,13 @@ class MDF:
         groupby = kwargs.get("groupby", "c")    #2021-01-14 c:channel, g:group, f:file
         with_index = kwargs.get("with_index", True)
         stats = kwargs.get("stats", False)
+        stats_raw = kwargs.get("stats_raw", False)
+        float_precision = kwargs.get("float_precision", None)
+        chunk_ram_size = kwargs.get("chunk_ram_size", None)
+        start = kwargs.get("start", None)
+        stop = kwargs.get("stop", None)
+        export_workers = kwargs.get("export_workers", None)
+        categorical_value2text = kwargs.get("categorical_value2text", False)
 
         if compression == "SNAPPY":
             try:
@@ -950,6 +1082,13 @@ class MDF:
                     logger.warning("scipy not found; export to mat is unavailable")
                     return
 
+        elif fmt in ARROW_FORMATS:
+            try:
+                import pyarrow
+            except ImportError:
+                logger.warning(f"pyarrow not found; export to {fmt} is unavailable")
+                return
+
         elif fmt not in ("csv",):
             # raise MdfException(f"Export to {fmt} is not implemented")
             raise MdfException(f"Export to {fmt} is not implemented\t{self.name}")
@@ -961,19 +1100,57 @@ class MDF:
 
         if single_time_base:
             # print(f'[{self.name}] Single timebase start  : {datetime.now()}')
-            df = self.to_dataframe(
-                raster=raster,
-                time_from_zero=time_from_zero,
-                use_display_names=use_display_names,
-                empty_channels=empty_channels,
-                reduce_memory_usage=reduce_memory_usage,
-                ignore_value2text_conversions=ignore_value2text_conversions,
-                raw=raw,
-            )
+            if start is not None or stop is not None:
+                record_ranges = self._time_window_ranges(start, stop)
+            else:
+                record_ranges = None
+
+            if chunk_ram_size:
+                try:
+                    master, masters = self._dataframe_master(
+                        raster,
+                        keep_masters=True,
+                        record_ranges=record_ranges,
+                        start=start,
+                        stop=stop,
+                    )
+                except:
+                    raise MdfException(f'Export failed.\t{self.name}')
+
+                total_size = len(master)
+                df = None
+                windows = self._iter_dataframe_windows(
+                    master,
+                    masters,
+                    chunk_ram_size=chunk_ram_size,
+                    time_from_zero=time_from_zero,
+                    use_display_names=use_display_names,
+                    empty_channels=empty_channels,
+                    reduce_memory_usage=reduce_memory_usage,
+                    ignore_value2text_conversions=ignore_value2text_conversions,
+                    raw=raw,
+                    record_ranges=record_ranges,
+                    categorical_value2text=categorical_value2text,
+                )
+                del masters
+            else:
+                df = self.to_dataframe(
+                    raster=raster,
+                    time_from_zero=time_from_zero,
+                    use_display_names=use_display_names,
+                    empty_channels=empty_channels,
+                    reduce_memory_usage=reduce_memory_usage,
+                    ignore_value2text_conversions=ignore_value2text_conversions,
+                    raw=raw,
+                    start=start,
+                    stop=stop,
+                    categorical_value2text=categorical_value2text,
+                )
+                windows = [df]
 
             # print(f'[{self.name}] Single timebase finish : {datetime.now()}')
 
-        def export_csv(df, file_name, with_index):  #
+        def export_csv(df, file_name, with_index, header=True):  #
             if type(df) == pd.Series:
                 if hasattr(self, "can_logging_db") and self.can_logging_db:
                     if df.endswith("CAN_DataFrame.ID"):
@@ -986,7 +1163,26 @@ class MDF:
                             csv_bytearray2hex(df), index=df.index
                         )
 
-                df.to_csv(file_name, index=with_index, mode='w', header=True)
+                if with_index:
+                    names = [df.index.name or "", df.name]
+                    columns = [df.index, df]
+                else:
+                    names = [df.name]
+                    columns = [df]
+
+                # same layout as pandas.Series.to_csv
+                write_csv(
+                    file_name,
+                    names,
+                    columns,
+                    lineterminator=os.linesep,
+                    na_rep="",
+                    float_precision=float_precision,
+                    upcast_floats=False,
+                    encoding="utf-8",
+                    header=header,
+                    mode="w" if header else "a",
+                )
                 # np.savetxt(file_name, df, header=df.name, comments='')
 
             else:
@@ -1021,163 +1217,29 @@ class MDF:
 
                 # df.to_csv(file_name, index=with_index, mode='w', header=True)
 
+                # same layout as csv.writer.writerow for each row of to_list values
                 if with_index:
-                    with open(file_name, "w", newline="") as csvfile:
-                        writer = csv.writer(csvfile)
-
-                        names_row = [df.index.name, *df.columns]
-                        writer.writerow(names_row)
-
-                        if reduce_memory_usage:
-                            vals = [df.index, *(df[name] for name in df)]
-                        else:
-                            vals = [
-                                df.index.to_list(),
-                                *(df[name].to_list() for name in df),
-                            ]
-
-                        for i, row in enumerate(zip(*vals)):
-                            writer.writerow(row)
+                    names = [df.index.name, *df.columns]
+                    columns = [df.index, *(df[name] for name in df)]
                 else:
-                    with open(file_name, "w", newline="") as csvfile:
-                        writer = csv.writer(csvfile)
-
-                        names_row = [*df.columns]
-                        writer.writerow(names_row)
-
-                        if reduce_memory_usage:
-                            vals = [*(df[name] for name in df)]
-                        else:
-                            vals = [*(df[name].to_list() for name in df), ]
-
-                        for i, row in enumerate(zip(*vals)):
-                            writer.writerow(row)
+                    names = [*df.columns]
+                    columns = [*(df[name] for name in df)]
+
+                write_csv(
+                    file_name,
+                    names,
+                    columns,
+                    float_precision=float_precision,
+                    header=header,
+                    mode="w" if header else "a",
+                )
 
         if fmt == "csv":
             # print(f'[{self.name}] to csv start : {datetime.now()}')
             out_dir = Path(out_dir/f"{self.name.stem}"/f"{raster}")
             out_dir.mkdir(parents=True, exist_ok=True)
 
-            if not with_index:
-                file_name = (out_dir / f"{df.index.name}.csv")
-                np.savetxt(file_name, df.index, header=df.index.name, comments='')
-
-            if stats:
-                file_name = (out_dir / "stats.csv")
-                with open(file_name, "w", newline="") as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(["channel", "min", "max", "avg", "rms", "ep"])
-                    for ch in self.iter_channels():
-                        ch = ch.validate()
-                        # take out NaN values
-                        samples = ch.samples
-                        if samples.dtype.kind not in "SUV":
-                            nans = np.isnan(samples)
-                            if np.any(nans):
-                                ch.samples = ch.samples[~nans]
-                                ch.timestamps = ch.timestamps[~nans]
-
-                        if ch.conversion:
-                            samples = ch.conversion.convert(ch.samples)
-                            if samples.dtype.kind not in "SUV":
-                                nans = np.isnan(samples)
-                                if np.any(nans):
-                                    ch.raw_samples = ch.samples[~nans]
-                                    ch.phys_samples = samples[~nans]
-                                    ch.timestamps = ch.timestamps[~nans]
-                                    ch.samples = ch.samples[~nans]
-                                else:
-                                    ch.raw_samples = ch.samples
-                                    ch.phys_samples = samples
-                            else:
-                                ch.phys_samples = ch.raw_samples = ch.samples
-                        else:
-                            ch.phys_samples = ch.raw_samples = ch.samples
-
-                        if len(ch.phys_samples):
-
-                            if ch.phys_samples.dtype.kind in "SUV":
-                                ch.is_string = True
-                                ch._min = ""
-                                ch._max = ""
-                                ch._avg = ""
-                                ch._rms = ""
-                                ep = ch.phys_samples[len(ch.phys_samples)-1]
-                            else:
-                                ch.is_string = False
-                                samples = ch.phys_samples[np.isfinite(ch.phys_samples)]
-                                if samples.dtype.kind in "iu":
-                                    samples = np.float64(samples)
-                                if len(samples):
-                                    ch._min = np.nanmin(samples)
-                                    ch._max = np.nanmax(samples)
-                                    ch._avg = np.mean(samples)
-                                    ch._rms = np.sqrt(np.mean(np.square(samples)))
-                                    ep = samples[len(samples)-1]
-                                else:
-                                    ch._min = "n.a."
-                                    ch._max = "n.a."
-                                    ch._avg = "n.a."
-                                    ch._rms = "n.a."
-                                    ep = "n.a."
-
-                            if ch.raw_samples.dtype.kind in "SUV":
-                                ch._min_raw = ""
-                                ch._max_raw = ""
-                                ch._avg_raw = ""
-                                ch._rms_raw = ""
-                            else:
-
-                                samples = ch.raw_samples[np.isfinite(ch.raw_samples)]
-                                if samples.dtype.kind in "iu":
-                                    samples = np.float64(samples)
-                                if len(samples):
-                                    ch._min_raw = np.nanmin(samples)
-                                    ch._max_raw = np.nanmax(samples)
-                                    ch._avg_raw = np.mean(samples)
-                                    ch._rms_raw = np.sqrt(np.mean(np.square(samples)))
-                                else:
-                                    ch._min_raw = "n.a."
-                                    ch._max_raw = "n.a."
-                                    ch._avg_raw = "n.a."
-                                    ch._rms_raw = "n.a."
-
-                            ch.empty = False
-
-                        else:
-                            ch.empty = True
-                            if ch.phys_samples.dtype.kind in "SUV":
-                                ch.is_string = True
-                                ch._min = ""
-                                ch._max = ""
-                                ch._rms = ""
-                                ch._avg = ""
-                                ch._min_raw = ""
-                                ch._max_raw = ""
-                                ch._avg_raw = ""
-                                ch._rms_raw = ""
-                                ep = ""
-                            else:
-                                ch.is_string = False
-                                ch._min = "n.a."
-                                ch._max = "n.a."
-                                ch._rms = "n.a."
-                                ch._avg = "n.a."
-                                ch._min_raw = "n.a."
-                                ch._max_raw = "n.a."
-                                ch._avg_raw = "n.a."
-                                ch._rms_raw = "n.a."
-                                ep = "n.a."
-
-                        ch_name = ch.name
-                        if use_display_names:
-                            if ch.display_name != "":
-                                ch_name = ch.display_name
-
-                        writer.writerow([ch_name, ch._min, ch._max, ch._avg, ch._rms, ep])
-
-            thread_list = []
-            if groupby in "cf":
+            def date_index(df):
                 if time_as_date:
                     index = (
                         pd.to_datetime(
@@ -1189,42 +1251,116 @@ class MDF:
                     )
                     df.index = index
                     df.index.name = "timestamps"
+                return df
+
+            if stats:
+                file_name = (out_dir / "stats.csv")
+                with open(file_name, "w", newline="") as csvfile:
+                    writer = csv.writer(csvfile)
+                    columns = ["channel", "min", "max", "avg", "rms", "ep"]
+                    if stats_raw:
+                        columns += [
+                            "min_raw",
+                            "max_raw",
+                            "avg_raw",
+                            "rms_raw",
+                            "ep_raw",
+                        ]
+                    writer.writerow(columns)
+                    # the statistics only use the records inside the window
+                    stats_ranges = {}
+                    if start is not None or stop is not None:
+                        for index in self.virtual_groups:
+                            offset, count = self.get_record_range(index, start, stop)
+                            stats_ranges[index] = {
+                                "record_offset": offset,
+                                "record_count": count,
+                            }
+
+                    for ch, phys_stats, raw_stats in self._channel_statistics(
+                        stats_ranges
+                    ):
+                        ch_name = ch.name
+                        if use_display_names:
+                            if ch.display_name != "":
+                                ch_name = ch.display_name
 
+                        row = [ch_name, *phys_stats.values()]
+                        if stats_raw:
+                            row += raw_stats.values()
+                        writer.writerow(row)
+
+            thread_list = []
             with ThreadPoolExecutor() as executor:
-                if groupby == "c":
-                    for col in df.columns:
-                        col_name = col
-                        if col:
-                            for char in r" \/:":
-                                col_name = col_name.replace(char, "_")
-                            csv_name = (out_dir / f"{col_name}.csv"
+                if groupby in "cf" or not with_index:
+                    for window_index, df in enumerate(windows):
+                        header = window_index == 0
+
+                        if not with_index:
+                            file_name = (out_dir / f"{df.index.name}.csv")
+                            with open(file_name, "w" if header else "a") as index_file:
+                                np.savetxt(
+                                    index_file,
+                                    df.index,
+                                    header=df.index.name if header else "",
+                                    comments='',
+                                )
+
+                        if groupby not in "cf":
+                            continue
+
+                        if time_as_date:
+                            index = (
+                                pd.to_datetime(
+                                    df.index + self.header.start_time.timestamp(), unit="s"
+                                )
+                                    .tz_localize("UTC")
+                                    .tz_convert(LOCAL_TIMEZONE)
+                                    .astype(str)
                             )
-                            # new_df = pd.DataFrame()
-                            # new_df[col] = df[col]
-                            new_df = df[col]
-                        thread_list.append(executor.submit(export_csv, new_df, csv_name, with_index))
+                            df.index = index
+                            df.index.name = "timestamps"
 
-                elif groupby == "f":
-                    csv_name = (
-                                    filename.parent/f"[{raster}]"
-                                    / f"{filename.stem}.csv"
+                        if groupby == "c":
+                            for col in df.columns:
+                                col_name = col
+                                if col:
+                                    for char in r" \/:":
+                                        col_name = col_name.replace(char, "_")
+                                    csv_name = (out_dir / f"{col_name}.csv"
+                                    )
+                                    # new_df = pd.DataFrame()
+                                    # new_df[col] = df[col]
+                                    new_df = df[col]
+                                thread_list.append(
+                                    executor.submit(
+                                        export_csv, new_df, csv_name, with_index, header
+                                    )
+                                )
+
+                        else:
+                            csv_name = (
+                                            filename.parent/f"[{raster}]"
+                                            / f"{filename.stem}.csv"
+                                    )
+                            thread_list.append(
+                                executor.submit(
+                                    export_csv, df, csv_name, with_index, header
+                                )
                             )
-                    thread_list.append(executor.submit(export_csv, df, csv_name, with_index))
 
-                else:   #groupby == "g"
+                        # the next window is appended to the same files
+                        for execution in concurrent.futures.as_completed(thread_list):
+                            execution.result()
+                        thread_list = []
+
+                if groupby == "g":
                     filename = filename.with_suffix(".csv")
 
-                    gp_count = len(self.virtual_groups)
+                    groups = []
                     for i, (group_index, virtual_group) in enumerate(
                             self.virtual_groups.items()
                     ):
-
-                        if self._terminate:
-                            return
-
-                        message = f"Exporting group {i + 1} of {gp_count}"
-                        logger.info(message)
-
                         #yda 2021-01-20
                         if len(self.groups[virtual_group.groups[0]].channels) == 1:
                             continue
@@ -1248,6 +1384,9 @@ class MDF:
                                     filename.parent/f"[{raster}]" / f"ChannelGroup_{i}.csv"
                             )
 
+                        groups.append((group_index, csv_name))
+
+                    def load_group(group_index):
                         df = self.get_group(
                             group_index,
                             raster=raster,
@@ -1256,7 +1395,154 @@ class MDF:
                             reduce_memory_usage=reduce_memory_usage,
                             ignore_value2text_conversions=ignore_value2text_conversions,
                             raw=raw,
+                            start=start,
+                            stop=stop,
+                            categorical_value2text=categorical_value2text,
+                        )
+                        return date_index(df)
+
+                    self._export_groups(
+                        groups,
+                        load_group,
+                        lambda df, csv_name: export_csv(df, csv_name, True),
+                        workers=export_workers,
+                    )
+
+                elif groupby == "r":
+                    # one table for each sampling rate, on its native grid
+                    def load_table(table):
+                        rate, indexes = table
+                        df = self.get_sampling_rate_group(
+                            indexes,
+                            rate,
+                            time_from_zero=time_from_zero,
+                            use_display_names=use_display_names,
+                            reduce_memory_usage=reduce_memory_usage,
+                            ignore_value2text_conversions=ignore_value2text_conversions,
+                            raw=raw,
+                            start=start,
+                            stop=stop,
+                            categorical_value2text=categorical_value2text,
+                        )
+                        return date_index(df)
+
+                    self._export_groups(
+                        self._sampling_rate_tables(out_dir, ".csv"),
+                        load_table,
+                        lambda df, csv_name: export_csv(df, csv_name, True),
+                        workers=export_workers,
+                    )
+
+                for execution in concurrent.futures.as_completed(thread_list):
+                    execution.result()
+            # print(f'[{self.name}] to csv finish : {datetime.now()}')
+
+        elif fmt in ARROW_FORMATS:
+            suffix = ARROW_FORMATS[fmt]
+            out_dir = Path(out_dir/f"{self.name.stem}"/f"{raster}")
+            out_dir.mkdir(parents=True, exist_ok=True)
+            codec = (compression.lower() or None) if isinstance(compression, str) else None
+
+            def safe_name(name, chars=r" \/:"):
+                for char in chars:
+                    name = name.replace(char, "_")
+                return name
+
+            def write_group(df, file_name):
+                names = [df.index.name or "timestamps", *df.columns]
+                columns = [df.index, *(df[name].values for name in df)]
+
+                with ArrowColumnWriter(file_name, fmt, codec) as writer:
+                    writer.write(names, columns)
+
+            if groupby == "r":
+                # one file for each sampling rate, on its native grid
+                def load_table(table):
+                    rate, indexes = table
+                    return self.get_sampling_rate_group(
+                        indexes,
+                        rate,
+                        time_from_zero=time_from_zero,
+                        use_display_names=use_display_names,
+                        time_as_date=time_as_date,
+                        reduce_memory_usage=reduce_memory_usage,
+                        ignore_value2text_conversions=ignore_value2text_conversions,
+                        raw=raw,
+                        start=start,
+                        stop=stop,
+                        categorical_value2text=categorical_value2text,
+                    )
+
+                self._export_groups(
+                    self._sampling_rate_tables(out_dir, suffix),
+                    load_table,
+                    write_group,
+                    workers=export_workers,
+                )
+
+            elif groupby == "g" or not single_time_base:
+                # one file for each virtual group, with its own time base
+                groups = []
+                for i, (group_index, virtual_group) in enumerate(
+                        self.virtual_groups.items()
+                ):
+                    if len(self.groups[virtual_group.groups[0]].channels) == 1:
+                        continue
+
+                    if len(virtual_group.groups) == 1:
+                        comment = self.groups[
+                            virtual_group.groups[0]
+                        ].channel_group.comment
+                    else:
+                        comment = ""
+
+                    if comment:
+                        file_name = out_dir / safe_name(
+                            f"ChannelGroup_{i}_{comment}{suffix}", r' \/:"'
+                        )
+                    else:
+                        file_name = out_dir / f"ChannelGroup_{i}{suffix}"
+
+                    groups.append((group_index, file_name))
+
+                def load_group(group_index):
+                    return self.get_group(
+                        group_index,
+                        raster=raster or None,
+                        time_from_zero=time_from_zero,
+                        use_display_names=use_display_names,
+                        time_as_date=time_as_date,
+                        reduce_memory_usage=reduce_memory_usage,
+                        ignore_value2text_conversions=ignore_value2text_conversions,
+                        raw=raw,
+                        start=start,
+                        stop=stop,
+                        categorical_value2text=categorical_value2text,
+                    )
+
+                self._export_groups(
+                    groups, load_group, write_group, workers=export_workers
+                )
+
+            else:
+                # the DataFrame windows are appended as row groups; with
+                # chunk_ram_size the files stay open until the last window
+                writers = {}
+
+                def write(file_name, names, columns):
+                    if file_name not in writers:
+                        writers[file_name] = ArrowColumnWriter(
+                            out_dir / file_name, fmt, codec
                         )
+                    writers[file_name].write(names, columns)
+                    if not chunk_ram_size:
+                        writers.pop(file_name).close()
+
+                try:
+                    exported = 0
+                    for df in windows:
+                        if self._terminate:
+                            return
 
                         if time_as_date:
                             index = (
@@ -1265,16 +1551,39 @@ class MDF:
                                 )
                                     .tz_localize("UTC")
                                     .tz_convert(LOCAL_TIMEZONE)
-                                    .astype(str)
                             )
-                            df.index = index
-                            df.index.name = "timestamps"
+                        else:
+                            index = df.index.values
+                        index_name = df.index.name or "timestamps"
 
-                        thread_list.append(executor.submit(export_csv, df, csv_name, True))
+                        if not with_index:
+                            write(f"{index_name}{suffix}", [index_name], [index])
 
-                for execution in concurrent.futures.as_completed(thread_list):
-                    execution.result()
-            # print(f'[{self.name}] to csv finish : {datetime.now()}')
+                        if groupby == "c":
+                            for col in df.columns:
+                                if with_index:
+                                    names = [index_name, col]
+                                    columns = [index, df[col].values]
+                                else:
+                                    names = [col]
+                                    columns = [df[col].values]
+                                write(f"{safe_name(col)}{suffix}", names, columns)
+                        else:
+                            names = [*df.columns]
+                            columns = [df[name].values for name in df]
+                            if with_index:
+                                names.insert(0, index_name)
+                                columns.insert(0, index)
+                            write(f"{self.name.stem}{suffix}", names, columns)
+
+                        exported += len(df)
+                        if self._callback and chunk_ram_size:
+                            self._callback(exported, total_size)
+                finally:
+                    for writer in writers.values():
+                        writer.close()
+
+            df = None
 
         elif fmt == "mat":
 
@@ -1313,6 +1622,8 @@ class MDF:
                         channels,
                         ignore_value2text_conversions=ignore_value2text_conversions,
                         raw=raw,
+                        start=start,
+                        stop=stop,
                     )
 
                     master = channels[0].copy()
@@ -1345,6 +1656,34 @@ class MDF:
                     if self._callback:
                         self._callback(i + 1, groups_nr + 1)
 
+            elif chunk_ram_size:
+                used_names = UniqueDB()
+                names = {}
+                store = MatColumnStore()
+                exported = 0
+
+                for df in windows:
+                    for name in df.columns:
+                        if name not in names:
+                            channel_name = matlab_compatible(name)
+                            names[name] = used_names.get_unique_name(channel_name)
+
+                        values = df[name].values
+
+                        if hasattr(values.dtype, "categories"):
+                            values = categorical_objects(values)
+
+                        store.append(names[name], values)
+
+                    store.append("timestamps", df.index.values)
+
+                    exported += len(df)
+                    if self._callback:
+                        self._callback(exported, total_size)
+
+                df = None
+                mdict = store.arrays()
+
             else:
                 used_names = UniqueDB()
                 mdict = {}
@@ -1358,7 +1697,7 @@ class MDF:
                     mdict[channel_name] = df[name].values
 
                     if hasattr(mdict[channel_name].dtype, "categories"):
-                        mdict[channel_name] = np.array(mdict[channel_name], dtype="S")
+                        mdict[channel_name] = categorical_objects(mdict[channel_name])
 
                     if self._callback:
                         self._callback(i + 1 + count, count * 2)
@@ -1389,7 +1728,12 @@ class MDF:
             if self._callback:
                 self._callback(100, 100)
 
-            del[[df]]
+            if single_time_base and chunk_ram_size:
+                del mdict
+                store.close()
+
+            # df is only set by the single time base export
+            df = None
             gc.collect()
         else:
             message = (
@@ -1399,6 +1743,88 @@ class MDF:
             message.format(fmt)
             logger.warning(message)
 
+    def _sampling_rate_tables(self, out_dir, suffix):
+        """output tables of the sampling rate export (*groupby* 'r'): one
+        table for each sampling rate bucket (*SamplingRate_<rate>s*) and one
+        for each group without a sampling rate estimate (*ChannelGroup_<cntr>*)
+
+        Returns
+        -------
+        tables : list
+            ((rate, virtual group indexes), file name) pairs for
+            *_export_groups*
+
+        """
+        tables = []
+        for rate, indexes in self.sampling_rate_groups().items():
+            if rate is None:
+                for index in indexes:
+                    tables.append(
+                        ((None, [index]), out_dir / f"ChannelGroup_{index}{suffix}")
+                    )
+            else:
+                tables.append(
+                    ((rate, indexes), out_dir / f"SamplingRate_{rate}s{suffix}")
+                )
+        return tables
+
+    def _export_groups(self, groups, load, write, workers=None):
+        """export the groups on a bounded pool of threads. Each thread loads a
+        group DataFrame and writes it, so at most *workers* DataFrames are
+        alive at the same time and the writes overlap the loads of the next
+        groups. The loads run in parallel reader threads (*reader_thread*) if
+        the file supports it, else one at a time
+
+        Parameters
+        ----------
+        groups : list
+            (group key, output file name) pairs
+        load : callable
+            *load(key)* returns the group DataFrame
+        write : callable
+            *write(df, file_name)* writes the DataFrame
+        workers : int
+            number of threads; default *os.cpu_count()*
+
+        """
+        workers = workers or os.cpu_count() or 1
+        parallel = self.supports_reader_threads()
+        if not parallel:
+            # one thread loads while the other one writes
+            workers = min(workers, 2)
+        load_lock = threading.Lock()
+        count = len(groups)
+
+        def export_group(position, key, file_name):
+            if self._terminate:
+                return
+
+            logger.info(f"Exporting group {position + 1} of {count}")
+
+            if parallel:
+                with self.reader_thread():
+                    df = load(key)
+            else:
+                with load_lock:
+                    df = load(key)
+
+            write(df, file_name)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(export_group, position, key, file_name)
+                for position, (key, file_name) in enumerate(groups)
+            ]
+            try:
+                for i, future in enumerate(concurrent.futures.as_completed(futures)):
+                    future.result()
+                    if self._callback:
+                        self._callback(i + 1, count)
+            except:
+                for future in futures:
+                    future.cancel()
+                raise
+
     def filter(self, channels, version=None):
         """return new *MDF* object that contains only the channels listed in
         *channels* argument
@@ -1536,6 +1962,8 @@ class MDF:
         raster=None,
         samples_only=False,
         raw=False,
+        start=None,
+        stop=None,
     ):
         """iterator over a channel
 
@@ -1560,6 +1988,10 @@ class MDF:
         raw : bool
             return channel samples without appling the conversion rule; default
             `False`
+        start, stop : float
+            only iterate over the records with the master values inside the
+            time window [*start*, *stop*] (see *get_record_range*); default
+            *None*
 
         """
 
@@ -1567,7 +1999,13 @@ class MDF:
 
         grp = self.groups[gp_nr]
 
-        data = self._load_data(grp)
+        record_offset, record_count = 0, None
+        if start is not None or stop is not None:
+            record_offset, record_count = self.get_record_range(gp_nr, start, stop)
+
+        data = self._load_data(
+            grp, record_offset=record_offset, record_count=record_count
+        )
 
         for fragment in data:
             yield self.get(
@@ -2078,35 +2516,121 @@ class MDF:
 
             yield from channels
 
-    def iter_groups(
-        self,
-        raster=None,
-        time_from_zero=True,
-        empty_channels="skip",
-        keep_arrays=False,
-        use_display_names=False,
-        time_as_date=False,
-        reduce_memory_usage=False,
-        raw=False,
-        ignore_value2text_conversions=False,
-        only_basenames=False,
-    ):
-        """generator that yields channel groups as pandas DataFrames. If there
-        are multiple occurences for the same channel name inside a channel
-        group, then a counter will be used to make the names unique
-        (<original_name>_<counter>)
+    def _channel_statistics(self, record_ranges=None):
+        """statistics of the non-master channels for the export *stats.csv*.
+        The groups are read once, fragment by fragment, and the physical and
+        raw statistics of all the channels are accumulated on each fragment,
+        so the memory usage is bounded by the read fragment size.
 
+        This is a separate read pass, not an accumulation on the exported
+        DataFrame windows: the windows hold the resampled (*raster*) and
+        decoded physical values only, while the statistics are computed on
+        the recorded samples and also need the raw values
 
         Parameters
         ----------
-        use_display_names : bool
-            use display name instead of standard channel name, if available.
+        record_ranges : dict | None
+            virtual group index to *record_offset* and *record_count* keyword
+            arguments; only these records are used. If *None* all the records
+            are used
 
-            .. versionadded:: 5.21.0
+        Returns
+        -------
+        statistics : list
+            list of (signal, physical statistics, raw statistics) tuples; the
+            signals hold the channel metadata of the first fragment
 
-        reduce_memory_usage : bool
-            reduce memory usage by converting all float columns to float32 and
-            searching for minimum dtype that can reprezent the values found
+        """
+
+        statistics = []
+        record_ranges = record_ranges or {}
+        copy_on_get = self._mdf.copy_on_get
+        self.configure(copy_on_get=False)
+
+        try:
+            for index in self.virtual_groups:
+                groups = self.included_channels(index)[index]
+                channels = []
+
+                for idx, sigs in enumerate(
+                    self._yield_selected_signals(
+                        index, groups=groups, **record_ranges.get(index, {})
+                    )
+                ):
+                    if idx == 0:
+                        for sig in sigs:
+                            phys = ChannelStatistics()
+                            # without conversion the raw and physical values are
+                            # the same
+                            raw = ChannelStatistics() if sig.conversion else phys
+                            channels.append((sig, phys, raw))
+                        samples = [(sig.samples, sig.invalidation_bits) for sig in sigs]
+                    else:
+                        samples = sigs[1:]
+
+                    statistics_block, samples_block = [], []
+                    for (sig, phys, raw), (raw_samples, invalidation) in zip(
+                        channels, samples
+                    ):
+                        # the invalidated samples are skipped like in
+                        # Signal.validate
+                        if invalidation is not None and invalidation.any():
+                            raw_samples = raw_samples[~invalidation]
+
+                        statistics_block.append(phys)
+                        if sig.conversion:
+                            phys_samples = sig.conversion.convert(raw_samples)
+                            # value to text conversions are ignored like in select
+                            if phys_samples.dtype.kind in "US":
+                                phys_samples = raw_samples
+                            samples_block.append(phys_samples)
+
+                            statistics_block.append(raw)
+                            samples_block.append(raw_samples)
+                        else:
+                            samples_block.append(raw_samples)
+
+                    update_statistics(statistics_block, samples_block)
+
+                    if self._terminate:
+                        break
+
+                statistics.extend(channels)
+
+        finally:
+            self.configure(copy_on_get=copy_on_get)
+
+        return statistics
+
+    def iter_groups(
+        self,
+        raster=None,
+        time_from_zero=True,
+        empty_channels="skip",
+        keep_arrays=False,
+        use_display_names=False,
+        time_as_date=False,
+        reduce_memory_usage=False,
+        raw=False,
+        ignore_value2text_conversions=False,
+        only_basenames=False,
+    ):
+        """generator that yields channel groups as pandas DataFrames. If there
+        are multiple occurences for the same channel name inside a channel
+        group, then a counter will be used to make the names unique
+        (<original_name>_<counter>)
+
+
+        Parameters
+        ----------
+        use_display_names : bool
+            use display name instead of standard channel name, if available.
+
+            .. versionadded:: 5.21.0
+
+        reduce_memory_usage : bool
+            reduce memory usage by converting all float columns to float32 and
+            searching for minimum dtype that can reprezent the values found
             in integer columns; default *False*
 
             .. versionadded:: 5.21.0
@@ -2365,8 +2889,10 @@ class MDF:
             ]
             sigs = self.select(channels, raw=True)
 
+            if sigs:
+                plan = InterpolationPlan(sigs[0].timestamps, raster)
             sigs = [
-                sig.interp(raster, interpolation_mode=interpolation_mode)
+                sig.interp(raster, interpolation_mode=interpolation_mode, plan=plan)
                 for sig in sigs
             ]
 
@@ -2405,6 +2931,8 @@ class MDF:
         ignore_value2text_conversions=True,
         record_count=None,
         validate=False,
+        start=None,
+        stop=None,
     ):
         """retrieve the channels listed in *channels* argument as *Signal*
         objects
@@ -2441,6 +2969,14 @@ class MDF:
 
             .. versionadded:: 5.16.0
 
+        start (None) : float
+            time window start; only the records of each channel group with the
+            master values inside [*start*, *stop*] are read (see
+            *get_record_range*). If *start* or *stop* is given the
+            *record_offset* and *record_count* arguments are ignored
+        stop (None) : float
+            time window stop (included)
+
         Returns
         -------
         signals : list
@@ -2502,13 +3038,20 @@ class MDF:
                 for ch_index in channel_indexes
             ]
 
-            if record_count is None:
-                cycles = cycles_nr - record_offset
+            if start is not None or stop is not None:
+                group_offset, group_count = self.get_record_range(
+                    virtual_group, start, stop
+                )
+            else:
+                group_offset, group_count = record_offset, record_count
+
+            if group_count is None:
+                cycles = cycles_nr - group_offset
             else:
-                if cycles_nr < record_count + record_offset:
-                    cycles = cycles_nr - record_offset
+                if cycles_nr < group_count + group_offset:
+                    cycles = cycles_nr - group_offset
                 else:
-                    cycles = record_count
+                    cycles = group_count
 
             signals = []
 
@@ -2518,8 +3061,8 @@ class MDF:
                 self._yield_selected_signals(
                     virtual_group,
                     groups=groups,
-                    record_offset=record_offset,
-                    record_count=record_count,
+                    record_offset=group_offset,
+                    record_count=group_count,
                 )
             ):
                 if not sigs:
@@ -2940,6 +3483,9 @@ class MDF:
         raw=False,
         ignore_value2text_conversions=False,
         only_basenames=False,
+        start=None,
+        stop=None,
+        categorical_value2text=False,
     ):
         """get channel group as pandas DataFrames. If there are multiple
         occurences for the same channel name, then a counter will be used to
@@ -2996,6 +3542,12 @@ class MDF:
 
             see `resample` for examples of urisng this argument
 
+        start, stop (None) : float
+            time window; same as for *to_dataframe*
+        categorical_value2text (False) : bool
+            value to text conversions as *pandas.Categorical* columns; same as
+            for *to_dataframe*
+
         Returns
         -------
         df : pandas.DataFrame
@@ -3022,6 +3574,106 @@ class MDF:
             raw=raw,
             ignore_value2text_conversions=ignore_value2text_conversions,
             only_basenames=only_basenames,
+            start=start,
+            stop=stop,
+            categorical_value2text=categorical_value2text,
+        )
+
+    def sampling_rate_groups(self):
+        """virtual groups bucketed by their estimated sampling rate (see
+        *get_sampling_rate*); the groups that only contain the master channel
+        are skipped
+
+        Returns
+        -------
+        buckets : dict
+            sampling rate in seconds (*None* for the groups without an
+            estimate) to the list of virtual group indexes
+
+        """
+        buckets = {}
+        for index, virtual_group in self.virtual_groups.items():
+            if len(self.groups[virtual_group.groups[0]].channels) == 1:
+                continue
+            buckets.setdefault(self.get_sampling_rate(index), []).append(index)
+        return buckets
+
+    def get_sampling_rate_group(
+        self,
+        indexes,
+        rate=None,
+        time_from_zero=True,
+        use_display_names=False,
+        time_as_date=False,
+        reduce_memory_usage=False,
+        raw=False,
+        ignore_value2text_conversions=False,
+        start=None,
+        stop=None,
+        categorical_value2text=False,
+    ):
+        """get the channels of the virtual groups that share the same sampling
+        rate (see *sampling_rate_groups*) as a single DataFrame on their native
+        grid. If all the groups have the same master it is used as index and
+        no interpolation is done, else the channels are resampled with the
+        *rate* raster that spans the groups
+
+        Parameters
+        ----------
+        indexes : list
+            virtual group indexes
+        rate : float | None
+            sampling rate of the groups; if *None* and the masters differ the
+            index is the union of the masters
+
+        The other arguments are the same as for *get_group*
+
+        Returns
+        -------
+        df : pandas.DataFrame
+
+        """
+        masters = []
+        for index in indexes:
+            if start is None and stop is None:
+                masters.append(self.get_master(index))
+            else:
+                offset, count = self.get_record_range(index, start, stop)
+                masters.append(
+                    self.get_master(
+                        index, record_offset=offset, record_count=count
+                    )[:count]
+                )
+
+        if all(np.array_equal(masters[0], master) for master in masters[1:]):
+            raster = masters[0]
+        else:
+            raster = rate
+        del masters
+
+        channels = [
+            (None, gp_index, ch_index)
+            for index in indexes
+            for gp_index, channel_indexes in self.included_channels(index)[
+                index
+            ].items()
+            for ch_index in channel_indexes
+        ]
+
+        return self.to_dataframe(
+            channels=channels,
+            raster=raster,
+            time_from_zero=time_from_zero,
+            empty_channels="skip",
+            keep_arrays=False,
+            use_display_names=use_display_names,
+            time_as_date=time_as_date,
+            reduce_memory_usage=reduce_memory_usage,
+            raw=raw,
+            ignore_value2text_conversions=ignore_value2text_conversions,
+            start=start,
+            stop=stop,
+            categorical_value2text=categorical_value2text,
         )
 
     def iter_to_dataframe(
@@ -3277,9 +3929,10 @@ class MDF:
                         ).flatten()
 
                     cycles = len(group_master)
+                    plan = InterpolationPlan(group_master, master)
 
                     signals = [
-                        signal.interp(master, self._integer_interpolation)
+                        signal.interp(master, self._integer_interpolation, plan=plan)
                         if not same_master or len(signal) != cycles
                         else signal
                         for signal in signals
@@ -3407,6 +4060,9 @@ class MDF:
         use_interpolation=True,
         only_basenames=False,
         interpolate_outwards_with_nan=False,
+        start=None,
+        stop=None,
+        categorical_value2text=False,
     ):
         """generate pandas DataFrame
 
@@ -3475,268 +4131,672 @@ class MDF:
 
             .. versionadded:: 5.15.0
 
+        start (None) : float
+            time window start; only the rows with the index inside [*start*,
+            *stop*] are generated and only the records of the window (plus
+            the previous and the next record for the interpolation) are read
+        stop (None) : float
+            time window stop (included)
+        categorical_value2text (False) : bool
+            valid only for the channels that have value to text conversions and
+            if *raw=False*. If this is True then the columns are
+            *pandas.Categorical*: the texts are decoded once for each label
+            instead of once for each sample
+
         Returns
         -------
         dataframe : pandas.DataFrame
 
         """
         try:
-            start = datetime.now()
+            start_ = datetime.now()
             if channels is not None:
-                mdf = self.filter(channels)
+                # the channels subset is read directly from this file, in the
+                # same virtual groups order as with *filter*
+                groups = self.included_channels(channels=channels)
+            else:
+                groups = None
 
-                result = mdf.to_dataframe(
-                    raster=raster,
-                    time_from_zero=time_from_zero,
-                    empty_channels=empty_channels,
-                    keep_arrays=keep_arrays,
-                    use_display_names=use_display_names,
-                    time_as_date=time_as_date,
-                    reduce_memory_usage=reduce_memory_usage,
-                    raw=raw,
-                    ignore_value2text_conversions=ignore_value2text_conversions,
-                    use_interpolation=use_interpolation,
-                    only_basenames=only_basenames,
-                    interpolate_outwards_with_nan=interpolate_outwards_with_nan,
-                )
+            if start is not None or stop is not None:
+                record_ranges = self._time_window_ranges(start, stop, groups=groups)
+            else:
+                record_ranges = None
+
+            if groups is not None and raster is None:
+                # the signals are read first and their masters are used for
+                # the common master: the records are read only once
+                selected = {
+                    index: self._dataframe_signals(
+                        index, groups[index], record_ranges
+                    )
+                    for index in groups
+                }
+                group_masters = {
+                    index: signals[0].timestamps
+                    for index, signals in selected.items()
+                    if signals
+                }
+            else:
+                selected = group_masters = None
+
+            master, _ = self._dataframe_master(
+                raster,
+                record_ranges=record_ranges,
+                start=start,
+                stop=stop,
+                groups=groups,
+                group_masters=group_masters,
+            )
+            group_masters = None
 
-                mdf.close()
-                return result
+            df = self._dataframe_window(
+                master,
+                record_ranges,
+                groups=groups,
+                selected=selected,
+                empty_channels=empty_channels,
+                keep_arrays=keep_arrays,
+                use_display_names=use_display_names,
+                reduce_memory_usage=reduce_memory_usage,
+                raw=raw,
+                ignore_value2text_conversions=ignore_value2text_conversions,
+                use_interpolation=use_interpolation,
+                only_basenames=only_basenames,
+                interpolate_outwards_with_nan=interpolate_outwards_with_nan,
+                categorical_value2text=categorical_value2text,
+            )
 
-            # df = {}   #yda 2021-01-20
-            df = pd.DataFrame()
-            self._set_temporary_master(None)
+            if time_as_date:
+                new_index = np.array(df.index) + self.header.start_time.timestamp()
+                new_index = pd.to_datetime(new_index, unit="s")
 
-            if raster is not None:
-                try:
-                    raster = float(raster)
-                    assert raster > 0
-                except (TypeError, ValueError):
-                    if isinstance(raster, str):
-                        raster = self.get(raster).timestamps
-                    else:
-                        raster = np.array(raster)
+                df.set_index(new_index, inplace=True)
+            elif time_from_zero and len(master):
+                df.set_index(df.index - df.index[0], inplace=True)
+            print(f'{datetime.now() - start_} {self.name}')
+            return df
+
+        except:
+            raise MdfException(f'Export failed.\t{self.name}')
+
+    def _dataframe_master(
+        self,
+        raster=None,
+        keep_masters=False,
+        record_ranges=None,
+        start=None,
+        stop=None,
+        groups=None,
+        group_masters=None,
+    ):
+        """common master used for the *to_dataframe* and the single time base
+        export
+
+        Parameters
+        ----------
+        raster : float | np.array | str
+            same as for *to_dataframe*
+        keep_masters : bool
+            also return the masters of the virtual groups; default *False*
+        record_ranges : dict | None
+            virtual group index to *record_offset* and *record_count* keyword
+            arguments (see *_time_window_ranges*); only these records of the
+            virtual groups masters are read. If *None* all the records are used
+        start, stop : float | None
+            the common master is limited to the time window [*start*, *stop*]
+        groups : dict | None
+            output of *included_channels* for a channels subset; only the
+            masters of these virtual groups are used. If *None* all the
+            virtual groups are used
+        group_masters : dict | None
+            virtual group index to the master already read for the
+            *record_ranges*; used instead of *get_master*
+
+        Returns
+        -------
+        master, masters : np.array, dict | None
+            strictly increasing common master and the virtual groups masters
+
+        """
+        self._set_temporary_master(None)
+        masters = None
+        record_ranges = record_ranges or {}
+        group_masters = group_masters or {}
+        if groups is None:
+            groups = self.virtual_groups
+
+        if raster is not None:
+            try:
+                raster = float(raster)
+                assert raster > 0
+            except (TypeError, ValueError):
+                if isinstance(raster, str):
+                    raster = self.get(raster).timestamps
                 else:
-                    raster = master_using_raster(self, raster)
-                master = raster
+                    raster = np.array(raster)
             else:
-                masters = {index: self.get_master(index) for index in self.virtual_groups}
+                raster = master_using_raster(self, raster, groups=groups)
+            master = raster
+        else:
+            masters = {
+                index: group_masters[index]
+                if index in group_masters
+                else self.get_master(index, **record_ranges.get(index, {}))
+                for index in groups
+            }
 
-                if masters:
-                    master = reduce(np.union1d, masters.values())
-                else:
-                    master = np.array([], dtype="<f4")
+            if masters:
+                master = reduce(np.union1d, masters.values())
+            else:
+                master = np.array([], dtype="<f4")
 
-                del masters
+            if not keep_masters:
+                masters = None
 
-            idx = np.argwhere(np.diff(master, prepend=-np.inf) > 0).flatten()
-            master = master[idx]
+        if start is not None:
+            master = master[master >= start]
+        if stop is not None:
+            master = master[master <= stop]
 
-            #yda 2021-01-20
-            df["timestamps"] = pd.Series(master, index=np.arange(len(master)))
-            df.set_index("timestamps", inplace=True)
+        idx = np.argwhere(np.diff(master, prepend=-np.inf) > 0).flatten()
+        master = master[idx]
 
-            used_names = UniqueDB()
-            used_names.get_unique_name("timestamps")
+        if keep_masters and masters is None:
+            masters = {
+                index: self.get_master(index, **record_ranges.get(index, {}))
+                for index in groups
+            }
 
-            groups_nr = len(self.virtual_groups)
+        return master, masters
 
-            for group_index, (virtual_group_index, virtual_group) in enumerate(
-                self.virtual_groups.items()
-            ):
-                if virtual_group.cycles_nr == 0 and empty_channels == "skip":
-                    continue
+    def _time_window_ranges(self, start=None, stop=None, groups=None):
+        """record ranges of the virtual groups for the time window [*start*,
+        *stop*]; the previous and the next record are included for the
+        interpolation at the window edges
 
-                channels = [
-                    (None, gp_index, ch_index)
-                    for gp_index, channel_indexes in self.included_channels(
-                        virtual_group_index
-                    )[virtual_group_index].items()
-                    for ch_index in channel_indexes
-                    if ch_index != self.masters_db.get(gp_index, None)
-                ]
+        Parameters
+        ----------
+        start, stop : float | None
+            time window
+        groups : dict | None
+            virtual group indexes to use (see *_dataframe_master*); default
+            all the virtual groups
 
-                signals = [
-                    signal
-                    for signal in self.select(
-                        channels, raw=True, copy_master=False, validate=False
-                    )
-                ]
+        Returns
+        -------
+        record_ranges : dict
+            virtual group index to *record_offset* and *record_count* keyword
+            arguments for *select* and *get_master*
 
-                if not signals:
-                    continue
+        """
+        record_ranges = {}
+        for index in self.virtual_groups if groups is None else groups:
+            virtual_group = self.virtual_groups[index]
+            offset, count = self.get_record_range(index, start, stop)
+            end = min(offset + count + 1, virtual_group.cycles_nr)
+            offset = max(offset - 1, 0)
+            record_ranges[index] = {
+                "record_offset": offset,
+                "record_count": end - offset,
+            }
+        return record_ranges
 
-                group_master = signals[0].timestamps
+    def _dataframe_signals(
+        self, virtual_group_index, included_channels=None, record_ranges=None
+    ):
+        """raw signals of a virtual group for the DataFrame columns
 
-                # for sig in signals:
-                #     if len(sig) == 0:
-                #         if empty_channels == "zeros":
-                #             sig.samples = np.zeros(
-                #                 len(master)
-                #                 if virtual_group.cycles_nr == 0
-                #                 else virtual_group.cycles_nr,
-                #                 dtype=sig.samples.dtype,
-                #             )
-                #             sig.timestamps = (
-                #                 master if virtual_group.cycles_nr == 0 else group_master
-                #             )
+        Parameters
+        ----------
+        virtual_group_index : int
+            virtual group index
+        included_channels : dict | None
+            group index to channel indexes (an item of the *included_channels*
+            output); default all the channels of the virtual group
+        record_ranges : dict | None
+            same as for *_dataframe_window*
 
-                if not raw:
-                    if ignore_value2text_conversions:
-                        # pass
-                        for signal in signals:
-                            conversion = signal.conversion
-                            if conversion:
-                                samples = conversion.convert(signal.samples)
-                                if samples.dtype.kind not in "US":
-                                    signal.samples = samples
-                    else:
-                        for signal in signals:
-                            if signal.conversion:
-                                signal.samples = signal.conversion.convert(signal.samples)
+        Returns
+        -------
+        signals : list
+            signals without the master channels
 
-                for s_index, sig in enumerate(signals):
-                    sig = sig.validate(copy=False)
+        """
+        if included_channels is None:
+            included_channels = self.included_channels(virtual_group_index)[
+                virtual_group_index
+            ]
+        record_ranges = record_ranges or {}
 
-                    if len(sig) == 0:
-                        if empty_channels == "zeros":
-                            sig.samples = np.zeros(
-                                len(master)
-                                if virtual_group.cycles_nr == 0
-                                else virtual_group.cycles_nr,
-                                dtype=sig.samples.dtype,
-                            )
-                            sig.timestamps = (
-                                master if virtual_group.cycles_nr == 0 else group_master
-                            )
+        channels = [
+            (None, gp_index, ch_index)
+            for gp_index, channel_indexes in included_channels.items()
+            for ch_index in channel_indexes
+            if ch_index != self.masters_db.get(gp_index, None)
+        ]
 
-                    signals[s_index] = sig
+        return self.select(
+            channels,
+            raw=True,
+            copy_master=False,
+            validate=False,
+            **record_ranges.get(virtual_group_index, {}),
+        )
 
-                if use_interpolation:
-                    same_master = np.array_equal(master, group_master)
+    def _dataframe_window(
+        self,
+        master,
+        record_ranges=None,
+        empty_channels="skip",
+        keep_arrays=False,
+        use_display_names=False,
+        reduce_memory_usage=True,
+        raw=False,
+        ignore_value2text_conversions=False,
+        use_interpolation=True,
+        only_basenames=False,
+        interpolate_outwards_with_nan=False,
+        categorical_value2text=False,
+        groups=None,
+        selected=None,
+        same_masters=None,
+        downcast_integers=True,
+    ):
+        """build the DataFrame for the common *master* (or a window of it). The
+        columns are collected and the DataFrame is built only once at the end
+        (without copying the samples) to avoid the fragmentation of the column
+        by column insertion
 
-                    if not same_master and interpolate_outwards_with_nan:
-                        idx = np.argwhere(
-                            (master >= group_master[0]) & (master <= group_master[-1])
-                        ).flatten()
+        Parameters
+        ----------
+        master : np.array
+            strictly increasing DataFrame index
+        record_ranges : dict | None
+            virtual group index to *record_offset* and *record_count* keyword
+            arguments for *select*; the records must cover the *master* window.
+            If *None* all the records are used
+        groups : dict | None
+            output of *included_channels* for a channels subset; only these
+            channels are selected. If *None* all the channels are used
+        selected : dict | None
+            virtual group index to the signals already read by
+            *_dataframe_signals*; the items are removed once used
+        same_masters : dict | None
+            virtual group index to *True* if the group master is the full
+            common master (the columns keep the samples dtype) and to *False*
+            if the group is interpolated (float64 for the float channels). A
+            window of the common master uses the decision of the full master so
+            that all the windows have the same dtypes. If *None* the *master*
+            is compared with the group master
+        downcast_integers : bool
+            *reduce_memory_usage* also downcasts the integer columns to the
+            smallest dtype of their values; *False* for the windows of the
+            common master, that must keep the same dtypes
+
+        The other arguments are the same as for *to_dataframe*
 
-                    cycles = len(group_master)
+        Returns
+        -------
+        df : pandas.DataFrame
+            DataFrame with the *timestamps* index
 
-                    signals = [
-                        signal.interp(master, self._integer_interpolation)
-                        if not same_master or len(signal) != cycles
-                        else signal
-                        for signal in signals
-                    ]
+        """
+        record_ranges = record_ranges or {}
 
-                    if not same_master and interpolate_outwards_with_nan:
-                        for sig in signals:
-                            sig.timestamps = sig.timestamps[idx]
-                            sig.samples = sig.samples[idx]
+        columns = {}
+        self._set_temporary_master(None)
 
-                    group_master = master
+        master_index = pd.Index(master, name="timestamps", tupleize_cols=False)
 
-                signals = [sig for sig in signals if len(sig)]
+        def column_values(series):
+            # align to the common master like the DataFrame column assignment
+            if series.index is master_index or series.index.equals(master_index):
+                return series.values
+            else:
+                return series.reindex(master_index).values
 
-                if signals:
-                    diffs = np.diff(group_master, prepend=-np.inf) > 0
-                    if np.all(diffs):
-                        index = pd.Index(group_master, tupleize_cols=False)
+        used_names = UniqueDB()
+        used_names.get_unique_name("timestamps")
 
-                    else:
-                        idx = np.argwhere(diffs).flatten()
-                        group_master = group_master[idx]
+        if groups is None:
+            groups = self.virtual_groups
+            subset = False
+        else:
+            subset = True
 
-                        index = pd.Index(group_master, tupleize_cols=False)
+        groups_nr = len(groups)
 
-                        for sig in signals:
-                            sig.samples = sig.samples[idx]
-                            sig.timestamps = sig.timestamps[idx]
+        for group_index, virtual_group_index in enumerate(groups):
+            virtual_group = self.virtual_groups[virtual_group_index]
+            if virtual_group.cycles_nr == 0 and empty_channels == "skip":
+                continue
 
-                size = len(index)
-                for k, sig in enumerate(signals):
-                    sig_index = (
-                        index
-                        if len(sig) == size
-                        else pd.Index(sig.timestamps, tupleize_cols=False)
+            if selected is not None:
+                signals = selected.pop(virtual_group_index, [])
+            else:
+                signals = self._dataframe_signals(
+                    virtual_group_index,
+                    groups[virtual_group_index] if subset else None,
+                    record_ranges,
+                )
+
+            if not signals:
+                continue
+
+            group_master = signals[0].timestamps
+
+            # for sig in signals:
+            #     if len(sig) == 0:
+            #         if empty_channels == "zeros":
+            #             sig.samples = np.zeros(
+            #                 len(master)
+            #                 if virtual_group.cycles_nr == 0
+            #                 else virtual_group.cycles_nr,
+            #                 dtype=sig.samples.dtype,
+            #             )
+            #             sig.timestamps = (
+            #                 master if virtual_group.cycles_nr == 0 else group_master
+            #             )
+
+            # signal position to the text labels of the categorical signals
+            categories = {}
+
+            if not raw:
+                if ignore_value2text_conversions:
+                    # pass
+                    for signal in signals:
+                        conversion = signal.conversion
+                        if conversion:
+                            samples = conversion.convert(signal.samples)
+                            if samples.dtype.kind not in "US":
+                                signal.samples = samples
+                else:
+                    for s_index, signal in enumerate(signals):
+                        if signal.conversion:
+                            if categorical_value2text:
+                                categorical = signal.conversion.convert_categorical(
+                                    signal.samples
+                                )
+                                if categorical is not None:
+                                    signal.samples, categories[s_index] = categorical
+                                    signal.conversion = None
+                                    continue
+
+                            signal.samples = signal.conversion.convert(signal.samples)
+
+            for s_index, sig in enumerate(signals):
+                sig = sig.validate(copy=False)
+
+                if len(sig) == 0:
+                    if empty_channels == "zeros":
+                        if categories.pop(s_index, None) is not None:
+                            # empty texts as for the value to text conversion
+                            sig.samples = sig.samples.astype("S1")
+                        sig.samples = np.zeros(
+                            len(master)
+                            if virtual_group.cycles_nr == 0
+                            else virtual_group.cycles_nr,
+                            dtype=sig.samples.dtype,
+                        )
+                        sig.timestamps = (
+                            master if virtual_group.cycles_nr == 0 else group_master
+                        )
+
+                signals[s_index] = sig
+
+            if use_interpolation:
+                same_master = exact = np.array_equal(master, group_master)
+                if same_masters is not None:
+                    same_master = same_masters.get(virtual_group_index, exact)
+                dtypes = [signal.samples.dtype for signal in signals]
+
+                if not exact and interpolate_outwards_with_nan:
+                    idx = np.argwhere(
+                        (master >= group_master[0]) & (master <= group_master[-1])
+                    ).flatten()
+
+                cycles = len(group_master)
+                plan = InterpolationPlan(group_master, master)
+
+                # the category codes always repeat the previous sample
+                signals = [
+                    signal.interp(
+                        master,
+                        0 if s_index in categories else self._integer_interpolation,
+                        plan=plan,
                     )
+                    if not (same_master and exact) or len(signal) != cycles
+                    else signal
+                    for s_index, signal in enumerate(signals)
+                ]
 
-                    # byte arrays
-                    if len(sig.samples.shape) > 1:
+                if same_master and not exact:
+                    # the window records include the previous and the next
+                    # records: the samples at the window timestamps are kept
+                    # in the dtype of the full master columns
+                    for signal, dtype in zip(signals, dtypes):
+                        if signal.samples.dtype != dtype:
+                            signal.samples = signal.samples.astype(dtype)
 
-                        if use_display_names:
-                            channel_name = sig.display_name or sig.name
-                        else:
-                            channel_name = sig.name
+                if not exact and interpolate_outwards_with_nan:
+                    for sig in signals:
+                        sig.timestamps = sig.timestamps[idx]
+                        sig.samples = sig.samples[idx]
 
-                        channel_name = used_names.get_unique_name(channel_name)
+                group_master = master
 
-                        df[channel_name] = pd.Series(
+            categories = {
+                id(signals[s_index]): labels for s_index, labels in categories.items()
+            }
+            signals = [sig for sig in signals if len(sig)]
+
+            if signals:
+                diffs = np.diff(group_master, prepend=-np.inf) > 0
+                if group_master is master:
+                    index = master_index
+                elif np.all(diffs):
+                    index = pd.Index(group_master, tupleize_cols=False)
+
+                else:
+                    idx = np.argwhere(diffs).flatten()
+                    group_master = group_master[idx]
+
+                    index = pd.Index(group_master, tupleize_cols=False)
+
+                    for sig in signals:
+                        sig.samples = sig.samples[idx]
+                        sig.timestamps = sig.timestamps[idx]
+
+            size = len(index) if signals else 0
+            for k, sig in enumerate(signals):
+                sig_index = (
+                    index
+                    if len(sig) == size
+                    else pd.Index(sig.timestamps, tupleize_cols=False)
+                )
+
+                # byte arrays
+                if len(sig.samples.shape) > 1:
+
+                    if use_display_names:
+                        channel_name = sig.display_name or sig.name
+                    else:
+                        channel_name = sig.name
+
+                    channel_name = used_names.get_unique_name(channel_name)
+
+                    columns[channel_name] = column_values(
+                        pd.Series(
                             list(sig.samples),
                             index=sig_index,
                         )
+                    )
 
-                    # arrays and structures
-                    elif sig.samples.dtype.names:
-                        for name, series in components(
-                            sig.samples,
-                            sig.name,
-                            used_names,
-                            master=sig_index,
-                            only_basenames=only_basenames,
-                        ):
-                            df[name] = series
+                # arrays and structures
+                elif sig.samples.dtype.names:
+                    for name, series in components(
+                        sig.samples,
+                        sig.name,
+                        used_names,
+                        master=sig_index,
+                        only_basenames=only_basenames,
+                    ):
+                        columns[name] = column_values(series)
 
-                    # scalars
+                # scalars
+                else:
+                    if use_display_names:
+                        channel_name = sig.display_name or sig.name
                     else:
-                        if use_display_names:
-                            channel_name = sig.display_name or sig.name
-                        else:
-                            channel_name = sig.name
+                        channel_name = sig.name
 
-                        channel_name = used_names.get_unique_name(channel_name)
+                    channel_name = used_names.get_unique_name(channel_name)
 
-                        if reduce_memory_usage and sig.samples.dtype.kind not in "SU":
-                            sig.samples = downcast(sig.samples)
-                        if sig.samples.dtype.kind == "S":
-                            df[channel_name] = pd.Series(
-                                            npchar.decode(sig.samples, "utf-8"), index=sig_index
-                                        )
+                    labels = categories.get(id(sig))
+                    if labels is not None:
+                        # only the labels are decoded
+                        values = pd.Categorical.from_codes(
+                            sig.samples, npchar.decode(labels, "utf-8")
+                        )
+                        if sig_index is master_index:
+                            columns[channel_name] = values
                         else:
-                            df[channel_name] = pd.Series(
-                                sig.samples, index=sig_index, fastpath=True
+                            columns[channel_name] = column_values(
+                                pd.Series(values, index=sig_index)
                             )
+                        continue
 
-                    # if sig.samples.dtype.kind == "S":
-                    #     try:
-                    #         df[channel_name] = pd.Series(
-                    #             npchar.decode(sig.samples, "utf-8"), index=sig_index
-                    #         )
-                    #     except:
-                    #         df[channel_name] = pd.Series(
-                    #             npchar.decode(sig.samples, "latin-1"), index=sig_index
-                    #         )
+                    if reduce_memory_usage and sig.samples.dtype.kind not in "SU":
+                        if downcast_integers or sig.samples.dtype.kind == "f":
+                            sig.samples = downcast(sig.samples)
+                    if sig.samples.dtype.kind == "S":
+                        columns[channel_name] = column_values(
+                            pd.Series(
+                                npchar.decode(sig.samples, "utf-8"), index=sig_index
+                            )
+                        )
+                    elif sig_index is master_index:
+                        columns[channel_name] = sig.samples
+                    else:
+                        columns[channel_name] = column_values(
+                            pd.Series(sig.samples, index=sig_index, fastpath=True)
+                        )
 
-                if self._callback:
-                    self._callback(group_index + 1, groups_nr)
+                # if sig.samples.dtype.kind == "S":
+                #     try:
+                #         df[channel_name] = pd.Series(
+                #             npchar.decode(sig.samples, "utf-8"), index=sig_index
+                #         )
+                #     except:
+                #         df[channel_name] = pd.Series(
+                #             npchar.decode(sig.samples, "latin-1"), index=sig_index
+                #         )
+
+            if self._callback:
+                self._callback(group_index + 1, groups_nr)
 
-            #yda 2021-01-20
-            # df = pd.DataFrame.from_dict(df)
-            # df.set_index(master, inplace=True)
-            # df.index.name = "timestamps"
+        df = pd.DataFrame(columns, index=master_index, copy=False)
+        del columns
+
+        return df
+
+    def _iter_dataframe_windows(
+        self,
+        master,
+        masters,
+        chunk_ram_size=200 * 1024 * 1024,
+        time_from_zero=False,
+        time_as_date=False,
+        record_ranges=None,
+        **kwargs,
+    ):
+        """generator that yields the *to_dataframe* result in consecutive time
+        windows of the common *master*. Only the records that cover the current
+        window are read from each virtual group, so the memory usage is given
+        by *chunk_ram_size* and not by the measurement length.
+
+        Parameters
+        ----------
+        master : np.array
+            common master returned by *_dataframe_master*
+        masters : dict
+            virtual groups masters returned by *_dataframe_master*
+        chunk_ram_size : int
+            desired window DataFrame RAM usage in bytes; default 200 MB
+        time_from_zero : bool
+            adjust time channel to start from 0 (the start of the first window)
+        time_as_date : bool
+            use the datetime timestamps for the index
+        record_ranges : dict | None
+            records of the virtual groups *masters* (see
+            *_time_window_ranges*); default *None* if the masters hold all the
+            records
+
+        The other keyword arguments are passed to *_dataframe_window*
+
+        """
+        channel_count = sum(len(gp.channels) - 1 for gp in self.groups) + 1
+        # approximation with all float64 dtype
+        chunk_count = max(chunk_ram_size // (channel_count * 8), 1)
+
+        size = len(master)
+        starts = np.arange(0, max(size, 1), chunk_count)
+
+        # the record ranges of all windows are computed upfront so that the
+        # group masters can be released before the data is read
+        ranges = {}
+        record_ranges = record_ranges or {}
+        # the interpolation is decided for the full master as in to_dataframe
+        same_masters = {
+            index: np.array_equal(master, group_master)
+            for index, group_master in masters.items()
+        }
+        if size:
+            first = master[starts]
+            last = master[np.minimum(starts + chunk_count, size) - 1]
+            for index, group_master in masters.items():
+                if not len(group_master):
+                    continue
+                # the previous and the next records are needed for interpolation
+                offsets = np.searchsorted(group_master, first) - 1
+                np.clip(offsets, 0, None, out=offsets)
+                stops = np.searchsorted(group_master, last)
+                np.clip(stops, 0, len(group_master) - 1, out=stops)
+                counts = stops - offsets + 1
+                if index in record_ranges:
+                    offsets += record_ranges[index]["record_offset"]
+                ranges[index] = offsets, counts
+        del masters
+
+        for i, start in enumerate(starts):
+            window = master[start : start + chunk_count]
+            record_ranges = {
+                index: {
+                    "record_offset": int(offsets[i]),
+                    "record_count": int(counts[i]),
+                }
+                for index, (offsets, counts) in ranges.items()
+            }
+
+            # the integer columns are not downcast: the smallest dtype of a
+            # window may not hold the values of the next windows
+            df = self._dataframe_window(
+                window,
+                record_ranges,
+                same_masters=same_masters,
+                downcast_integers=False,
+                **kwargs,
+            )
 
             if time_as_date:
                 new_index = np.array(df.index) + self.header.start_time.timestamp()
                 new_index = pd.to_datetime(new_index, unit="s")
 
                 df.set_index(new_index, inplace=True)
-            elif time_from_zero and len(master):
-                df.set_index(df.index - df.index[0], inplace=True)
-            print(f'{datetime.now() - start} {self.name}')
-            return df
+            elif time_from_zero and size:
+                df.set_index(df.index - master[0], inplace=True)
 
-        except:
-            raise MdfException(f'Export failed.\t{self.name}')
+            yield df
 
     def extract_bus_logging(
         self,
@@ -3800,8 +4860,6 @@ class MDF:
         >>> extracted = mdf.extract_bus_logging(database_files=database_files)
 
         """
-        self._link_attributes()
-
         if version is None:
             version = self.version
         else:
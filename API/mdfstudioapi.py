@@ -63,6 +63,11 @@ def cmd_line_parser():
     parser.add_argument("--from-zero", dest="from_zero", action="store_true", default=False)
     parser.add_argument("--empty-chn", dest="empty_chn", type=str, default="skip")
     parser.add_argument("--use-sname", dest="use_sname", action="store_true", default=False)
+    parser.add_argument("--float-precision", dest="float_precision", type=int)
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int)
+    parser.add_argument("--processes", dest="processes", type=int)
+    parser.add_argument("--memory-limit", dest="memory_limit", type=int)
+    parser.add_argument("--metadata-cache", dest="metadata_cache", action="store_true", default=False)
 
     return parser
 
@@ -781,7 +781,7 @@ class Signal(object):
 
         return result
 
-    def interp(self, new_timestamps, interpolation_mode=0):
+    def interp(self, new_timestamps, interpolation_mode=0, plan=None):
         """returns a new *Signal* interpolated using the *new_timestamps*
 
         Parameters
@@ -794,6 +794,12 @@ class Signal(object):
                 * 0 - repeat previous samples
                 * 1 - linear interpolation
 
+        plan : InterpolationPlan | None
+            precomputed resampling plan from the signal timestamps to the
+            *new_timestamps*; it is shared by the signals with the same
+            timestamps to avoid searching the timestamps for each signal.
+            Default *None*
+
         Returns
         -------
         signal : Signal
@@ -821,32 +827,24 @@ class Signal(object):
             )
         else:
 
-            if len(self.samples.shape) > 1:
-                idx = np.searchsorted(self.timestamps, new_timestamps, side="right")
-                idx -= 1
-                idx = np.clip(idx, 0, idx[-1])
-                s = self.samples[idx]
+            if plan is None or not plan.applies_to(self.timestamps, new_timestamps):
+                linear = None
+                plan = InterpolationPlan(self.timestamps, new_timestamps)
+            else:
+                linear = plan.linear
 
-                if self.invalidation_bits is not None:
-                    invalidation_bits = self.invalidation_bits[idx]
-                else:
-                    invalidation_bits = None
+            if len(self.samples.shape) > 1:
+                s = plan.hold(self.samples)
             else:
 
                 kind = self.samples.dtype.kind
 
                 if kind == "f":
-                    s = np.interp(new_timestamps, self.timestamps, self.samples)
-
-                    if self.invalidation_bits is not None:
-                        idx = np.searchsorted(
-                            self.timestamps, new_timestamps, side="right"
-                        )
-                        idx -= 1
-                        idx = np.clip(idx, 0, idx[-1])
-                        invalidation_bits = self.invalidation_bits[idx]
+                    if linear is None:
+                        s = np.interp(new_timestamps, self.timestamps, self.samples)
                     else:
-                        invalidation_bits = None
+                        s = linear(self.samples)
+
                 elif kind in "ui":
                     if interpolation_mode == 0:
                         if self.raw and self.conversion:
@@ -855,40 +853,20 @@ class Signal(object):
                                 interpolation_mode = 1
 
                     if interpolation_mode == 1:
-                        s = np.interp(
-                            new_timestamps, self.timestamps, self.samples
-                        ).astype(self.samples.dtype)
-                        if self.invalidation_bits is not None:
-                            idx = np.searchsorted(
-                                self.timestamps, new_timestamps, side="right"
-                            )
-                            idx -= 1
-                            idx = np.clip(idx, 0, idx[-1])
-                            invalidation_bits = self.invalidation_bits[idx]
+                        if linear is None:
+                            s = np.interp(new_timestamps, self.timestamps, self.samples)
                         else:
-                            invalidation_bits = None
+                            s = linear(self.samples)
+                        s = s.astype(self.samples.dtype)
                     else:
-                        idx = np.searchsorted(
-                            self.timestamps, new_timestamps, side="right"
-                        )
-                        idx -= 1
-                        idx = np.clip(idx, 0, idx[-1])
-                        s = self.samples[idx]
-
-                        if self.invalidation_bits is not None:
-                            invalidation_bits = self.invalidation_bits[idx]
-                        else:
-                            invalidation_bits = None
+                        s = plan.hold(self.samples)
                 else:
-                    idx = np.searchsorted(self.timestamps, new_timestamps, side="right")
-                    idx -= 1
-                    idx = np.clip(idx, 0, idx[-1])
-                    s = self.samples[idx]
+                    s = plan.hold(self.samples)
 
-                    if self.invalidation_bits is not None:
-                        invalidation_bits = self.invalidation_bits[idx]
-                    else:
-                        invalidation_bits = None
+            if self.invalidation_bits is not None:
+                invalidation_bits = plan.hold(self.invalidation_bits)
+            else:
+                invalidation_bits = None
 
             return Signal(
                 s,
@@ -1264,5 +1242,117 @@ class Signal(object):
         )
 
 
+class InterpolationPlan(object):
+    """
+    Resampling plan from a source master to a target master. The zero-order
+    hold indexes and the linear interpolation segments are computed only once
+    and can then be applied to all the signals that share the same source
+    timestamps (for example all the channels of a channel group).
+
+    Parameters
+    ----------
+    timestamps : numpy.array
+        source timestamps
+    new_timestamps : numpy.array
+        target timestamps
+
+    """
+
+    __slots__ = (
+        "timestamps",
+        "new_timestamps",
+        "_hold_indexes",
+        "_segments",
+    )
+
+    def __init__(self, timestamps, new_timestamps):
+        self.timestamps = timestamps
+        self.new_timestamps = new_timestamps
+        self._hold_indexes = None
+        self._segments = None
+
+    def applies_to(self, timestamps, new_timestamps):
+        """ check if the plan can be used to resample from *timestamps* to
+        *new_timestamps* """
+        for first, second in (
+            (self.timestamps, timestamps),
+            (self.new_timestamps, new_timestamps),
+        ):
+            if first is second:
+                continue
+            elif len(first) != len(second) or not np.array_equal(first, second):
+                return False
+        return True
+
+    @property
+    def hold_indexes(self):
+        """ indexes of the last source sample at or before each target
+        timestamp (first sample for the target timestamps before the source)"""
+        if self._hold_indexes is None:
+            idx = np.searchsorted(self.timestamps, self.new_timestamps, side="right")
+            idx -= 1
+            self._hold_indexes = np.clip(idx, 0, None)
+        return self._hold_indexes
+
+    def hold(self, samples):
+        """ resample by repeating the previous samples
+
+        Parameters
+        ----------
+        samples : numpy.array
+            samples aligned to the source timestamps
+
+        Returns
+        -------
+        samples : numpy.array
+            samples aligned to the target timestamps
+
+        """
+        return samples[self.hold_indexes]
+
+    def linear(self, samples):
+        """ resample using linear interpolation; the result is the same as
+        *numpy.interp* (float64 samples, clamped outside the source timestamps)
+
+        Parameters
+        ----------
+        samples : numpy.array
+            samples aligned to the source timestamps
+
+        Returns
+        -------
+        samples : numpy.array
+            float64 samples aligned to the target timestamps
+
+        """
+        samples = samples.astype(np.float64, copy=False)
+
+        # np.interp has special handling for the non-finite samples
+        if len(self.timestamps) < 2 or not np.all(np.isfinite(samples)):
+            return np.interp(self.new_timestamps, self.timestamps, samples)
+
+        if self._segments is None:
+            timestamps = self.timestamps
+            size = len(timestamps)
+
+            lower = np.searchsorted(timestamps, self.new_timestamps, side="right")
+            lower -= 1
+            inside = (lower >= 0) & (lower < size - 1)
+            inside &= self.new_timestamps != timestamps[np.clip(lower, 0, None)]
+
+            lower = np.clip(lower, 0, size - 1)
+            upper = np.where(inside, lower + 1, lower)
+
+            offset = np.where(inside, self.new_timestamps - timestamps[lower], 0.0)
+            span = np.where(inside, timestamps[upper] - timestamps[lower], 1.0)
+
+            self._segments = lower, upper, offset, span
+
+        lower, upper, offset, span = self._segments
+        start = samples[lower]
+
+        return (samples[upper] - start) / span * offset + start
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+throughput of the command line batch export: threaded path vs process pool
+
+    python benchmarks/bench_batch_export.py --files 16 --processes 4
+
+The same synthetic MF4 files are exported to CSV with both paths of
+*main.Main* and the files per second are reported.
+"""
+import argparse
+import os
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def run(files, out_dir, processes=None):
+    from API.main import Main
+    from API.mdfstudioapi import cmd_line_parser
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    args = ["export", *files, "--output-dir", str(out_dir), "--resample", "0.01"]
+    if processes:
+        args += ["--processes", str(processes)]
+
+    start = perf_counter()
+    Main(cmd_line_parser().parse_args(args))
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--cycles", type=int, default=20000)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # Main writes its log to %APPDATA%
+        os.environ.setdefault("APPDATA", str(tmp))
+
+        files = []
+        for i in range(args.files):
+            path = tmp / f"measurement_{i}.mf4"
+            synthetic_mf4(
+                path, args.cycles, args.channels // 2, groups=2, period=(0.01, 0.02)
+            )
+            files.append(str(path))
+
+        threaded = run(files, tmp / "threads")
+        processes = run(files, tmp / "processes", args.processes)
+
+    print(f"{args.files} files x {args.channels} channels x {args.cycles} cycles")
+    print(f"threads:               {threaded:.2f}s ({args.files / threaded:.2f} files/s)")
+    print(
+        f"processes ({args.processes:>2} workers): {processes:.2f}s "
+        f"({args.files / processes:.2f} files/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
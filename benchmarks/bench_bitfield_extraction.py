@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+extraction of bit packed channels: one pass for all the fields of a group
+(*extract_bit_fields* with all the specs) vs one pass per channel
+
+    python benchmarks/bench_bitfield_extraction.py --frames 8 --cycles 1000000
+
+The records hold *frames* CAN like 8 bytes payloads with packed signals of 1
+to 20 bits (Intel and Motorola, signed and unsigned) that cross the byte
+boundaries.
+"""
+import argparse
+from pathlib import Path
+import sys
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+
+def packed_specs(frames, rng):
+    specs = []
+    for frame in range(frames):
+        position = frame * 64
+        end = position + 64
+        while True:
+            bit_count = int(rng.integers(1, 21))
+            if position + bit_count > end:
+                break
+            byte_offset, bit_offset = divmod(position, 8)
+            specs.append(
+                (
+                    byte_offset,
+                    bit_offset,
+                    bit_count,
+                    bool(rng.integers(0, 2)),
+                    bool(rng.integers(0, 2)),
+                )
+            )
+            position += bit_count
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=8)
+    parser.add_argument("--cycles", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from API.blocks.bitfield_utils import extract_bit_fields
+
+    rng = np.random.default_rng(0)
+    record_size = args.frames * 8
+    data = rng.integers(0, 256, args.cycles * record_size, dtype=np.uint8).tobytes()
+    specs = packed_specs(args.frames, rng)
+
+    def per_channel():
+        return [extract_bit_fields(data, record_size, [spec])[0] for spec in specs]
+
+    def batch():
+        return extract_bit_fields(data, record_size, specs)
+
+    results = {}
+    for label, function in (("per channel", per_channel), ("batch", batch)):
+        times = []
+        for _ in range(args.repeat):
+            start = perf_counter()
+            values = function()
+            times.append(perf_counter() - start)
+        results[label] = min(times), values
+
+    assert all(
+        x.dtype == y.dtype and np.array_equal(x, y)
+        for x, y in zip(results["per channel"][1], results["batch"][1])
+    )
+
+    serial, batch_time = results["per channel"][0], results["batch"][0]
+    print(
+        f"{len(specs)} bit fields in {record_size} bytes records x {args.cycles} cycles"
+    )
+    print(f"per channel: {serial:.3f}s")
+    print(f"batch:       {batch_time:.3f}s ({serial / batch_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
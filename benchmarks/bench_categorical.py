@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+DataFrame of enum like channels (value to text conversions, as gear and
+status channels): the decoded text columns of *to_dataframe* vs the
+*categorical_value2text* columns (integer codes and the decoded labels)
+
+    python benchmarks/bench_categorical.py --cycles 2000000 --channels 10
+
+The time and the DataFrame memory of both options are reported and the
+columns are checked to have the same texts.
+"""
+import argparse
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def status_conversion(states):
+    """value to text conversion of the status channels"""
+    conversion = {}
+    for i in range(states):
+        conversion[f"val_{i}"] = i
+        conversion[f"text_{i}"] = f"State_{i}".encode("ascii")
+    conversion["default"] = b"unknown"
+    return conversion
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=2000000)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--states", type=int, default=8)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        # the raw value *states* has no text and gives the default
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels,
+            dtype="u1",
+            bounds=(0, args.states + 1),
+            conversion=status_conversion(args.states),
+            comment="status",
+        )
+        print(f"{args.channels} channels, {args.cycles} cycles")
+
+        results = {}
+        for categorical in (False, True):
+            with MDF(path) as mdf, redirect_stdout(io.StringIO()):
+                start = perf_counter()
+                df = mdf.to_dataframe(categorical_value2text=categorical)
+                elapsed = perf_counter() - start
+            memory = df.memory_usage(deep=True).sum() / 2 ** 20
+            results[categorical] = df
+            label = "categorical" if categorical else "text"
+            print(f"  {label:<11}: {elapsed:.3f}s, {memory:.1f} MB")
+
+        for name in results[False]:
+            assert results[False][name].equals(
+                results[True][name].astype(object)
+            ), f"{name} differs"
+
+
+if __name__ == "__main__":
+    main()
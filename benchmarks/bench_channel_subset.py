@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+DataFrame of a channels subset: the direct *to_dataframe(channels=...)* that
+selects the channels from the file vs the former round trip through an
+intermediate MDF (*filter(channels).to_dataframe()*)
+
+    python benchmarks/bench_channel_subset.py --channels 200 --compression 2
+
+The time of both paths is reported and the DataFrames are checked to be equal.
+"""
+import argparse
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--group-channels", type=int, default=50)
+    parser.add_argument("--cycles", type=int, default=100000)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--compression", type=int, default=0)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    rng = np.random.default_rng(1)
+    names = [
+        f"Channel_{group}_{i}"
+        for group in range(args.groups)
+        for i in range(args.group_channels)
+    ]
+    channels = list(rng.choice(names, args.channels, replace=False))
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.group_channels,
+            groups=args.groups,
+            period=(0.01, 0.02, 0.03),
+            compression=args.compression,
+        )
+        print(
+            f"{args.channels} of {len(names)} channels, {args.cycles} cycles, "
+            f"compression={args.compression}"
+        )
+
+        results = {}
+        for label in ("filter", "direct"):
+            with MDF(path) as mdf, redirect_stdout(io.StringIO()):
+                start = perf_counter()
+                if label == "filter":
+                    filtered = mdf.filter(channels)
+                    df = filtered.to_dataframe()
+                    filtered.close()
+                else:
+                    df = mdf.to_dataframe(channels=channels)
+                elapsed = perf_counter() - start
+            results[label] = df
+            print(f"  {label:<7}: {elapsed:.3f}s, {df.shape}")
+
+        pd.testing.assert_frame_equal(results["filter"], results["direct"])
+
+
+if __name__ == "__main__":
+    main()
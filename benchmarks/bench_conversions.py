@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+channel conversions of 8 and 16 bit integer raw samples: the first *convert*
+call builds the conversion arrays and the lookup table of the CC block, the
+next calls of the same conversion (as for the channels that share the CC
+block) use the cached table
+
+    python benchmarks/bench_conversions.py --samples 1000000 --dtypes u1 i2
+
+The float64 samples, that are always converted sample by sample, are given as
+reference.
+"""
+import argparse
+from pathlib import Path
+import sys
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+
+def conversions():
+    """conversion dicts accepted by *conversion_utils.from_dict*"""
+    rat = {"P1": 0.5, "P2": 2, "P3": 1, "P4": 0.1, "P5": 1, "P6": 3}
+    alg = {"formula": "X * 0.25 + sin(X)"}
+
+    tab = {}
+    for i, raw in enumerate(range(-1000, 1000, 20)):
+        tab[f"raw_{i}"] = raw
+        tab[f"phys_{i}"] = raw * 0.1 + i
+    tabi = dict(tab, interpolation=True)
+
+    rtab = {}
+    for i, lower in enumerate(range(-1000, 1000, 50)):
+        rtab[f"lower_{i}"] = lower
+        rtab[f"upper_{i}"] = lower + 40
+        rtab[f"phys_{i}"] = i * 1.5
+    rtab["default"] = -1.0
+
+    tabx = {}
+    for i in range(64):
+        tabx[f"val_{i}"] = i * 3
+        tabx[f"text_{i}"] = f"State_{i}".encode("ascii")
+    tabx["default"] = b"unknown"
+
+    return {
+        "RAT": rat,
+        "ALG": alg,
+        "TAB": tab,
+        "TABI": tabi,
+        "RTAB": rtab,
+        "TABX": tabx,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=1000000)
+    parser.add_argument(
+        "--dtypes", nargs="+", default=["u1", "i1", "u2", "i2", "f8"]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from API.blocks.conversion_utils import from_dict
+
+    rng = np.random.default_rng(0)
+    print(f"{args.samples} samples: first call / cached calls")
+
+    for name, conversion in conversions().items():
+        for dtype in args.dtypes:
+            dtype = np.dtype(dtype)
+            if dtype.kind == "f":
+                values = rng.uniform(-1000, 1000, args.samples)
+            else:
+                info = np.iinfo(dtype)
+                values = rng.integers(
+                    info.min, info.max, args.samples, endpoint=True
+                ).astype(dtype)
+
+            conv = from_dict(dict(conversion))
+
+            start = perf_counter()
+            conv.convert(values)
+            first = perf_counter() - start
+
+            cached = None
+            for _ in range(args.repeat):
+                start = perf_counter()
+                conv.convert(values)
+                elapsed = perf_counter() - start
+                cached = elapsed if cached is None else min(cached, elapsed)
+
+            print(f"  {name:<5} {dtype.name:<8}: {first:.4f}s / {cached:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
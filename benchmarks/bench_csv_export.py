@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+CSV export throughput: row by row csv.writer loop (previous MDF.export code)
+versus the columnar writer from API.blocks.csv_utils
+
+    python benchmarks/bench_csv_export.py --cycles 200000 --channels 50
+"""
+import argparse
+import csv
+import filecmp
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from API.blocks.csv_utils import write_csv
+from API.mdf import MDF
+from fixtures import synthetic_mf4
+
+
+def ecu_samples(rng, cycles, index):
+    if index % 3 == 0:
+        return rng.standard_normal(cycles)
+    elif index % 3 == 1:
+        # quantized physical values, typical for ECU signals
+        return np.round(rng.standard_normal(cycles) * 100) * 0.05
+    else:
+        return rng.integers(0, 255, cycles).astype("<u1")
+
+
+def csv_writer_rows(df, file_name):
+    with open(file_name, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow([df.index.name, *df.columns])
+        vals = [df.index.to_list(), *(df[name].to_list() for name in df)]
+        for row in zip(*vals):
+            writer.writerow(row)
+
+
+def columnar(df, file_name, float_precision=None):
+    write_csv(
+        file_name,
+        [df.index.name, *df.columns],
+        [df.index, *(df[name] for name in df)],
+        float_precision=float_precision,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=200000)
+    parser.add_argument("--channels", type=int, default=50)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        synthetic_mf4(
+            tmp / "synthetic.mf4",
+            args.cycles,
+            args.channels,
+            period=0.01,
+            samples=ecu_samples,
+        )
+
+        with MDF(tmp / "synthetic.mf4") as mdf:
+            df = mdf.to_dataframe()
+
+        cells = df.size + len(df)
+
+        runs = (
+            ("csv.writer rows", csv_writer_rows, tmp / "rows.csv"),
+            ("columnar", columnar, tmp / "columnar.csv"),
+            (
+                "columnar, 6 decimals",
+                lambda df, name: columnar(df, name, float_precision=6),
+                tmp / "precision.csv",
+            ),
+        )
+        for label, func, file_name in runs:
+            start = perf_counter()
+            func(df, file_name)
+            elapsed = perf_counter() - start
+            size = file_name.stat().st_size / 2 ** 20
+            print(
+                f"{label:<22} {elapsed:8.3f}s {cells / elapsed / 1e6:8.2f} Mcells/s "
+                f"{size / elapsed:8.2f} MB/s"
+            )
+
+        identical = filecmp.cmp(tmp / "rows.csv", tmp / "columnar.csv", shallow=False)
+        print(f"byte identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
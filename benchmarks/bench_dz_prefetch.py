@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+read time of a compressed MF4 file with and without the DZ block read ahead
+
+    python benchmarks/bench_dz_prefetch.py --channels 200 --cycles 200000
+
+The file is written with transposed deflate compression, so each group has
+many ##DZ blocks; all the channels are read with *MDF.to_dataframe* using
+*decompression_threads=0* (inflate in the calling thread) and the thread pool.
+"""
+import argparse
+import os
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def random_walk(rng, cycles, index):
+    # slowly varying signals compress like measured data
+    return np.cumsum(rng.standard_normal(cycles)).astype("<f4")
+
+
+def read_time(path, threads):
+    from API.mdf import MDF
+
+    start = perf_counter()
+    mdf = MDF(path, decompression_threads=threads)
+    df = mdf.to_dataframe()
+    elapsed = perf_counter() - start
+    mdf.close()
+    return elapsed, df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--cycles", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels // args.groups,
+            groups=args.groups,
+            samples=random_walk,
+            compression=2,
+        )
+
+        from API.mdf import MDF
+
+        with MDF(path) as mdf:
+            blocks = sum(len(group.data_blocks) for group in mdf.groups)
+
+        serial, expected = min(
+            (read_time(path, 0) for _ in range(args.repeat)), key=lambda x: x[0]
+        )
+        prefetch, result = min(
+            (read_time(path, args.threads) for _ in range(args.repeat)),
+            key=lambda x: x[0],
+        )
+        assert all(
+            np.array_equal(expected[name].values, result[name].values)
+            for name in expected
+        )
+
+    print(
+        f"{args.channels} channels x {args.cycles} cycles, {blocks} DZ blocks, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(f"calling thread:          {serial:.3f}s")
+    print(f"read ahead ({args.threads:>2} threads): {prefetch:.3f}s ({serial / prefetch:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+repeated MDF.get calls on a fragmented MF4 file; the per channel extraction
+plan is computed on the first call and reused for every fragment and for the
+following calls
+
+    python benchmarks/bench_extraction_plan.py --channels 200 --cycles 20000
+
+The file has integer channels of several sizes and byte orders; the read
+fragment size is reduced so that each group read is split in many fragments.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+DTYPES = ("<i1", "<u2", ">i2", "<i4", ">u4", "<f4", "<f8")
+
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=20000)
+    parser.add_argument("--fragment-size", type=int, default=16 * 2 ** 10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        synthetic_mf4(
+            path, args.cycles, args.channels, dtype=DTYPES, bounds=(-100, 100)
+        )
+
+        with MDF(path) as mdf:
+            mdf.configure(read_fragment_size=args.fragment_size)
+            times = []
+            for _ in range(args.repeat):
+                start = perf_counter()
+                for i in range(args.channels):
+                    mdf.get(f"Channel_{i}", raw=True)
+                times.append(perf_counter() - start)
+
+    print(
+        f"{args.channels} channels x {args.cycles} cycles, "
+        f"{args.fragment_size} bytes fragments"
+    )
+    print(f"first pass:      {times[0]:.3f}s")
+    print(f"following passes: {min(times[1:]):.3f}s (best of {args.repeat - 1})")
+
+
+if __name__ == "__main__":
+    main()
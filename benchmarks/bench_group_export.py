@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+groupby 'g' export of a measurement with many channel groups: the groups are
+loaded and written by *export_workers* threads (MDF._export_groups)
+
+    python benchmarks/bench_group_export.py --groups 50 --workers 1 4 --memory
+
+The export time is reported for each format and number of workers. With
+*--memory* a second export is traced with *tracemalloc* and the peak of the
+traced allocations (numpy arrays and DataFrames) is reported as well; the
+tracing makes that export several times slower. The speed up needs as many
+cores as workers; the peak memory is bounded by the number of workers.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import tracemalloc
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--cycles", type=int, default=10000)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--compression", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "measurement.mf4"
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels,
+            groups=args.groups,
+            period=(0.01, 0.02, 0.03, 0.04),
+            compression=args.compression,
+        )
+        print(
+            f"{args.groups} groups x {args.channels} channels x {args.cycles} "
+            f"cycles, compression={args.compression}"
+        )
+
+        for fmt in ("csv", "parquet"):
+            for workers in args.workers:
+                results = []
+                for traced in (False, True) if args.memory else (False,):
+                    out_dir = tmp / f"{fmt}_{workers}_{traced}" / "out"
+                    # groupby 'g' CSV goes to <filename parent>/[<raster>]
+                    (out_dir.parent / "[0.01]").mkdir(parents=True)
+
+                    with MDF(path) as mdf:
+                        if traced:
+                            tracemalloc.start()
+                        start = perf_counter()
+                        mdf.export(
+                            fmt,
+                            out_dir,
+                            groupby="g",
+                            raster=0.01,
+                            export_workers=workers,
+                        )
+                        if traced:
+                            peak = tracemalloc.get_traced_memory()[1]
+                            tracemalloc.stop()
+                            results.append(f"peak {peak / 2 ** 20:.1f} MB")
+                        else:
+                            results.append(f"{perf_counter() - start:.3f}s")
+
+                print(f"  {fmt:<8} export_workers={workers:<3}: {', '.join(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+opening of an unsorted version 3.30 file: the records of the channel groups
+are split by record ID in MDF3._sort (sort_utils.demultiplex_records) before
+any channel can be read
+
+    python benchmarks/bench_mdf3_unsorted.py --cycles 1000000 --record-ids 1 2
+
+The records have different sizes, unless *--same-size* is given (all the
+record starts are then known without scanning the record IDs). The open time
+and the time to read all the channels of the sorted groups are reported.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import unsort_mdf3
+
+
+def synthetic_mdf3(path, cycles, groups, same_size):
+    from API.mdf import MDF
+    from API.signals import Signal
+
+    rng = np.random.default_rng(0)
+    mdf = MDF(version="3.30")
+    for group in range(groups):
+        divider = group % 4 + 1
+        t = np.arange(cycles // divider, dtype="<f8") * 0.001 * divider
+        channels = 4 if same_size else group + 1
+        signals = [
+            Signal(rng.standard_normal(len(t)), t, name=f"Channel_{group}_{i}")
+            for i in range(channels)
+        ]
+        mdf.append(signals, comment=f"Group{group}")
+    mdf.save(path, overwrite=True)
+    mdf.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=1000000)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--record-ids", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--same-size", action="store_true")
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for record_id_nr in args.record_ids:
+            path = tmp / f"unsorted_{record_id_nr}.mdf"
+            synthetic_mdf3(path, args.cycles, args.groups, args.same_size)
+            unsort_mdf3(path, record_id_nr)
+
+            start = perf_counter()
+            with MDF(path) as mdf:
+                opened = perf_counter() - start
+                records = sum(group.channel_group.cycles_nr for group in mdf.groups)
+                start = perf_counter()
+                for index in range(len(mdf.groups)):
+                    mdf.get_group(index)
+                read = perf_counter() - start
+
+            print(
+                f"{records} records, {path.stat().st_size / 2 ** 20:.1f} MB, "
+                f"record IDs={record_id_nr}: open {opened:.3f}s, "
+                f"read all groups {read:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
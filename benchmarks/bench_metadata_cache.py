@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+cold vs warm MDF open time with the persistent metadata cache
+
+    python benchmarks/bench_metadata_cache.py --channels 20000 --groups 200
+
+The cold open parses the file and writes the cache entry, the warm opens
+restore the parsed structure from the cache entry.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def open_time(path, cache_dir, **kwargs):
+    from API.mdf import MDF
+
+    start = perf_counter()
+    mdf = MDF(path, metadata_cache=cache_dir, **kwargs)
+    elapsed = perf_counter() - start
+    mdf.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=20000)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "measurement.mf4"
+        # compressed data gives DL/DZ block lists to parse
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels // args.groups,
+            groups=args.groups,
+            dtype="<u2",
+            period=[0.01 * (group + 1) for group in range(10)],
+            compression=2,
+            conversion={"a": 0.1, "b": -10},
+            unit="rpm",
+            channel_comment=(
+                "<CNcomment><TX>channel {index} of group {group}</TX>"
+                "<names><display>Group{group}.Channel{index}</display></names>"
+                "</CNcomment>"
+            ),
+        )
+
+        # the XML comments are parsed for the display names
+        options = {"use_display_names": True}
+        no_cache = min(open_time(path, False, **options) for _ in range(args.repeat))
+        cold = open_time(path, tmp / "cache", **options)
+        warm = min(open_time(path, tmp / "cache", **options) for _ in range(args.repeat))
+
+    print(f"{args.channels} channels in {args.groups} groups")
+    print(f"no cache:   {no_cache:.3f}s")
+    print(f"cold open:  {cold:.3f}s (parse and write the cache entry)")
+    print(f"warm open:  {warm:.3f}s ({no_cache / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
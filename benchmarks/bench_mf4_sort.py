@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+sorting of an unsorted MDF4 data block (sort_data_block, used by MDF4._sort)
+with 1, 10 and 500 interleaved record IDs, as in the bus logging files with
+one channel group per message ID
+
+    python benchmarks/bench_mf4_sort.py --size 32 --ids 1 10 500
+
+The C extension (API/blocks/cutils.c) is used if it is built, else the Python
+fallback of mdf_v4; the implementation is printed first. The records have 8 to
+64 bytes; with *--vlsd* one of the record IDs holds VLSD records.
+"""
+import argparse
+from pathlib import Path
+import struct
+import sys
+from time import perf_counter
+from types import BuiltinFunctionType
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+
+def unsorted_block(size, ids, record_id_nr, vlsd):
+    """synthetic unsorted data of about *size* bytes
+
+    Returns
+    -------
+    data, cg_size, expected : bytes, dict, dict
+        *expected* is the number of bytes for each record ID
+
+    """
+    rng = np.random.default_rng(0)
+    id_format = {1: "<B", 2: "<H", 4: "<I", 8: "<Q"}[record_id_nr]
+    # sparse record IDs, as the CAN message IDs
+    rec_ids = [int(rec_id) for rec_id in (np.arange(ids) * 7 + 1)]
+    cg_size = {rec_id: int(rng.integers(8, 65)) for rec_id in rec_ids}
+    if vlsd:
+        cg_size[rec_ids[-1]] = 0
+
+    templates = {}
+    for rec_id, rec_size in cg_size.items():
+        prefix = struct.pack(id_format, rec_id)
+        if rec_size:
+            templates[rec_id] = prefix + bytes(rng.integers(0, 256, rec_size, "u1"))
+        else:
+            payload = b"VLSD" * 3
+            templates[rec_id] = prefix + struct.pack("<I", len(payload)) + payload
+
+    mean = np.mean([len(template) for template in templates.values()])
+    sequence = rng.choice(rec_ids, int(size / mean))
+    data = b"".join([templates[rec_id] for rec_id in sequence.tolist()])
+
+    expected = dict.fromkeys(cg_size, 0)
+    for rec_id, count in zip(*np.unique(sequence, return_counts=True)):
+        expected[int(rec_id)] = (len(templates[int(rec_id)]) - record_id_nr) * count
+
+    return data, cg_size, expected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32, help="block size in MB")
+    parser.add_argument("--ids", type=int, nargs="+", default=[1, 10, 500])
+    parser.add_argument("--record-id-size", type=int, default=2)
+    parser.add_argument("--vlsd", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from API.blocks import mdf_v4
+    from API.blocks.utils import UINT8_uf, UINT16_uf, UINT32_uf, UINT64_uf
+
+    unpack = {1: UINT8_uf, 2: UINT16_uf, 4: UINT32_uf, 8: UINT64_uf}[
+        args.record_id_size
+    ]
+    if isinstance(mdf_v4.sort_data_block, BuiltinFunctionType):
+        print("sort_data_block: C extension")
+    else:
+        print("sort_data_block: Python fallback")
+
+    for ids in args.ids:
+        data, cg_size, expected = unsorted_block(
+            args.size * 2 ** 20, ids, args.record_id_size, args.vlsd
+        )
+
+        best = None
+        for _ in range(args.repeat):
+            partial_records = {rec_id: [] for rec_id in cg_size}
+            start = perf_counter()
+            rem = mdf_v4.sort_data_block(
+                data, partial_records, cg_size, args.record_id_size, unpack
+            )
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        sizes = {
+            rec_id: sum(len(item) for item in items)
+            for rec_id, items in partial_records.items()
+        }
+        assert not rem and sizes == expected, "sorted records do not match"
+        objects = sum(len(items) for items in partial_records.values())
+
+        print(
+            f"  {ids:>4} record IDs: {best:.3f}s "
+            f"({len(data) / 2 ** 20 / best:.0f} MB/s), {objects} output objects"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+MDF.select on a large uncompressed MF4 file with and without the memory
+mapped reads of the DT blocks
+
+    python benchmarks/bench_mmap_select.py --channels 100 --cycles 1000000
+
+Each mode runs in a fresh process. The time, the peak RSS of the process
+(*ru_maxrss*, which also counts the resident page cache pages of the mapped
+file) and the peak of the heap allocations (*tracemalloc*, the private memory
+that holds the copies) are reported.
+"""
+import argparse
+import json
+from pathlib import Path
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def run(path, memory_map, channels):
+    import resource
+    from time import perf_counter
+    import tracemalloc
+
+    from API.mdf import MDF
+
+    def select():
+        with MDF(path, memory_map=memory_map) as mdf:
+            signals = mdf.select([f"Channel_{i}" for i in range(channels)])
+            return sum(float(signal.samples[-1]) for signal in signals)
+
+    start = perf_counter()
+    total = select()
+    elapsed = perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    tracemalloc.start()
+    select()
+    heap = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+
+    print(json.dumps({"time": elapsed, "rss": rss, "heap": heap, "total": total}))
+
+
+def measure(path, memory_map, channels):
+    output = subprocess.run(
+        [sys.executable, __file__, "--run", str(path), str(int(memory_map)), str(channels)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run(sys.argv[2], bool(int(sys.argv[3])), int(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--cycles", type=int, default=1000000)
+    parser.add_argument("--selected", type=int, default=10)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        synthetic_mf4(path, args.cycles, args.channels, dtype="<f4")
+
+        for selected in (args.selected, args.channels):
+            copy = measure(path, False, selected)
+            mapped = measure(path, True, selected)
+            assert copy["total"] == mapped["total"]
+
+            print(f"select {selected} of {args.channels} channels x {args.cycles} cycles")
+            for label, result in (("read + copy", copy), ("memory map ", mapped)):
+                print(
+                    f"  {label}: {result['time']:.3f}s, peak RSS {result['rss']:.1f} MB, "
+                    f"peak heap {result['heap']:.1f} MB"
+                )
+            print(f"  speedup {copy['time'] / mapped['time']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+single time base export of a synthetic measurement to CSV, Parquet and
+Feather (groupby 'f', one output file), with and without the streaming
+windows of *chunk_ram_size*
+
+    python benchmarks/bench_parquet_export.py --cycles 1000000 --channels 20
+
+The export time, the output size and the time needed to read the output back
+in a DataFrame are reported for each format.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def read_back(path):
+    if path.suffix == ".csv":
+        return pd.read_csv(path)
+    elif path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    else:
+        return pd.read_feather(path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=1000000)
+    parser.add_argument("--raster", type=float, default=0.001)
+    parser.add_argument("--chunk-ram-size", type=int, default=64 * 2 ** 20)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "measurement.mf4"
+        # the last channel is an integer counter
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels + 1,
+            dtype=["<f8"] * args.channels + ["<u2"],
+        )
+        print(
+            f"{args.channels + 1} channels x {args.cycles} cycles, "
+            f"raster={args.raster}"
+        )
+
+        for chunk_ram_size in (None, args.chunk_ram_size):
+            print(f"  chunk_ram_size={chunk_ram_size}")
+            for fmt in ("csv", "parquet", "feather"):
+                out_dir = tmp / f"{fmt}_{chunk_ram_size}"
+                if fmt == "csv":
+                    # groupby 'f' CSV goes to <filename parent>/[<raster>]
+                    output = tmp / f"[{args.raster}]" / f"{out_dir.name}.csv"
+                    output.parent.mkdir(exist_ok=True)
+                else:
+                    output = out_dir / path.stem / f"{args.raster}" / f"{path.stem}.{fmt}"
+                with MDF(path) as mdf:
+                    start = perf_counter()
+                    mdf.export(
+                        fmt,
+                        out_dir,
+                        single_time_base=True,
+                        raster=args.raster,
+                        groupby="f",
+                        chunk_ram_size=chunk_ram_size,
+                    )
+                    elapsed = perf_counter() - start
+
+                start = perf_counter()
+                read_back(output)
+                read_time = perf_counter() - start
+
+                print(
+                    f"    {fmt:<8}: export {elapsed:.3f}s, "
+                    f"{output.stat().st_size / 2 ** 20:.1f} MB, "
+                    f"read back {read_time:.3f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
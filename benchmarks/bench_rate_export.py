@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+export of a measurement with mixed sampling rates (1 ms groups, 1 ms groups
+with a time offset and 1 s groups): single time base export on the union of
+the masters (the default *to_dataframe* index) vs the sampling rate buckets
+of *groupby* 'r', one table per rate on its native grid
+
+    python benchmarks/bench_rate_export.py --cycles 1000000 --format parquet
+
+The export time and the total number of exported rows are reported.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def read_rows(files):
+    rows = 0
+    for file in files:
+        if file.suffix == ".csv":
+            rows += len(pd.read_csv(file, usecols=[0]))
+        else:
+            rows += len(pd.read_parquet(file, columns=["timestamps"]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=1000000)
+    parser.add_argument("--groups", type=int, default=6)
+    parser.add_argument("--format", default="parquet")
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "measurement.mf4"
+        # 1 ms, 1 ms shifted by half a raster and 1 s groups
+        synthetic_mf4(
+            path,
+            args.cycles,
+            5,
+            groups=args.groups,
+            period=(0.001, 0.001, 1.0),
+            offset=(0.0, 0.0005, 0.0),
+            same_duration=True,
+        )
+        print(
+            f"{args.groups} groups (1 ms, shifted 1 ms, 1 s) x 5 channels, "
+            f"{args.cycles * 0.001:.0f}s, {args.format}"
+        )
+
+        for label, kwargs in (
+            (
+                "single time base",
+                dict(single_time_base=True, groupby="f", raster=None),
+            ),
+            ("groupby='r'", dict(groupby="r")),
+        ):
+            out_dir = tmp / label.replace(" ", "_").replace("'", "")
+            # groupby 'f' CSV goes to <filename parent>/[<raster>]
+            (out_dir / "[None]").mkdir(parents=True)
+            with MDF(path) as mdf:
+                start = perf_counter()
+                mdf.export(args.format, out_dir / "out", **kwargs)
+                elapsed = perf_counter() - start
+
+            files = sorted(out_dir.rglob(f"*.{args.format}"))
+            print(
+                f"  {label:<17}: {elapsed:.3f}s, {len(files)} files, "
+                f"{read_rows(files)} rows"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+MDF.select of a few channels of a wide group with and without the selective
+reads of the requested byte ranges
+
+    python benchmarks/bench_selective_read.py --channels 20000 --cycles 2000
+
+The time and the bytes read from the data blocks (*read_statistics*) are
+reported for the memory mapped and the regular file reads. Where
+*posix_fadvise* is available the file pages are dropped from the page cache
+before each run.
+"""
+import argparse
+import os
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def drop_page_cache(path):
+    if hasattr(os, "posix_fadvise"):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def run(path, names, memory_map, selective_read, repeat):
+    from API.mdf import MDF
+
+    times = []
+    for _ in range(repeat):
+        drop_page_cache(path)
+        start = perf_counter()
+        with MDF(path, memory_map=memory_map, selective_read=selective_read) as mdf:
+            mdf.select(names)
+            statistics = mdf.read_statistics()
+        times.append(perf_counter() - start)
+    return min(times), statistics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=20000)
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--selected", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        synthetic_mf4(path, args.cycles, args.channels, period=0.01)
+
+        step = args.channels // args.selected
+        names = [f"Channel_{i * step}" for i in range(args.selected)]
+
+        print(
+            f"select {args.selected} of {args.channels} channels x {args.cycles} cycles "
+            f"({args.channels * 8} bytes records)"
+        )
+        for memory_map in (True, False):
+            for selective_read in (False, True):
+                elapsed, statistics = run(
+                    path, names, memory_map, selective_read, args.repeat
+                )
+                print(
+                    f"  memory_map={memory_map!s:<5} selective_read={selective_read!s:<5}: "
+                    f"{elapsed:.3f}s, {statistics['bytes_read'] / 2 ** 20:.1f} MB read "
+                    f"({statistics['ratio']:.1%} of the file)"
+                )
+
+
+if __name__ == "__main__":
+    main()
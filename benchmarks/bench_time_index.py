@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+random time access on a compressed measurement: MDF.select of short time
+windows at random positions. The first record of the probed data blocks is
+kept in the group sparse time index, so after the first windows each lookup
+only inflates the blocks of the window itself
+
+    python benchmarks/bench_time_index.py --cycles 2000000 --windows 50
+
+The time and the bytes read from the data blocks (*read_statistics*) are
+reported for the first window, for the following windows, and for a second
+open of the file that restores the time index from the metadata cache.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def lookups(mdf, names, starts, window):
+    times = []
+    bytes_read = []
+    for start in starts:
+        before = mdf.read_statistics()["bytes_read"]
+        timer = perf_counter()
+        mdf.select(names, start=start, stop=start + window)
+        times.append(perf_counter() - timer)
+        bytes_read.append(mdf.read_statistics()["bytes_read"] - before)
+    return times, bytes_read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=2000000)
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--windows", type=int, default=50)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    rng = np.random.default_rng(1)
+    duration = args.cycles * 0.001
+    starts = rng.uniform(0, duration - args.window, args.windows)
+    names = [f"Channel_{i}" for i in range(args.channels)]
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "measurement.mf4"
+        cache = Path(tmp) / "cache"
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels,
+            compression=2,
+            write_fragment_size=4 * 2 ** 20,
+        )
+
+        with MDF(path, metadata_cache=cache) as mdf:
+            blocks = len(mdf.groups[0].data_blocks)
+            times, bytes_read = lookups(mdf, names, starts, args.window)
+
+        with MDF(path, metadata_cache=cache) as mdf:
+            cached_times, cached_bytes_read = lookups(mdf, names, starts, args.window)
+
+    print(
+        f"{args.window}s windows of {args.channels} channels x {args.cycles} cycles "
+        f"({blocks} compressed blocks)"
+    )
+    print(
+        f"  first window:           {times[0] * 1000:.1f}ms, "
+        f"{bytes_read[0] / 2 ** 20:.1f} MB read"
+    )
+    print(
+        f"  next windows (median):  {np.median(times[1:]) * 1000:.1f}ms, "
+        f"{np.median(bytes_read[1:]) / 2 ** 20:.1f} MB read"
+    )
+    print(
+        f"  cached index (median):  {np.median(cached_times) * 1000:.1f}ms, "
+        f"{np.median(cached_bytes_read) / 2 ** 20:.1f} MB read"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+time window reads: MDF.select and MDF.to_dataframe of a short window of a
+long measurement with the *start* and *stop* arguments vs the full read
+followed by the window mask
+
+    python benchmarks/bench_time_window.py --cycles 2000000 --window 10
+
+The time and the bytes read from the data blocks (*read_statistics*) are
+reported for the uncompressed and the compressed (transposed deflate) file.
+"""
+import argparse
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def run(path, function, repeat):
+    from API.mdf import MDF
+
+    times = []
+    for _ in range(repeat):
+        with MDF(path) as mdf:
+            start = perf_counter()
+            result = function(mdf)
+            times.append(perf_counter() - start)
+            statistics = mdf.read_statistics()
+    return min(times), statistics, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=2000000)
+    parser.add_argument("--window", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = [f"Channel_{i}" for i in range(args.channels)]
+    # window in the middle of the measurement (1 ms raster)
+    start = args.cycles * 0.001 / 2
+    stop = start + args.window
+
+    def select_full(mdf):
+        signals = mdf.select(names)
+        for sig in signals:
+            mask = (sig.timestamps >= start) & (sig.timestamps <= stop)
+            sig.timestamps, sig.samples = sig.timestamps[mask], sig.samples[mask]
+        return signals
+
+    def select_window(mdf):
+        return mdf.select(names, start=start, stop=stop)
+
+    def dataframe_full(mdf):
+        df = mdf.to_dataframe(reduce_memory_usage=False)
+        return df[(df.index >= start) & (df.index <= stop)]
+
+    def dataframe_window(mdf):
+        return mdf.to_dataframe(reduce_memory_usage=False, start=start, stop=stop)
+
+    with TemporaryDirectory() as tmp:
+        print(
+            f"{args.window}s window of {args.channels} channels x {args.cycles} "
+            f"cycles ({args.cycles * 0.001:.0f}s)"
+        )
+        for compression in (0, 2):
+            path = Path(tmp) / f"measurement_{compression}.mf4"
+            synthetic_mf4(
+                path,
+                args.cycles,
+                args.channels,
+                compression=compression,
+                write_fragment_size=4 * 2 ** 20,
+            )
+            print(f"  compression={compression}")
+
+            for label, full, window in (
+                ("select", select_full, select_window),
+                ("to_dataframe", dataframe_full, dataframe_window),
+            ):
+                results = []
+                for mode, function in (("full + mask", full), ("start/stop", window)):
+                    elapsed, statistics, result = run(path, function, args.repeat)
+                    results.append(result)
+                    print(
+                        f"    {label:<12} {mode:<11}: {elapsed:.3f}s, "
+                        f"{statistics['bytes_read'] / 2 ** 20:.1f} MB read"
+                    )
+
+                if label == "select":
+                    assert all(
+                        np.array_equal(x.timestamps, y.timestamps)
+                        and np.array_equal(x.samples, y.samples)
+                        for x, y in zip(*results)
+                    )
+                else:
+                    assert results[0].equals(results[1])
+
+
+if __name__ == "__main__":
+    main()
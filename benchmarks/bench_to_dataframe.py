@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+MDF.to_dataframe wall time and peak RSS on a wide synthetic MF4
+
+    python benchmarks/bench_to_dataframe.py --channels 5000 --cycles 2000
+
+The measurement runs in a child process so that the reported peak RSS
+(ru_maxrss) only covers opening the file and building the DataFrame.
+"""
+import argparse
+from pathlib import Path
+import resource
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def measure(path, raster):
+    from API.mdf import MDF
+
+    start = perf_counter()
+    with MDF(path) as mdf:
+        df = mdf.to_dataframe(raster=raster)
+    elapsed = perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{df.shape[1]} columns x {df.shape[0]} rows: {elapsed:.3f}s, peak RSS {peak:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--raster", type=float, default=None)
+    parser.add_argument("--measure", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.raster)
+        return
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wide.mf4"
+        # slightly different rasters so that the group masters must be merged
+        synthetic_mf4(
+            path,
+            args.cycles,
+            args.channels // args.groups,
+            groups=args.groups,
+            dtype=("<f8", "<u2"),
+            period=[0.01 * (group + 1) for group in range(args.groups)],
+        )
+        cmd = [sys.executable, __file__, "--measure", str(path)]
+        if args.raster:
+            cmd += ["--raster", str(args.raster)]
+        subprocess.run(cmd, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+open time of an unfinalized MF4 file: overlay finalization vs finalized copy
+
+    python benchmarks/bench_unfinalized_open.py --channels 100 --cycles 1000000
+
+A synthetic file is written and marked as unfinalized (last DT block length
+not updated), then it is opened with *overlay_finalization* enabled and
+disabled (copy of the file to the temporary folder and finalization of the
+copy).
+"""
+import argparse
+import os
+from pathlib import Path
+import struct
+import sys
+from tempfile import gettempdir, TemporaryDirectory
+from time import perf_counter
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def unfinalize(path):
+    """reset the length of the last DT block of each group like a logger that
+    was stopped before finalizing the file"""
+    with open(path, "r+b") as stream:
+        def read(address, fmt):
+            stream.seek(address)
+            return struct.unpack(fmt, stream.read(struct.calcsize(fmt)))
+
+        dg_addr = read(0x40 + 24, "<Q")[0]
+        while dg_addr:
+            data_addr = read(dg_addr + 40, "<Q")[0]
+            block_id = read(data_addr, "<4s")[0]
+            if block_id == b"##DL":
+                links_nr = read(data_addr + 16, "<Q")[0]
+                data_addr = read(data_addr + 24, f"<{links_nr}Q")[-1]
+            stream.seek(data_addr + 8)
+            stream.write(struct.pack("<Q", 24))
+            dg_addr = read(dg_addr + 24, "<Q")[0]
+
+        stream.seek(0)
+        stream.write(b"UnFinMF ")
+        stream.seek(60)
+        stream.write(struct.pack("<H", 0x4))
+
+
+def open_time(path, overlay):
+    from API.mdf import MDF
+
+    start = perf_counter()
+    mdf = MDF(path, overlay_finalization=overlay)
+    elapsed = perf_counter() - start
+    copy = Path(gettempdir()) / path.name
+    mdf.close()
+    if not overlay and copy.exists():
+        os.remove(copy)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--cycles", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "unfinalized.mf4"
+        synthetic_mf4(path, args.cycles, args.channels, dtype="<f4")
+        unfinalize(path)
+        size = path.stat().st_size / 2 ** 20
+
+        copy = open_time(path, False)
+        overlay = open_time(path, True)
+
+    print(f"{size:.0f} MB unfinalized file")
+    print(f"finalized copy: {copy:.3f}s ({size:.0f} MB written to the temporary folder)")
+    print(f"overlay:        {overlay:.3f}s ({copy / overlay:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+regression check of the streaming Parquet and Feather export: the single time
+base export with *chunk_ram_size* is written in several row groups or record
+batches and must give the same columns as the normal export
+
+    python benchmarks/check_arrow_windows.py --cycles 20000 --chunk-ram-size 4000
+
+The float32 channels are on the common master (not interpolated) and the
+integer ramps exceed the uint8 and uint16 ranges after the first window.
+With *reduce_memory_usage* the streaming export keeps the integer dtypes of
+the samples instead of the smallest dtype of the values.
+"""
+import argparse
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from fixtures import synthetic_mf4
+
+
+def samples(rng, cycles, index):
+    if index < 3:
+        return rng.standard_normal(cycles).astype("<f4")
+    else:
+        # ramps of 1 and 30 steps
+        return np.arange(cycles, dtype="<u4") * (1 if index == 3 else 30)
+
+
+def chunks(path, fmt):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if fmt == "parquet":
+        return pq.ParquetFile(path).num_row_groups
+    else:
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).num_record_batches
+
+
+def export(mdf_path, output, fmt, **kwargs):
+    from API.mdf import MDF
+
+    with MDF(mdf_path) as mdf, redirect_stdout(io.StringIO()):
+        mdf.export(
+            fmt, output, single_time_base=True, raster=None, groupby="f", **kwargs
+        )
+    return next(output.parent.rglob(f"*.{fmt}"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=20000)
+    parser.add_argument("--chunk-ram-size", type=int, default=4000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "measurement.mf4"
+        synthetic_mf4(path, args.cycles, 5, period=0.01, samples=samples)
+
+        for fmt in ("parquet", "feather"):
+            read = pd.read_parquet if fmt == "parquet" else pd.read_feather
+            for reduce_memory_usage in (False, True):
+                label = f"{fmt}_{int(reduce_memory_usage)}"
+                normal = export(
+                    path,
+                    tmp / label / "normal" / "measurement",
+                    fmt,
+                    reduce_memory_usage=reduce_memory_usage,
+                )
+                streamed = export(
+                    path,
+                    tmp / label / "streamed" / "measurement",
+                    fmt,
+                    reduce_memory_usage=reduce_memory_usage,
+                    chunk_ram_size=args.chunk_ram_size,
+                )
+
+                count = chunks(streamed, fmt)
+                assert count > 1, f"{label}: a single chunk was written"
+
+                expected, df = read(normal), read(streamed)
+                assert list(df.columns) == list(expected.columns), label
+                assert len(df) == len(expected), f"{label}: {len(df)} rows"
+                for name in expected:
+                    dtype, expected_dtype = df[name].dtype, expected[name].dtype
+                    if reduce_memory_usage and expected_dtype.kind in "ui":
+                        assert np.can_cast(expected_dtype, dtype), (
+                            f"{label} {name}: {dtype} for {expected_dtype}"
+                        )
+                    else:
+                        assert dtype == expected_dtype, (
+                            f"{label} {name}: {dtype} for {expected_dtype}"
+                        )
+                    assert np.array_equal(
+                        df[name].to_numpy(), expected[name].to_numpy()
+                    ), f"{label} {name}: values differ"
+
+                print(
+                    f"  {fmt:<8} reduce_memory_usage={reduce_memory_usage!s:<5}: "
+                    f"{count} chunks ok"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+regression check of *MDF.cut* for a channel group saved in several DT blocks:
+the cut is done with the memory mapped and the read data path, with the
+default and with small read fragments, and the channels are compared with the
+cut of the appended signals
+
+    python benchmarks/check_cut.py --cycles 6000 --blocks 3
+
+"""
+import argparse
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+CHANNELS = 3
+
+
+def multi_block_mf4(path, cycles, blocks):
+    """write a float32 channel group appended in *blocks* parts, each saved in
+    its own DT block
+
+    Returns
+    -------
+    signals : list
+        the appended signals
+
+    """
+    from API.mdf import MDF
+    from API.signals import Signal
+
+    t = np.arange(cycles, dtype="<f8") * 0.01
+    signals = [
+        Signal(np.sin(t + i).astype("<f4"), t, name=f"Channel_{i}")
+        for i in range(CHANNELS)
+    ]
+
+    parts = np.array_split(np.arange(cycles), blocks)
+    mdf = MDF(version="4.10")
+    first = parts[0]
+    mdf.append(
+        [
+            Signal(sig.samples[first], t[first], name=sig.name)
+            for sig in signals
+        ],
+        comment="multi block",
+    )
+    for part in parts[1:]:
+        mdf.extend(
+            0, [(t[part], None)] + [(sig.samples[part], None) for sig in signals]
+        )
+
+    # the DT blocks are written with the records of a single part
+    record_size = 8 + 4 * CHANNELS
+    mdf.configure(write_fragment_size=len(parts[0]) * record_size)
+    mdf.save(path, overwrite=True)
+    mdf.close()
+
+    return signals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=6000)
+    parser.add_argument("--blocks", type=int, default=3)
+    args = parser.parse_args()
+
+    from API.mdf import MDF
+
+    duration = (args.cycles - 1) * 0.01
+    cuts = (
+        {"start": duration * 0.05},
+        {"stop": duration * 0.95},
+        {"start": duration * 0.2, "stop": duration * 0.75},
+    )
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "multi_block.mf4"
+        signals = multi_block_mf4(path, args.cycles, args.blocks)
+
+        with MDF(path) as mdf:
+            blocks = len(mdf.groups[0].data_blocks)
+        print(f"{args.cycles} cycles in {blocks} DT blocks")
+        assert blocks == args.blocks, "the channel group is not split in DT blocks"
+
+        for memory_map in (True, False):
+            for fragment_size in (None, 7000):
+                for kwargs in cuts:
+                    with MDF(path, memory_map=memory_map) as mdf, redirect_stdout(
+                        io.StringIO()
+                    ):
+                        if fragment_size:
+                            mdf.configure(read_fragment_size=fragment_size)
+                        out = mdf.cut(**kwargs)
+                        for sig in signals:
+                            expected = sig.cut(**kwargs)
+                            cut = out.get(sig.name)
+                            # the interpolated ends are float64: the fragments
+                            # keep the float32 dtype of the channel
+                            assert cut.samples.dtype == sig.samples.dtype, (
+                                f"{sig.name} {kwargs}: dtype {cut.samples.dtype}"
+                            )
+                            assert np.array_equal(
+                                cut.timestamps, expected.timestamps
+                            ), f"{sig.name} {kwargs}: timestamps differ"
+                            assert np.allclose(
+                                cut.samples, expected.samples, rtol=0, atol=1e-6
+                            ), f"{sig.name} {kwargs}: samples differ"
+                        out.close()
+
+                    print(
+                        f"  memory_map={memory_map!s:<5} "
+                        f"read_fragment_size={fragment_size}: {kwargs} ok"
+                    )
+
+
+if __name__ == "__main__":
+    main()
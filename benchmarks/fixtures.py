@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+synthetic measurement files for the benchmark suite (benchmarks/suite.py),
+written with MDF.append. The files are reproducible: the same shape, version
+and scale always give the same samples.
+
+    python benchmarks/fixtures.py --output fixtures --scale 0.1
+
+Shapes
+------
+* many_small_groups : 200 groups of 5 channels at 1 to 100 ms
+* few_wide_groups : 2 groups of 500 channels
+* compressed : 5 groups of 20 channels saved with transposed deflate (DZ)
+  blocks (version 4 only)
+* bit_packed : 1 to 12 bits integer channels packed in the records
+  (version 4 only)
+* vlsd_strings : variable length string channels (fixed length strings for
+  version 3)
+* can_logging : CAN bus logging group (CAN_DataFrame) for
+  *extract_bus_logging*; *can_database* builds the matching database
+  (version 4 only)
+* unsorted_groups : 10 channel groups with different record sizes and
+  sampling rates in a single unsorted data group (version 3 only, see
+  *unsort_mdf3*)
+
+The benchmark scripts write their own measurement with *synthetic_mf4*.
+"""
+import argparse
+from pathlib import Path
+import struct
+import sys
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+VERSIONS = ("4.10", "3.30")
+
+CAN_MESSAGES = 10
+CAN_SIGNALS = 4
+
+
+def _signals(rng, t, prefix, count):
+    from API.signals import Signal
+
+    return [
+        Signal(rng.standard_normal(len(t)), t, name=f"{prefix}_{i}", unit="V")
+        for i in range(count)
+    ]
+
+
+def many_small_groups(mdf, rng, scale):
+    cycles = max(int(2000 * scale), 10)
+    for group in range(200):
+        period = (0.001, 0.01, 0.1)[group % 3]
+        t = np.arange(cycles, dtype="<f8") * period
+        mdf.append(_signals(rng, t, f"Small_{group}", 5), comment=f"Small{group}")
+
+
+def few_wide_groups(mdf, rng, scale):
+    cycles = max(int(20000 * scale), 10)
+    for group in range(2):
+        t = np.arange(cycles, dtype="<f8") * 0.01 * (group + 1)
+        mdf.append(_signals(rng, t, f"Wide_{group}", 500), comment=f"Wide{group}")
+
+
+def compressed(mdf, rng, scale):
+    from API.signals import Signal
+
+    cycles = max(int(200000 * scale), 10)
+    for group in range(5):
+        t = np.arange(cycles, dtype="<f8") * 0.001 * (group + 1)
+        signals = _signals(rng, t, f"Packed_{group}", 10)
+        # slow integer ramps compress well, as measured signals do
+        for i in range(10):
+            signals.append(
+                Signal(
+                    (np.arange(cycles) // (i + 1) % 4096).astype("<u2"),
+                    t,
+                    name=f"Counter_{group}_{i}",
+                )
+            )
+        mdf.append(signals, comment=f"Compressed{group}")
+
+
+def bit_packed(mdf, rng, scale):
+    from API.blocks.utils import get_fmt_v4
+    from API.signals import Signal
+
+    cycles = max(int(500000 * scale), 10)
+    t = np.arange(cycles, dtype="<f8") * 0.001
+    bit_counts = [1, 3, 5, 7, 9, 12, 2, 4, 6, 8, 10, 11] * 3
+
+    signals = [
+        Signal(
+            rng.integers(0, 2 ** bit_count, cycles).astype("<u2"),
+            t,
+            name=f"Bits_{i}",
+        )
+        for i, bit_count in enumerate(bit_counts)
+    ]
+    index = mdf.append(signals, comment="BitPacked")
+
+    # MDF.append writes byte aligned channels: the channel descriptions are
+    # moved to consecutive bit positions before the file is saved, so the
+    # read values are the record bits at those positions (not the appended
+    # samples), which is enough for the timing of the bit extraction
+    group = mdf.groups[index]
+    channels = [ch for ch in group.channels if ch.name.startswith("Bits_")]
+    position = min(ch.byte_offset for ch in channels) * 8
+    for ch, bit_count in zip(channels, bit_counts):
+        ch.byte_offset, ch.bit_offset = divmod(position, 8)
+        ch.bit_count = bit_count
+        ch.dtype_fmt = np.dtype(
+            get_fmt_v4(ch.data_type, ch.bit_offset + ch.bit_count, ch.channel_type)
+        )
+        position += bit_count
+    group.parents = None
+    group.types = None
+
+
+def vlsd_strings(mdf, rng, scale):
+    from API.signals import Signal
+
+    cycles = max(int(100000 * scale), 10)
+    t = np.arange(cycles, dtype="<f8") * 0.01
+    words = np.array(
+        [b"OFF", b"ON", b"STANDBY", b"ERROR_OVERTEMPERATURE", b"INIT", b"RUN"]
+    )
+    signals = [
+        Signal(
+            words[rng.integers(0, len(words), cycles)],
+            t,
+            name=f"State_{i}",
+            encoding="utf-8",
+        )
+        for i in range(3)
+    ]
+    signals.extend(_signals(rng, t, "Value", 2))
+    mdf.append(signals, comment="Strings")
+
+
+def can_logging(mdf, rng, scale):
+    from API.blocks.source_utils import Source
+    from API.signals import Signal
+
+    frames = max(int(500000 * scale), 10)
+    t = np.cumsum(rng.uniform(0.0001, 0.0009, frames))
+    samples = np.zeros(
+        frames,
+        dtype=[
+            ("CAN_DataFrame.BusChannel", "u1"),
+            ("CAN_DataFrame.ID", "<u4"),
+            ("CAN_DataFrame.DLC", "u1"),
+            ("CAN_DataFrame.DataBytes", "u1", (8,)),
+        ],
+    )
+    samples["CAN_DataFrame.BusChannel"] = 1
+    samples["CAN_DataFrame.ID"] = 0x100 + rng.integers(0, CAN_MESSAGES, frames)
+    samples["CAN_DataFrame.DLC"] = 8
+    samples["CAN_DataFrame.DataBytes"] = rng.integers(0, 256, (frames, 8))
+
+    source = Source("CAN1", "CAN1", "", Source.SOURCE_BUS, Source.BUS_TYPE_CAN)
+    mdf.append(
+        [Signal(samples, t, name="CAN_DataFrame", source=source)],
+        acq_name="CAN1",
+        comment="CAN bus logging",
+    )
+
+
+def unsorted_groups(mdf, rng, scale):
+    cycles = max(int(200000 * scale), 10)
+    for group in range(10):
+        period = 0.001 * (group % 4 + 1)
+        t = np.arange(cycles // (group % 4 + 1), dtype="<f8") * period
+        mdf.append(
+            _signals(rng, t, f"Unsorted_{group}", group + 1),
+            comment=f"Unsorted{group}",
+        )
+
+
+def unsort_mdf3(path, record_id_nr=1):
+    """rewrite the version 3 file *path* written by *MDF.save* (one sorted
+    data group for each channel group) with a single unsorted data group: the
+    records of all the channel groups are interleaved in timestamp order and
+    each one is preceded (and followed if *record_id_nr* is 2) by the one
+    byte record ID of its channel group
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        MDF version 3 file
+    record_id_nr : int
+        number of record IDs: 1 or 2
+
+    """
+    from API.mdf import MDF
+
+    with MDF(path) as mdf:
+        blocks = []
+        times = []
+        records = []
+        for index, group in enumerate(mdf.groups):
+            size = group.channel_group.samples_byte_nr
+            data = []
+            for info in group.data_blocks:
+                mdf._file.seek(info.address)
+                data.append(mdf._file.read(info.size))
+            data = b"".join(data)
+            blocks.append(
+                (group.data_group.address, group.channel_group.address, size)
+            )
+            times.append(mdf.get_master(index))
+            records.append(np.frombuffer(data, dtype="u1").reshape(-1, size))
+
+    # record ID 0 is kept for the sorted groups
+    ids = np.concatenate(
+        [np.full(len(t), index + 1, dtype="u1") for index, t in enumerate(times)]
+    )
+    order = np.argsort(np.concatenate(times), kind="stable")
+    ids = ids[order]
+
+    steps = np.array([0] + [size + record_id_nr for *_, size in blocks])
+    starts = np.zeros(len(ids), dtype="i8")
+    np.cumsum(steps[ids][:-1], out=starts[1:])
+    total = int(starts[-1] + steps[ids[-1]]) if len(ids) else 0
+
+    unsorted = np.zeros(total, dtype="u1")
+    unsorted[starts] = ids
+    for index, (*_, size) in enumerate(blocks):
+        positions = starts[ids == index + 1] + 1
+        windows = np.lib.stride_tricks.as_strided(
+            unsorted, shape=(total - size + 1, size), strides=(1, 1)
+        )
+        windows[positions] = records[index]
+        if record_id_nr == 2:
+            unsorted[positions + size] = index + 1
+
+    with open(path, "r+b") as f:
+        f.seek(0, 2)
+        data_address = f.tell()
+        f.write(unsorted.tobytes())
+
+        # HD: a single data group
+        f.seek(64 + 16)
+        f.write(struct.pack("<H", 1))
+
+        # first DG: next DG, data block, channel groups number and record IDs
+        dg_address = blocks[0][0]
+        f.seek(dg_address + 4)
+        f.write(struct.pack("<I", 0))
+        f.seek(dg_address + 16)
+        f.write(struct.pack("<I2H", data_address, len(blocks), record_id_nr))
+
+        # CG chain of the first DG: next CG and record ID
+        for index, (_, cg_address, _) in enumerate(blocks):
+            next_cg = blocks[index + 1][1] if index + 1 < len(blocks) else 0
+            f.seek(cg_address + 4)
+            f.write(struct.pack("<I", next_cg))
+            f.seek(cg_address + 16)
+            f.write(struct.pack("<H", index + 1))
+
+
+def can_database():
+    """database of the *can_logging* messages: CAN_MESSAGES messages of
+    CAN_SIGNALS 16 bits signals
+
+    Returns
+    -------
+    db : canmatrix.CanMatrix
+
+    """
+    import canmatrix
+
+    db = canmatrix.CanMatrix()
+    for i in range(CAN_MESSAGES):
+        frame = canmatrix.Frame(
+            f"Message_{i}", arbitration_id=canmatrix.ArbitrationId(0x100 + i), size=8
+        )
+        for j in range(CAN_SIGNALS):
+            frame.add_signal(
+                canmatrix.Signal(
+                    f"Signal_{i}_{j}",
+                    start_bit=j * 16,
+                    size=16,
+                    is_little_endian=True,
+                    is_signed=False,
+                    factor=0.1,
+                )
+            )
+        db.add_frame(frame)
+    return db
+
+
+# shape -> (writer, versions, save compression)
+SHAPES = {
+    "many_small_groups": (many_small_groups, VERSIONS, 0),
+    "few_wide_groups": (few_wide_groups, VERSIONS, 0),
+    "compressed": (compressed, ("4.10",), 2),
+    "bit_packed": (bit_packed, ("4.10",), 0),
+    "vlsd_strings": (vlsd_strings, VERSIONS, 0),
+    "can_logging": (can_logging, ("4.10",), 0),
+    "unsorted_groups": (unsorted_groups, ("3.30",), 0),
+}
+
+# shape -> function applied to the saved file
+POST_SAVE = {"unsorted_groups": unsort_mdf3}
+
+
+def fixture_name(shape, version):
+    return f"{shape}.{'mf4' if version >= '4.00' else 'mdf'}"
+
+
+def write_fixture(shape, version, path, scale=1.0):
+    """write the synthetic file of the *shape* (see *SHAPES*)
+
+    Parameters
+    ----------
+    shape : str
+        fixture shape
+    version : str
+        MDF version
+    path : pathlib.Path
+        output file
+    scale : float
+        factor for the number of cycles
+
+    """
+    from API.mdf import MDF
+
+    writer, versions, compression = SHAPES[shape]
+    if version not in versions:
+        raise ValueError(f'shape "{shape}" is not available for version {version}')
+
+    rng = np.random.default_rng(0)
+    mdf = MDF(version=version)
+    writer(mdf, rng, scale)
+    if version >= "4.00":
+        mdf.save(path, overwrite=True, compression=compression)
+    else:
+        mdf.save(path, overwrite=True)
+    mdf.close()
+
+    if shape in POST_SAVE:
+        POST_SAVE[shape](path)
+
+
+def write_fixtures(directory, scale=1.0, shapes=None, versions=VERSIONS):
+    """write the fixtures that are not already in *directory*
+
+    Returns
+    -------
+    fixtures : list
+        (shape, version, path) tuples
+
+    """
+    directory = Path(directory)
+    fixtures = []
+    for shape in shapes or SHAPES:
+        for version in SHAPES[shape][1]:
+            if version not in versions:
+                continue
+            path = directory / version / fixture_name(shape, version)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                write_fixture(shape, version, path, scale)
+            fixtures.append((shape, version, path))
+    return fixtures
+
+
+def synthetic_mf4(
+    path,
+    cycles,
+    channels,
+    groups=1,
+    dtype="<f8",
+    period=0.001,
+    offset=0.0,
+    same_duration=False,
+    compression=0,
+    write_fragment_size=None,
+    bounds=(0, 1000),
+    samples=None,
+    conversion=None,
+    unit="",
+    channel_comment=None,
+    comment="Group{group}",
+):
+    """write a version 4.10 measurement for the benchmark scripts. The
+    channels are named *Channel_<index>*, or *Channel_<group>_<index>* if
+    there are several groups, and the samples come from the same random
+    generator seed for the same arguments
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        output file
+    cycles : int
+        samples number of each group
+    channels : int | sequence
+        channels number of each group; a sequence gives the channels number
+        of the successive groups (cycled)
+    groups : int
+        channel groups number
+    dtype : str | sequence
+        samples dtype; a sequence gives the dtypes of the successive channels
+        of a group (cycled). The float channels are normal distributed and
+        the integer channels uniform in *bounds*
+    period : float | sequence
+        time raster in s; a sequence gives the rasters of the successive
+        groups (cycled)
+    offset : float | sequence
+        first timestamp in s, given like *period*
+    same_duration : bool
+        the groups with a slower raster have less samples so that all the
+        groups have the duration of the fastest one
+    compression : int
+        *MDF.save* compression
+    write_fragment_size : int | None
+        *MDF.configure* write fragment size, for files with several data
+        blocks per group
+    bounds : tuple
+        low (inclusive) and high (exclusive) value of the integer samples
+    samples : callable | None
+        custom samples *samples(rng, cycles, index)* used instead of *dtype*
+    conversion : dict | None
+        conversion of all the channels, as accepted by
+        *conversion_utils.from_dict*
+    unit : str
+        unit of all the channels
+    channel_comment : str | None
+        channel comment formatted with *group* and *index*
+    comment : str
+        channel group comment formatted with *group*
+
+    """
+    from API.mdf import MDF
+    from API.signals import Signal
+
+    def cycle(value, index):
+        if isinstance(value, (str, int, float)):
+            return value
+        return value[index % len(value)]
+
+    periods = [cycle(period, group) for group in range(groups)]
+    fastest = min(periods)
+
+    rng = np.random.default_rng(0)
+    mdf = MDF(version="4.10")
+    for group in range(groups):
+        group_cycles = cycles
+        if same_duration:
+            group_cycles = int(cycles * fastest / periods[group])
+        t = (
+            np.arange(group_cycles, dtype="<f8") * periods[group]
+            + cycle(offset, group)
+        )
+
+        signals = []
+        for index in range(cycle(channels, group)):
+            name = f"Channel_{group}_{index}" if groups > 1 else f"Channel_{index}"
+            if samples is not None:
+                values = samples(rng, group_cycles, index)
+            else:
+                channel_dtype = np.dtype(cycle(dtype, index))
+                if channel_dtype.kind == "f":
+                    values = rng.standard_normal(group_cycles)
+                else:
+                    values = rng.integers(*bounds, group_cycles)
+                values = values.astype(channel_dtype)
+
+            signals.append(
+                Signal(
+                    values,
+                    t,
+                    name=name,
+                    unit=unit,
+                    conversion=dict(conversion) if conversion else None,
+                    comment=(
+                        channel_comment.format(group=group, index=index)
+                        if channel_comment
+                        else ""
+                    ),
+                )
+            )
+        mdf.append(signals, comment=comment.format(group=group))
+
+    if write_fragment_size:
+        mdf.configure(write_fragment_size=write_fragment_size)
+    mdf.save(path, overwrite=True, compression=compression)
+    mdf.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default="fixtures")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES))
+    args = parser.parse_args()
+
+    for shape, version, path in write_fixtures(args.output, args.scale, args.shapes):
+        print(f"{shape:<18} {version}: {path} ({path.stat().st_size / 2 ** 20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
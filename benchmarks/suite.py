@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark suite: the main MDF operations timed on the synthetic fixtures of
+benchmarks/fixtures.py (MDF version 4.10 and 3.30)
+
+    python benchmarks/suite.py --scale 0.1 --output results.json
+    python benchmarks/suite.py --scale 0.1 --compare results.json
+
+Each (fixture, operation) case runs in a new process so that the peak memory
+is not hidden by the previous cases: *peak_memory_mb* is the growth of the
+maximum resident set size during the operation (memory released by the
+imports is reused first, so small operations can report 0) and *max_rss_mb*
+the maximum resident set size of the process. The results are written as
+JSON; with *--compare* the cases slower than the reference results by more
+than *--threshold* are listed and the exit code is 1.
+
+Operations
+----------
+* open : MDF(path)
+* select : all the channels
+* to_dataframe : all the channels on the union of the masters
+* export_csv : single time base CSV export
+* export_mat : MAT export of the channel groups
+* cut : middle half of the measurement
+* concatenate : the fixture with itself
+* extract_bus_logging : CAN fixture with the database of *can_database*
+"""
+import argparse
+from datetime import datetime
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import SHAPES, VERSIONS, can_database, write_fixtures
+
+
+def _open(mdf, path, tmp):
+    pass
+
+
+def _select(mdf, path, tmp):
+    channels = [
+        (None, group_index, channel_index)
+        for group_index, group in enumerate(mdf.groups)
+        for channel_index in range(len(group.channels))
+        if channel_index != mdf.masters_db.get(group_index)
+    ]
+    mdf.select(channels)
+
+
+def _to_dataframe(mdf, path, tmp):
+    mdf.to_dataframe()
+
+
+def _export_csv(mdf, path, tmp):
+    # groupby 'f' CSV goes to <filename parent>/[<raster>]
+    (tmp / "[None]").mkdir(exist_ok=True)
+    mdf.export("csv", tmp / "out", single_time_base=True, groupby="f", raster=None)
+
+
+def _export_mat(mdf, path, tmp):
+    mdf.export("mat", tmp / "out.mat")
+
+
+def _cut(mdf, path, tmp):
+    start = stop = None
+    for group_index in range(len(mdf.groups)):
+        master = mdf.get_master(group_index)
+        if len(master):
+            start = master[0] if start is None else min(start, master[0])
+            stop = master[-1] if stop is None else max(stop, master[-1])
+    span = (stop - start) if start is not None else 0
+    mdf.cut(start=start + span / 4, stop=stop - span / 4).close()
+
+
+def _concatenate(mdf, path, tmp):
+    from API.mdf import MDF
+
+    MDF.concatenate([path, path], version=mdf.version).close()
+
+
+def _extract_bus_logging(mdf, path, tmp):
+    mdf.extract_bus_logging({"CAN": [can_database()]}).close()
+
+
+# operation -> (function, fixture shapes or None for all the shapes)
+OPERATIONS = {
+    "open": (_open, None),
+    "select": (_select, None),
+    "to_dataframe": (_to_dataframe, None),
+    "export_csv": (_export_csv, None),
+    "export_mat": (_export_mat, None),
+    "cut": (_cut, None),
+    "concatenate": (_concatenate, None),
+    "extract_bus_logging": (_extract_bus_logging, ("can_logging",)),
+}
+
+
+def _max_rss():
+    """maximum resident set size of the process in bytes"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _run_case(operation, path, queue):
+    import io
+    from contextlib import redirect_stdout
+
+    from API.mdf import MDF
+
+    function = OPERATIONS[operation][0]
+    result = {
+        "seconds": None,
+        "peak_memory_mb": None,
+        "max_rss_mb": None,
+        "error": None,
+    }
+    try:
+        with TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+            baseline = _max_rss()
+            start = perf_counter()
+            with MDF(path) as mdf:
+                function(mdf, path, Path(tmp))
+            result["seconds"] = perf_counter() - start
+            peak = _max_rss()
+            if peak is not None:
+                result["peak_memory_mb"] = (peak - baseline) / 2 ** 20
+                result["max_rss_mb"] = peak / 2 ** 20
+    except Exception as err:
+        result["error"] = f"{err.__class__.__name__}: {err}"
+    queue.put(result)
+
+
+def run_case(operation, path, context):
+    """run the *operation* on the file *path* in a new process"""
+    queue = context.Queue()
+    process = context.Process(target=_run_case, args=(operation, str(path), queue))
+    process.start()
+    try:
+        result = queue.get()
+    except Exception as err:
+        result = {
+            "seconds": None,
+            "peak_memory_mb": None,
+            "max_rss_mb": None,
+            "error": repr(err),
+        }
+    process.join()
+    if process.exitcode and not result["error"]:
+        result["error"] = f"exit code {process.exitcode}"
+    return result
+
+
+def metadata(scale):
+    import numpy as np
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scale": scale,
+    }
+
+
+def compare(results, reference, threshold):
+    """cases slower than the *reference* cases by more than *threshold*
+
+    Returns
+    -------
+    regressions : list
+        (case, reference seconds, seconds) tuples
+
+    """
+    key = lambda item: (item["fixture"], item["version"], item["operation"])
+    reference = {key(item): item["seconds"] for item in reference["results"]}
+    regressions = []
+    for item in results:
+        old = reference.get(key(item))
+        if old and item["seconds"] and item["seconds"] > old * (1 + threshold):
+            regressions.append((key(item), old, item["seconds"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--fixtures", help="fixtures folder (kept between runs)")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES))
+    parser.add_argument("--versions", nargs="+", choices=VERSIONS, default=VERSIONS)
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=1, help="best of N runs")
+    parser.add_argument("--output", help="JSON results file")
+    parser.add_argument("--compare", help="reference JSON results file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    with TemporaryDirectory() as tmp:
+        directory = Path(args.fixtures or tmp)
+        if args.fixtures:
+            # the fixtures folder is specific to the scale
+            directory = directory / f"scale_{args.scale}"
+        fixtures = write_fixtures(directory, args.scale, args.shapes, args.versions)
+
+        results = []
+        for shape, version, path in fixtures:
+            for operation in args.operations or OPERATIONS:
+                shapes = OPERATIONS[operation][1]
+                if shapes is not None and shape not in shapes:
+                    continue
+
+                runs = [run_case(operation, path, context) for _ in range(args.repeat)]
+                errors = [run["error"] for run in runs if run["error"]]
+                times = [run["seconds"] for run in runs if run["seconds"] is not None]
+                memory = [
+                    run["peak_memory_mb"]
+                    for run in runs
+                    if run["peak_memory_mb"] is not None
+                ]
+                rss = [run["max_rss_mb"] for run in runs if run["max_rss_mb"] is not None]
+                result = {
+                    "fixture": shape,
+                    "version": version,
+                    "operation": operation,
+                    "seconds": min(times) if times else None,
+                    "peak_memory_mb": max(memory) if memory else None,
+                    "max_rss_mb": max(rss) if rss else None,
+                    "error": errors[0] if errors else None,
+                }
+                results.append(result)
+
+                if result["error"]:
+                    summary = f"error: {result['error']}"
+                else:
+                    summary = f"{result['seconds']:.3f}s"
+                    if result["peak_memory_mb"] is not None:
+                        summary += f", {result['peak_memory_mb']:.1f} MB"
+                print(f"{shape:<18} {version} {operation:<20}: {summary}", flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(args.scale), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)
+        regressions = compare(results, reference, args.threshold)
+        for (shape, version, operation), old, new in regressions:
+            print(
+                f"regression {shape} {version} {operation}: "
+                f"{old:.3f}s -> {new:.3f}s (+{(new / old - 1) * 100:.0f}%)"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()